@@ -1,2 +1,4 @@
 from . import matchers
+from . import pairs
 from . import pytorch
+from . import vocab
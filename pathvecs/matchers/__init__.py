@@ -3,6 +3,19 @@ from pathvecs.matchers.spans import (
 	ModifierSpanMatcher
 )
 
-from pathvecs.matchers.triples import TripleMatcher
+from pathvecs.matchers.triples import (
+    TripleArrays,
+    TripleMatcher,
+    iter_triples,
+    triple_indices
+)
 from pathvecs.matchers.quantifiers import QuantifiedObjectMatcher
 from pathvecs.matchers.relative_pronouns import RelativePronounMatcher
+from pathvecs.matchers.triple_resolver import TripleResolver
+from pathvecs.matchers.combined import MATCHER_FAMILIES, PathvecsMatchers
+from pathvecs.matchers.language import (
+    COMBINED_PIPE,
+    MATCHER_PIPES,
+    load_matchers_nlp,
+    match
+)
@@ -0,0 +1,247 @@
+""" All of the matchers registered as a single spaCy component.
+
+Chaining the separate matcher components scans each doc with three
+DependencyMatchers and four Matchers, two of them the same date matcher.
+This component holds every dependency pattern in one DependencyMatcher, the
+date patterns in one Matcher, and every other token pattern in another. The
+span patterns match the dates tagged by the date Matcher, so it runs first,
+as the date matchers of the separate span components do. Matches are then
+dispatched by key to the callbacks of the separate components, so the doc
+is annotated exactly as the chained components would.
+
+Typical usage example:
+
+    nlp = spacy.load('en_core_web_sm')
+    nlp.add_pipe('pathvecs_matchers')
+
+    doc = nlp("Alice, who is the queen of Antarctica, saw some of the penguins.")
+    print(doc._.triples, doc.spans['nominals'])
+
+    # Only the families triple extraction needs
+    nlp.add_pipe('pathvecs_matchers', config={
+        'families': ['relative_pronouns', 'triples']})
+"""
+import functools
+
+from spacy.matcher import DependencyMatcher, Matcher
+from spacy.language import Language
+from spacy.tokens import Doc, Token
+from spacy.util import filter_spans
+
+import pathvecs.matchers.quantifiers.patterns as quantifier_patterns
+import pathvecs.matchers.relative_pronouns.patterns as relative_pronoun_patterns
+import pathvecs.matchers.triples.patterns as triple_patterns
+from pathvecs.matchers.quantifiers import quantifiers
+from pathvecs.matchers.registry import cached_matcher
+from pathvecs.matchers.relative_pronouns import relative_pronouns
+from pathvecs.matchers.spans import modifiers, nominals
+from pathvecs.matchers.spans.patterns import getSpanPatterns
+from pathvecs.matchers.triples import triples
+from pathvecs.matchers.triples.arrays import TripleArrays
+
+
+# Families in the order the chained components run in
+MATCHER_FAMILIES = [
+    'quantifiers',
+    'relative_pronouns',
+    'nominals',
+    'modifiers',
+    'triples'
+]
+
+# Dependency pattern families, with their patterns and match callbacks
+DEPENDENCY_FAMILIES = {
+    'quantifiers': (quantifier_patterns, quantifiers.on_match),
+    'relative_pronouns': (relative_pronoun_patterns, relative_pronouns.on_match),
+    'triples': (triple_patterns, triples.on_match),
+}
+
+# Token pattern families, keyed by the doc.spans key their callbacks fill
+SPAN_FAMILIES = {
+    'nominals': nominals.addSpan,
+    'modifiers': modifiers.addSpan,
+}
+
+DATES_KEY = 'dates'
+
+# Registry key the combined matchers are cached under
+COMBINED_KEY = 'pathvecs_matchers'
+
+
+@Language.factory(
+    'pathvecs_matchers',
+    default_config={
+        'use_patterns': None, 'families': None, 'validate': True, 'compact': False,
+        'max_conjuncts': None, 'max_triples': None}
+)
+def createPathvecsMatchersComponent(
+        nlp, name, use_patterns, families, validate, compact, max_conjuncts, max_triples):
+    return PathvecsMatchers(
+        nlp, use_patterns=use_patterns, families=families, validate=validate,
+        compact=compact, max_conjuncts=max_conjuncts, max_triples=max_triples)
+
+
+class PathvecsMatchers:
+    """ A DependencyMatcher and a Matcher for every pattern family
+
+    Attributes:
+        families: The pattern families matched, in the order they are applied
+        dependency_matcher: A spacy.DependencyMatcher with the patterns of
+            the dependency families, keyed '<family>/<pattern key>'
+        date_matcher: A spacy.Matcher with the date patterns, which tags
+            the dates the span patterns match, if any span family is matched
+        span_matcher: A spacy.Matcher with the patterns of the span
+            families, keyed by family
+        compact: Whether triples are kept in doc._.triple_arrays, as the
+            triple_matcher does with compact=True
+        on_triples_match: The triples match callback, with the conjunct
+            expansion limits bound
+    """
+
+    def __init__(
+        self,
+        nlp,
+        use_patterns=None,
+        families=None,
+        validate=True,
+        compact=False,
+        max_conjuncts=None,
+        max_triples=None
+    ):
+
+        families = MATCHER_FAMILIES if families is None else families
+        for family in families:
+            if family not in MATCHER_FAMILIES:
+                raise KeyError("No matcher family found for key '{}'.".format(family))
+
+        self.families = [f for f in MATCHER_FAMILIES if f in families]
+        self.compact = compact
+        self.on_triples_match = functools.partial(
+            triples.on_match_arrays if compact else triples.on_match,
+            max_conjuncts=max_conjuncts,
+            max_triples=max_triples
+        )
+
+        # Register the extensions the separate components would have
+        if not Doc.has_extension('triples'):
+            Doc.set_extension('triples', default=[])
+
+        if not Doc.has_extension('triple_arrays'):
+            Doc.set_extension('triple_arrays', default=None)
+
+        if not Doc.has_extension('pruned_triples'):
+            Doc.set_extension('pruned_triples', default=0)
+
+        if not Token.has_extension('verb_type'):
+            Token.set_extension('verb_type', default=None)
+
+        if not Token.has_extension('antecedent'):
+            Token.set_extension('antecedent', default=None)
+
+        if not Token.has_extension('quantifieds'):
+            Token.set_extension('quantifieds', default=[])
+
+        strings = nlp.vocab.strings
+        keys = None if use_patterns is None else tuple(use_patterns)
+
+        # Maps each fused key back to its family and the key of its pattern
+        self._dependency_keys = {}
+        dependency_patterns = []
+
+        for family in self.families:
+            if family not in DEPENDENCY_FAMILIES:
+                continue
+
+            patterns, _on_match = DEPENDENCY_FAMILIES[family]
+            if family == 'triples' and keys is not None:
+                family_patterns = [(key, patterns.get_pattern(key)) for key in keys]
+            else:
+                family_patterns = patterns.get_all_patterns()
+
+            for pattern_key, pattern in family_patterns:
+                key = '{}/{}'.format(family, pattern_key)
+                dependency_patterns.append((key, pattern))
+                self._dependency_keys[strings.add(key)] = (family, strings.add(pattern_key))
+
+        self._span_keys = {}
+        span_patterns = []
+
+        for family in self.families:
+            if family in SPAN_FAMILIES:
+                span_patterns.append((family, getSpanPatterns(family)))
+                self._span_keys[strings.add(family)] = family
+
+        # Compile the matchers once per vocab, families, triple patterns and
+        # validation, so unvalidated matchers aren't reused when validating
+        cache_key = (COMBINED_KEY, tuple(self.families), keys, validate)
+
+        def build_dependency_matcher():
+            matcher = DependencyMatcher(nlp.vocab, validate=validate)
+            for key, pattern in dependency_patterns:
+                matcher.add(key, [pattern])
+            return matcher
+
+        def build_span_matcher():
+            matcher = Matcher(nlp.vocab, validate=validate)
+            for key, patterns in span_patterns:
+                matcher.add(key, patterns)
+            return matcher
+
+        # The span patterns match tagged dates, so dates are matched first
+        def build_date_matcher():
+            matcher = Matcher(nlp.vocab, validate=validate)
+            if span_patterns:
+                matcher.add(
+                    DATES_KEY, getSpanPatterns(DATES_KEY), on_match=nominals.tagDateSpan)
+            return matcher
+
+        self.dependency_matcher = cached_matcher(
+            nlp.vocab, cache_key + ('dependency',), build_dependency_matcher)
+        self.span_matcher = cached_matcher(
+            nlp.vocab, cache_key + ('span',), build_span_matcher)
+        self.date_matcher = cached_matcher(
+            nlp.vocab, cache_key + ('dates',), build_date_matcher)
+
+    def __call__(self, doc):
+
+        if self.compact and 'triples' in self.families and doc._.triple_arrays is None:
+            doc._.triple_arrays = TripleArrays()
+
+        family_matches = {family: [] for family in self.families}
+
+        if len(self.dependency_matcher):
+            for match_id, token_ids in self.dependency_matcher(doc):
+                family, key = self._dependency_keys[match_id]
+                family_matches[family].append((key, token_ids))
+
+        # Tag date spans up front so they are respected, and matched
+        if len(self.date_matcher):
+            self.date_matcher(doc)
+
+        if len(self.span_matcher):
+            for match in self.span_matcher(doc):
+                family_matches[self._span_keys[match[0]]].append(match)
+
+        for family in self.families:
+
+            if family in SPAN_FAMILIES:
+                doc.spans[family] = []
+                dispatch(SPAN_FAMILIES[family], self.span_matcher, doc, family_matches[family])
+                doc.spans[family] = filter_spans(doc.spans[family])
+
+            elif family == 'triples':
+                dispatch(self.on_triples_match, self.dependency_matcher, doc,
+                    family_matches[family])
+
+            else:
+                _patterns, on_match = DEPENDENCY_FAMILIES[family]
+                dispatch(on_match, self.dependency_matcher, doc, family_matches[family])
+
+        return doc
+
+
+def dispatch(on_match, matcher, doc, matches):
+    """ Call a match callback for each match, as a matcher would """
+
+    for i in range(len(matches)):
+        on_match(matcher, doc, i, matches)
@@ -0,0 +1,110 @@
+""" A lightweight Language holding only the matcher components.
+
+The matchers only need a Vocab to compile their patterns against, and docs
+that were already parsed. Loading a trained pipeline just to read DocBins
+and run them brings in its vectors, tagger, parser and NER for nothing, so
+processes which only match can use a blank Language instead.
+
+Typical usage example:
+
+    nlp = load_matchers_nlp(pipes=['map_relative_pronouns', 'triple_matcher'])
+
+    doc_bin = DocBin().from_disk('0001.spacy')
+    for doc in doc_bin.get_docs(nlp.vocab):
+        doc = match(doc, nlp)
+        print(doc._.triples)
+"""
+import spacy
+
+# Imported to register the matcher factories
+from pathvecs.matchers.spans import NominalSpanMatcher, ModifierSpanMatcher
+from pathvecs.matchers.triples import TripleMatcher
+from pathvecs.matchers.quantifiers import QuantifiedObjectMatcher
+from pathvecs.matchers.relative_pronouns import RelativePronounMatcher
+from pathvecs.matchers.combined import PathvecsMatchers
+from pathvecs.matchers.triple_resolver import TripleResolver
+
+
+MATCHER_PIPES = [
+    'map_quantifiers',
+    'map_relative_pronouns',
+    'nominal_spans',
+    'modifier_spans',
+    'triple_matcher'
+]
+
+# Runs the pattern families of all of the above in one pass
+COMBINED_PIPE = 'pathvecs_matchers'
+
+# Resolves the matched triples, added after the matchers
+RESOLVER_PIPE = 'triple_resolver'
+
+
+def load_matchers_nlp(
+    lang='en',
+    pipes=MATCHER_PIPES,
+    triple_patterns=None,
+    families=None,
+    vocab=True,
+    validate=True,
+    compact=False,
+    max_conjuncts=None,
+    max_triples=None
+):
+    """ Build a blank Language with matcher components added
+
+    Args:
+        lang: Language code of the blank pipeline
+        pipes: Matcher factory names to add, in order
+        triple_patterns: Triple pattern keys for the triple_matcher, or None
+            for all of them
+        families: Pattern families for the combined pathvecs_matchers pipe,
+            or None for all of them
+        vocab: A Vocab to share, e.g. with the pipeline the docs were parsed
+            with, or True for a new one
+        validate: Whether to validate the built-in patterns, which can be
+            skipped when they are known to be valid, e.g. in pool workers
+        compact: Whether matched triples are kept in doc._.triple_arrays
+            rather than as a list of Triples in doc._.triples
+        max_conjuncts: Most conjuncts of a triple's src or dst to expand
+            to, or None for all of them
+        max_triples: Most triples to expand a triple match to, or None
+
+    Returns:
+        nlp: The Language, whose vocab docs should be read with
+    """
+
+    for name in pipes:
+        if name not in MATCHER_PIPES + [COMBINED_PIPE, RESOLVER_PIPE]:
+            raise KeyError("No matcher pipe found for key '{}'.".format(name))
+
+    nlp = spacy.blank(lang, vocab=vocab)
+
+    triples_config = {
+        'use_patterns': triple_patterns,
+        'validate': validate,
+        'compact': compact,
+        'max_conjuncts': max_conjuncts,
+        'max_triples': max_triples
+    }
+
+    for name in pipes:
+        if name == 'triple_matcher':
+            nlp.add_pipe(name, config=triples_config)
+        elif name == COMBINED_PIPE:
+            nlp.add_pipe(name, config={**triples_config, 'families': families})
+        elif name == RESOLVER_PIPE:
+            nlp.add_pipe(name)
+        else:
+            nlp.add_pipe(name, config={'validate': validate})
+
+    return nlp
+
+
+def match(doc, nlp):
+    """ Run every component of nlp over an already parsed doc """
+
+    for _name, component in nlp.pipeline:
+        doc = component(doc)
+
+    return doc
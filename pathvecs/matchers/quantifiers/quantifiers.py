@@ -16,15 +16,15 @@ Typical usage example:
     doc[2]._.quantifieds => [5]
 """
 
-from spacy.matcher import DependencyMatcher
 from spacy.language import Language
 from spacy.tokens import Token
 
 import pathvecs.matchers.quantifiers.patterns as patterns
+from pathvecs.matchers.registry import get_dependency_matcher
 
-@Language.factory('map_quantifiers')
-def createQuantifiedObjectMatcherComponent(nlp, name):
-    return QuantifiedObjectMatcher(nlp)
+@Language.factory('map_quantifiers', default_config={'validate': True})
+def createQuantifiedObjectMatcherComponent(nlp, name, validate):
+    return QuantifiedObjectMatcher(nlp, validate=validate)
 
 class QuantifiedObjectMatcher:
     """ A spacy DependencyMatcher object wrapped as a pipeline component
@@ -33,25 +33,17 @@ class QuantifiedObjectMatcher:
         matcher: A spacy.Matcher component with patterns loaded on init
     """
 
-    def __init__(self, nlp, use_patterns=None):
+    def __init__(self, nlp, use_patterns=None, validate=True):
 
-        # Create a matcher using the specified patterns, or all by default
-        self.matcher = DependencyMatcher(nlp.vocab, validate=True)
+        # Get a matcher using the specified patterns, or all by default,
+        # compiled once per vocab
+        self.matcher = get_dependency_matcher(
+            nlp.vocab, 'quantifiers', patterns, use_patterns, on_match, validate=validate)
 
         # Register token extension
         if not Token.has_extension('quantifieds'):
             Token.set_extension('quantifieds', default=[])
 
-        if use_patterns is not None:
-
-            for key in use_patterns:
-                pattern = patterns.get_pattern(key)
-                self.matcher.add(key, [pattern], on_match=on_match)
-
-        else:
-            for key, pattern in patterns.get_all_patterns():
-                self.matcher.add(key, [pattern], on_match=on_match)
-
     def __call__(self, doc):
         self.matcher(doc)
         return doc
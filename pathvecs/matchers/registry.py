@@ -0,0 +1,107 @@
+""" A cache of compiled matchers, shared by components built on one Vocab.
+
+Adding patterns to a Matcher or DependencyMatcher compiles them against a
+Vocab, and with validate=True checks each one against spaCy's pattern
+schema first. The matcher components would otherwise redo this every time
+one is constructed, e.g. once per pool worker per component, or once per
+test case. Instead, each pattern family is compiled once per Vocab, pattern
+key set and validate option, and the compiled matcher is shared by every
+component built with them.
+
+Sharing is safe because the matchers hold no per-doc state, and the
+callbacks registered with a family's patterns are always the same.
+
+Typical usage example:
+
+    matcher = get_dependency_matcher(
+        nlp.vocab, 'triples', patterns, use_patterns, on_match)
+"""
+from spacy.matcher import DependencyMatcher, Matcher
+
+
+# Key of the {cache key: matcher} dict in vocab.cfg. The cache is held by
+# its Vocab, so it is dropped along with it, rather than in a module-level
+# map: every cached matcher references its Vocab, which would keep it alive
+# even as the key of a weakref.WeakKeyDictionary.
+_CFG_KEY = '_pathvecs_matchers'
+
+
+def cached_matcher(vocab, key, build):
+    """ Get the matcher cached for a vocab and key, building it if needed
+
+    Args:
+        vocab: The Vocab the matcher is compiled against
+        key: A hashable key for the patterns the matcher holds
+        build: Callable returning a new matcher, called on a cache miss
+
+    Returns:
+        matcher: The cached matcher
+    """
+
+    matchers = vocab.cfg.setdefault(_CFG_KEY, {})
+    if key not in matchers:
+        matchers[key] = build()
+
+    return matchers[key]
+
+
+def clear_matchers(vocab):
+    """ Drop the matchers cached for a vocab, e.g. after patterns have been edited """
+    vocab.cfg.pop(_CFG_KEY, None)
+
+
+def get_dependency_matcher(vocab, family, patterns, use_patterns, on_match, validate=True):
+    """ Get a DependencyMatcher of a family's patterns, compiled once per Vocab
+
+    Args:
+        vocab: The Vocab to compile the patterns against
+        family: Name of the pattern family, e.g. 'triples'
+        patterns: The family's patterns module, with get_pattern and
+            get_all_patterns functions
+        use_patterns: Pattern keys to add, in order, or None for all of them
+        on_match: Callback to register with every pattern, or None
+        validate: Whether to validate patterns when they are first compiled
+
+    Returns:
+        matcher: A spacy.DependencyMatcher, possibly shared
+    """
+
+    keys = None if use_patterns is None else tuple(use_patterns)
+
+    def build():
+        matcher = DependencyMatcher(vocab, validate=validate)
+
+        if keys is None:
+            family_patterns = patterns.get_all_patterns()
+        else:
+            family_patterns = [(key, patterns.get_pattern(key)) for key in keys]
+
+        for pattern_key, pattern in family_patterns:
+            matcher.add(pattern_key, [pattern], on_match=on_match)
+
+        return matcher
+
+    return cached_matcher(vocab, (family, keys, validate), build)
+
+
+def get_token_matcher(vocab, family, key, patterns, on_match, validate=True):
+    """ Get a Matcher of a family's token patterns, compiled once per Vocab
+
+    Args:
+        vocab: The Vocab to compile the patterns against
+        family: Name of the pattern family, e.g. 'nominals'
+        key: The match key to add the patterns under
+        patterns: List of token patterns
+        on_match: Callback to register with the patterns
+        validate: Whether to validate patterns when they are first compiled
+
+    Returns:
+        matcher: A spacy.Matcher, possibly shared
+    """
+
+    def build():
+        matcher = Matcher(vocab, validate=validate)
+        matcher.add(key, patterns, on_match=on_match)
+        return matcher
+
+    return cached_matcher(vocab, (family, key, validate), build)
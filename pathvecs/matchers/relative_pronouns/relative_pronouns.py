@@ -16,15 +16,15 @@ Typical usage example:
     > {4:3} (haven't decided on storage yet, doc vs token extension)
 """
 
-from spacy.matcher import DependencyMatcher
 from spacy.language import Language
 from spacy.tokens import Token
 
 import pathvecs.matchers.relative_pronouns.patterns as patterns
+from pathvecs.matchers.registry import get_dependency_matcher
 
-@Language.factory('map_relative_pronouns')
-def createRelativePronounMatcherComponent(nlp, name):
-    return RelativePronounMatcher(nlp)
+@Language.factory('map_relative_pronouns', default_config={'validate': True})
+def createRelativePronounMatcherComponent(nlp, name, validate):
+    return RelativePronounMatcher(nlp, validate=validate)
 
 class RelativePronounMatcher:
     """ A spacy DependencyMatcher object wrapped as a pipeline component
@@ -33,25 +33,17 @@ class RelativePronounMatcher:
         matcher: A spacy.Matcher component with patterns loaded on init
     """
 
-    def __init__(self, nlp, use_patterns=None):
+    def __init__(self, nlp, use_patterns=None, validate=True):
 
-        # Create a matcher using the specified patterns, or all by default
-        self.matcher = DependencyMatcher(nlp.vocab, validate=True)
+        # Get a matcher using the specified patterns, or all by default,
+        # compiled once per vocab
+        self.matcher = get_dependency_matcher(
+            nlp.vocab, 'relative_pronouns', patterns, use_patterns, on_match, validate=validate)
 
         # Register token extension
         if not Token.has_extension('antecedent'):
             Token.set_extension('antecedent', default=None)
 
-        if use_patterns is not None:
-
-            for pattern_key in use_patterns:
-                pattern = patterns.get_pattern(pattern_key)
-                self.matcher.add(pattern_key, [pattern], on_match=on_match)
-
-        else:
-            for pattern_key, pattern in patterns.get_all_patterns():
-                self.matcher.add(pattern_key, [pattern], on_match=on_match)
-
     def __call__(self, doc):
         self.matcher(doc)
         return doc
@@ -11,16 +11,16 @@ Typical usage example:
     > [big, red]
 """
 
-from spacy.matcher import Matcher
 from spacy.language import Language
 from spacy.util import filter_spans
 
+from pathvecs.matchers.registry import get_token_matcher
 from pathvecs.matchers.spans.patterns import getSpanPatterns
 from pathvecs.matchers.utils import getInboundDependencies
 
-@Language.factory('modifier_spans')
-def createNominalMatcherComponent(nlp, name):
-    return ModifierSpanMatcher(nlp)
+@Language.factory('modifier_spans', default_config={'validate': True})
+def createNominalMatcherComponent(nlp, name, validate):
+    return ModifierSpanMatcher(nlp, validate=validate)
 
 
 class ModifierSpanMatcher:
@@ -31,19 +31,21 @@ class ModifierSpanMatcher:
         matcher: A spacy.Matcher component with patterns loaded on init
     """
 
-    def __init__(self, nlp, key='modifiers'):
+    def __init__(self, nlp, key='modifiers', validate=True):
 
         self.key = key
 
-        # Create a matcher using our set of nominal span patterns
+        # Get a matcher using our set of modifier span patterns, compiled
+        # once per vocab
         patterns = getSpanPatterns('modifiers')
-        self.matcher = Matcher(nlp.vocab, validate=True)
-        self.matcher.add(key, patterns, on_match=addSpan)
+        self.matcher = get_token_matcher(
+            nlp.vocab, 'modifiers', key, patterns, addSpan, validate=validate)
 
-        # Create a matcher using our set of date span patterns
+        # Get a matcher using our set of date span patterns, cached apart
+        # from the other span matcher's as it calls this module's tagDateSpan
         date_patterns = getSpanPatterns('dates')
-        self.date_matcher = Matcher(nlp.vocab, validate=True)
-        self.date_matcher.add(key, date_patterns, on_match=tagDateSpan)
+        self.date_matcher = get_token_matcher(
+            nlp.vocab, 'modifiers/dates', key, date_patterns, tagDateSpan, validate=validate)
 
     def __call__(self, doc):
 
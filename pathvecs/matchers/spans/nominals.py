@@ -11,16 +11,16 @@ Typical usage example:
     > [Alice, Bob Lastname, park]
 """
 
-from spacy.matcher import Matcher
 from spacy.language import Language
 from spacy.util import filter_spans
 
+from pathvecs.matchers.registry import get_token_matcher
 from pathvecs.matchers.spans.patterns import getSpanPatterns
 from pathvecs.matchers.utils import getInboundDependencies
 
-@Language.factory('nominal_spans')
-def createNominalMatcherComponent(nlp, name):
-    return NominalSpanMatcher(nlp)
+@Language.factory('nominal_spans', default_config={'validate': True})
+def createNominalMatcherComponent(nlp, name, validate):
+    return NominalSpanMatcher(nlp, validate=validate)
 
 
 class NominalSpanMatcher:
@@ -31,19 +31,21 @@ class NominalSpanMatcher:
         matcher: A spacy.Matcher component with patterns loaded on init
     """
 
-    def __init__(self, nlp, key='nominals'):
+    def __init__(self, nlp, key='nominals', validate=True):
 
         self.key = key
 
-        # Create a matcher using our set of nominal span patterns
+        # Get a matcher using our set of nominal span patterns, compiled
+        # once per vocab
         patterns = getSpanPatterns('nominals')
-        self.matcher = Matcher(nlp.vocab, validate=True)
-        self.matcher.add(key, patterns, on_match=addSpan)
+        self.matcher = get_token_matcher(
+            nlp.vocab, 'nominals', key, patterns, addSpan, validate=validate)
 
-        # Create a matcher using our set of date span patterns
+        # Get a matcher using our set of date span patterns, cached apart
+        # from the other span matcher's as it calls this module's tagDateSpan
         date_patterns = getSpanPatterns('dates')
-        self.date_matcher = Matcher(nlp.vocab, validate=True)
-        self.date_matcher.add(key, date_patterns, on_match=tagDateSpan)
+        self.date_matcher = get_token_matcher(
+            nlp.vocab, 'nominals/dates', key, date_patterns, tagDateSpan, validate=validate)
 
     def __call__(self, doc):
 
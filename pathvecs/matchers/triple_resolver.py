@@ -1,36 +1,110 @@
+""" Resolve matched triples to the tokens they are about.
 
+Runs after the relative pronoun, quantifier and triple matchers, and turns
+doc._.triples into doc._.resolved_triples:
+
+    Relative pronouns are swapped for their antecedents where possible
+
+        "Alice, who lives in Antarctica."
+            (who)-[live_in]->(antarctica) => (Alice)-[live_in]->(antarctica)
+
+    Quantifiers are swapped for quantified objects where possible
+
+        "Bob ate one of the cakes."
+            (Bob)-[eat]->(one) => (Bob)-[eat]->(cakes)
+
+Triples are read by index with triple_indices, so docs matched with
+compact=True are resolved the same way. Permutations among conjoined tokens
+are already taken by the triple matcher, so a quantifier with several
+objects is the only source of new triples here. Triples that resolve to the
+same token at both ends, or that duplicate an earlier resolved triple, are
+dropped.
+
+Typical usage example:
+
+    nlp = spacy.load('en_core_web_sm')
+    nlp.add_pipe('map_quantifiers')
+    nlp.add_pipe('map_relative_pronouns')
+    nlp.add_pipe('triple_matcher')
+    nlp.add_pipe('triple_resolver')
+
+    doc = nlp("Alice, who ate one of the cakes.")
+    print(doc._.resolved_triples)
+"""
 from spacy.language import Language
+from spacy.tokens import Doc
+
+from pathvecs.matchers.triples.patterns import Triple
+from pathvecs.matchers.triples.triples import triple_indices
+from pathvecs.matchers.utils import getTokenExtensionValues
+
 
 @Language.factory('triple_resolver')
-def createTripleMatcherComponent(nlp, name):
+def createTripleResolverComponent(nlp, name):
     return TripleResolver(nlp)
 
 
 class TripleResolver:
+    """ Resolves doc._.triples into doc._.resolved_triples
+
+    The antecedents and quantified objects of a doc are read once into maps
+    of token indices, and triples are resolved by index, so the token
+    extensions are not looked up per triple.
+    """
 
     def __init__(self, nlp):
-        pass
+
+        # Register doc extensions
+        if not Doc.has_extension('triples'):
+            Doc.set_extension('triples', default=[])
+
+        if not Doc.has_extension('triple_arrays'):
+            Doc.set_extension('triple_arrays', default=None)
+
+        if not Doc.has_extension('resolved_triples'):
+            Doc.set_extension('resolved_triples', default=[])
 
     def __call__(self, doc):
-        """ Takes doc._.triples and creates doc._.resolved_triples
 
-        Relative pronouns are swapped for their anticedents where possible
+        # Precomputed index maps, only holding the tokens that have a value
+        antecedents = {
+            i: antecedent.i
+            for i, antecedent in getTokenExtensionValues(doc, 'antecedent').items()
+        }
+        quantifieds = {
+            i: [token.i for token in objects]
+            for i, objects in getTokenExtensionValues(doc, 'quantifieds').items()
+            if objects
+        }
 
-        Quantifiers are swapped for quantified objects where possible
+        resolved = []
+        seen = set()
 
-        Permutations of triples are taken among conjoined tokens
+        strings = doc.vocab.strings
+        triple_srcs, triple_edges, triple_dsts = triple_indices(doc)
 
-            "Alice and Bob went to the park."
-                    (Alice)-[go-to]->(park)
-                (+) (Bob)-[go-to]->(park)
+        for src_i, edge, dst_i in zip(
+                triple_srcs.tolist(), triple_edges.tolist(), triple_dsts.tolist()):
 
-        """
+            srcs = resolve(src_i, antecedents, quantifieds)
+            dsts = resolve(dst_i, antecedents, quantifieds)
 
-        resolved_triples
-        for t in doc._.triples:
+            for src in srcs:
+                for dst in dsts:
 
+                    key = (src, edge, dst)
+                    if src == dst or key in seen:
+                        continue
 
+                    seen.add(key)
+                    resolved.append(Triple(doc[src], strings[edge], doc[dst]))
 
+        doc._.resolved_triples = resolved
+        return doc
 
 
+def resolve(i, antecedents, quantifieds):
+    """ Get the indices a token index resolves to """
 
+    i = antecedents.get(i, i)
+    return quantifieds.get(i, (i,))
@@ -1 +1,2 @@
-from pathvecs.matchers.triples.triples import TripleMatcher
+from pathvecs.matchers.triples.triples import TripleMatcher, iter_triples, triple_indices
+from pathvecs.matchers.triples.arrays import TripleArrays
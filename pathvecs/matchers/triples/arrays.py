@@ -0,0 +1,82 @@
+""" A compact representation of a doc's matched triples.
+
+A list of Triples holds two Tokens and an edge string per triple, which
+keeps every matched Token alive and allocates a few Python objects per
+match. TripleArrays instead holds the triples as typed arrays of src token
+indices, dst token indices and edge ids, where an edge id is the hash of
+the edge name in the doc's StringStore. Triples are only built when they
+are asked for.
+
+Typical usage example:
+
+    nlp.add_pipe('triple_matcher', config={'compact': True})
+
+    doc = nlp("Alice went to the store.")
+    src, edge, dst = doc._.triple_arrays.to_numpy()
+
+    for triple in iter_triples(doc):
+        print(triple.src, triple.edge, triple.dst)
+"""
+from array import array
+
+import numpy as np
+
+from pathvecs.matchers.triples.patterns import Triple
+
+
+class TripleArrays:
+    """ Matched triples as arrays of token indices and edge ids
+
+    Attributes:
+        src: array of the src token index of each triple
+        edge: array of the edge id of each triple, the hash of its name
+        dst: array of the dst token index of each triple
+    """
+
+    __slots__ = ['src', 'edge', 'dst']
+
+    def __init__(self):
+        self.src = array('l')
+        self.edge = array('Q')
+        self.dst = array('l')
+
+    def __len__(self):
+        return len(self.src)
+
+    def append(self, src, edge, dst):
+        """ Add a triple of token indices and edge id """
+
+        self.src.append(src)
+        self.edge.append(edge)
+        self.dst.append(dst)
+
+    def to_numpy(self):
+        """ Get the src, edge and dst arrays as numpy arrays, without copying
+
+        Returns:
+            src: Integer array of src token indices
+            edge: uint64 array of edge ids
+            dst: Integer array of dst token indices
+        """
+
+        return (
+            _to_numpy(self.src, 'l'),
+            _to_numpy(self.edge, np.uint64),
+            _to_numpy(self.dst, 'l'),
+        )
+
+    def triples(self, doc):
+        """ Lazily yield each triple as a Triple of the doc's tokens """
+
+        strings = doc.vocab.strings
+        for src, edge, dst in zip(self.src, self.edge, self.dst):
+            yield Triple(doc[src], strings[edge], doc[dst])
+
+
+def _to_numpy(values, dtype):
+    """ View a typed array as a numpy array """
+
+    if not len(values):
+        return np.zeros(0, dtype=dtype)
+
+    return np.frombuffer(values, dtype=dtype)
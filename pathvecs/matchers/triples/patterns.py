@@ -1,5 +1,6 @@
 import itertools
-from typing import List, NamedTuple
+import math
+from typing import Iterator, List, NamedTuple, Optional, Tuple
 
 from spacy.tokens import Doc, Token
 
@@ -404,8 +405,64 @@ def get_all_patterns() -> List[dict]:
         yield pattern_name, pattern_data['pattern']
 
 
-def get_all_triples(match: List[int], key: str, doc: Doc) -> List[Triple]:
-    """ Get all the triples for a match, accounting for possible conjuncts
+def get_all_triples(
+    match: List[int],
+    key: str,
+    doc: Doc,
+    max_conjuncts: Optional[int] = None,
+    max_triples: Optional[int] = None
+) -> Iterator[Triple]:
+    """ Lazily get all the triples for a match, accounting for possible conjuncts
+
+    Args:
+        match: List of token ids for a pattern match
+        key: The pattern key for the pattern that was matched
+        doc: The spacy doc where the match was found
+        max_conjuncts: Most conjuncts of the src or dst token to expand to,
+            or None for all of them
+        max_triples: Most triples to expand the match to, or None for all
+
+    Yields:
+        triple: Each triple, the matched tokens' own first
+    """
+
+    for src, edge_name, _edge_id, dst in get_all_triple_indices(
+            match, key, doc, max_conjuncts, max_triples):
+        yield Triple(doc[src], edge_name, doc[dst])
+
+
+def get_all_triple_indices(
+    match: List[int],
+    key: str,
+    doc: Doc,
+    max_conjuncts: Optional[int] = None,
+    max_triples: Optional[int] = None
+) -> Iterator[tuple]:
+    """ Lazily get all the triples for a match as token indices, with conjuncts
+
+    Args:
+        match: List of token ids for a pattern match
+        key: The pattern key for the pattern that was matched
+        doc: The spacy doc where the match was found
+        max_conjuncts: Most conjuncts of the src or dst token to expand to,
+            or None for all of them
+        max_triples: Most triples to expand the match to, or None for all
+
+    Yields:
+        triple: (src index, edge name, edge id, dst index) tuples, where the
+            edge id is the hash of the name in doc.vocab.strings
+    """
+
+    conjunct_matches = get_conjunct_matches(match, key, doc)
+    conj_matches, _num_pruned = expand_conjunct_matches(
+        conjunct_matches, max_conjuncts, max_triples)
+
+    for conj_match in conj_matches:
+        yield get_triple_indices(conj_match, key, doc)
+
+
+def get_conjunct_matches(match: List[int], key: str, doc: Doc) -> List[List[int]]:
+    """ Get the token ids each rule of a match can take, conjuncts included
 
     Args:
         match: List of token ids for a pattern match
@@ -413,7 +470,8 @@ def get_all_triples(match: List[int], key: str, doc: Doc) -> List[Triple]:
         doc: The spacy doc where the match was found
 
     Returns:
-        triples: List of all triples
+        conjunct_matches: A list per rule of the matched token id, followed
+            by its conjuncts for the src and dst rules
     """
     allowed_conjuncts = ['src', 'dst']
 
@@ -427,12 +485,41 @@ def get_all_triples(match: List[int], key: str, doc: Doc) -> List[Triple]:
             for conjunct in doc[token_index].conjuncts:
                 conjunct_matches[rule_index].append(conjunct.i)
 
-    triples = []
-    conjunct_matches = itertools.product(*conjunct_matches)
-    for conj_match in conjunct_matches:
-        triples.append(get_triple(conj_match, key, doc))
+    return conjunct_matches
+
+
+def expand_conjunct_matches(
+    conjunct_matches: List[List[int]],
+    max_conjuncts: Optional[int] = None,
+    max_triples: Optional[int] = None
+) -> Tuple[Iterator[tuple], int]:
+    """ Lazily expand conjunct matches into matches, within limits
+
+    List-like sentences with dozens of conjoined nouns would otherwise give
+    a match for every pairing of them.
+
+    Args:
+        conjunct_matches: A list per rule of the token ids it can take
+        max_conjuncts: Most conjuncts per rule to expand to, or None for all
+        max_triples: Most matches to expand to, or None for all
+
+    Returns:
+        conj_matches: Iterator of tuples of token ids, one per rule, the
+            matched tokens' own first
+        num_pruned: Number of matches skipped because of the limits
+    """
+
+    num_expansions = math.prod(len(ids) for ids in conjunct_matches)
 
-    return triples
+    if max_conjuncts is not None:
+        conjunct_matches = [ids[:max_conjuncts + 1] for ids in conjunct_matches]
+
+    num_kept = math.prod(len(ids) for ids in conjunct_matches)
+    if max_triples is not None:
+        num_kept = min(num_kept, max_triples)
+
+    conj_matches = itertools.islice(itertools.product(*conjunct_matches), num_kept)
+    return conj_matches, num_expansions - num_kept
 
 
 def get_triple(match: List[int], key: str, doc: Doc) -> Triple:
@@ -446,17 +533,67 @@ def get_triple(match: List[int], key: str, doc: Doc) -> Triple:
         triple: A filled in Triple namedtuple for the match
     """
 
+    src, edge_name, _edge_id, dst = get_triple_indices(match, key, doc)
+    return Triple(doc[src], edge_name, doc[dst])
+
+
+def get_triple_indices(match: List[int], key: str, doc: Doc) -> tuple:
+    """
+    Args:
+        match: List of token ids for a pattern match
+        key: The pattern key for the pattern that was matched
+        doc: The spacy doc where the match was found
+
+    Returns:
+        triple: (src index, edge name, edge id, dst index) of the match
+    """
+
     data = TRIPLE_PATTERNS[key]
-    src_token_index = match[data['src_rule_index']]
-    dst_token_index = match[data['dst_rule_index']]
+    lemmas = tuple(doc[match[i]].lemma for i in data['edge_rule_indices'])
+    edge_name, edge_id = get_edge(key, lemmas, doc.vocab.strings)
+
+    return match[data['src_rule_index']], edge_name, edge_id, match[data['dst_rule_index']]
+
+
+# Most distinct (pattern key, edge lemmas) names kept formatted
+EDGE_CACHE_SIZE = 2 ** 16
+
+# (pattern key, edge lemma hashes) -> (edge name, edge name hash)
+_EDGES = {}
+
+
+def get_edge(key: str, lemmas: tuple, strings) -> tuple:
+    """ Get the edge name of a pattern for its edge tokens' lemmas
+
+    Names are formatted and hashed once per pattern and lemma hashes, and
+    cached, the cache being emptied once it holds EDGE_CACHE_SIZE names.
+    A cached name is only added to the doc's StringStore if it is missing.
+
+    Args:
+        key: The pattern key for the pattern that was matched
+        lemmas: Tuple of the lemma hashes of the pattern's edge tokens
+        strings: The StringStore of the doc, which the name is added to
+
+    Returns:
+        edge_name: The edge name, e.g. 'prep_in'
+        edge_id: The hash of the edge name in strings
+    """
+
+    edge = _EDGES.get((key, lemmas))
+
+    if edge is None:
+        if len(_EDGES) >= EDGE_CACHE_SIZE:
+            _EDGES.clear()
+
+        edge_fargs = [strings[lemma].lower() for lemma in lemmas]
+        edge_name = TRIPLE_PATTERNS[key]['edge_fstring'].format(*edge_fargs)
+        edge = _EDGES[(key, lemmas)] = (edge_name, strings.add(edge_name))
 
-    edge_tokens = [doc[match[i]] for i in data['edge_rule_indices']]
-    edge_fargs = [t.lemma_.lower() for t in edge_tokens]
-    edge_name = data['edge_fstring'].format(*edge_fargs)
+    # The name may have been cached from a doc with another StringStore
+    elif edge[1] not in strings:
+        strings.add(edge[0])
 
-    src = doc[src_token_index]
-    dst = doc[dst_token_index]
-    return Triple(src, edge_name, dst)
+    return edge
 
 
 def get_pattern_verb_type(key: str):
@@ -19,16 +19,36 @@ Typical usage example:
     # where:
     doc[0] -> "Alice"
     doc[4] -> "store"
+
+Conjoined src and dst tokens are expanded into a triple each. Expansion can
+be capped with max_conjuncts per token and max_triples per match, and the
+number of triples skipped is counted in doc._.pruned_triples.
+
+With compact=True, triples are kept in doc._.triple_arrays as arrays of
+token indices and edge ids instead, and iter_triples(doc) builds the
+Triples from them on demand.
 """
-from spacy.matcher import DependencyMatcher
+import functools
+
 from spacy.language import Language
 from spacy.tokens import Doc, Token
+import numpy as np
 
 import pathvecs.matchers.triples.patterns as patterns
-
-@Language.factory('triple_matcher', default_config={'use_patterns': None})
-def createTripleMatcherComponent(nlp, name, use_patterns):
-    return TripleMatcher(nlp, use_patterns=use_patterns)
+from pathvecs.matchers.registry import get_dependency_matcher
+from pathvecs.matchers.triples.arrays import TripleArrays
+
+@Language.factory(
+    'triple_matcher',
+    default_config={
+        'use_patterns': None, 'validate': True, 'compact': False,
+        'max_conjuncts': None, 'max_triples': None}
+)
+def createTripleMatcherComponent(
+        nlp, name, use_patterns, validate, compact, max_conjuncts, max_triples):
+    return TripleMatcher(
+        nlp, use_patterns=use_patterns, validate=validate, compact=compact,
+        max_conjuncts=max_conjuncts, max_triples=max_triples)
 
 
 class TripleMatcher:
@@ -36,40 +56,132 @@ class TripleMatcher:
 
     Attributes:
         matcher: A spacy.Matcher component with patterns loaded on init
+        compact: Whether triples are kept in doc._.triple_arrays rather than
+            as a list of Triples in doc._.triples
+        on_match: The match callback, with the expansion limits bound
     """
 
-    def __init__(self, nlp, use_patterns=None):
-
-        # Create a matcher using our set of triple patterns
-        self.matcher = DependencyMatcher(nlp.vocab, validate=True)
+    def __init__(
+        self,
+        nlp,
+        use_patterns=None,
+        validate=True,
+        compact=False,
+        max_conjuncts=None,
+        max_triples=None
+    ):
+
+        self.compact = compact
+        self.on_match = functools.partial(
+            on_match_arrays if compact else on_match,
+            max_conjuncts=max_conjuncts,
+            max_triples=max_triples
+        )
+
+        # Get a matcher using our set of triple patterns, compiled once per
+        # vocab, and shared whatever the limits as it has no callbacks
+        self.matcher = get_dependency_matcher(
+            nlp.vocab, 'triples', patterns, use_patterns, None, validate=validate)
 
         # Register token and doc extensions
         if not Doc.has_extension('triples'):
             Doc.set_extension('triples', default=[])
 
-        if not Token.has_extension('verb_type'):
-            Token.set_extension('verb_type', default=None)
+        if not Doc.has_extension('triple_arrays'):
+            Doc.set_extension('triple_arrays', default=None)
 
-        if use_patterns is not None:
+        if not Doc.has_extension('pruned_triples'):
+            Doc.set_extension('pruned_triples', default=0)
 
-            for pattern_key in use_patterns:
-                pattern = patterns.get_pattern(pattern_key)
-                self.matcher.add(pattern_key, [pattern], on_match=on_match)
-
-        else:
-            for pattern_key, pattern in patterns.get_all_patterns():
-                self.matcher.add(pattern_key, [pattern], on_match=on_match)
+        if not Token.has_extension('verb_type'):
+            Token.set_extension('verb_type', default=None)
 
     def __call__(self, doc):
 
+        if self.compact and doc._.triple_arrays is None:
+            doc._.triple_arrays = TripleArrays()
+
         # Add the matched triples when the doc is processed
-        self.matcher(doc)
+        matches = self.matcher(doc)
+        for i in range(len(matches)):
+            self.on_match(self.matcher, doc, i, matches)
+
         return doc
 
 
-def on_match(_matcher, doc, i, matches):
+def on_match(_matcher, doc, i, matches, max_conjuncts=None, max_triples=None):
+
+    doc._.triples.extend(
+        patterns.Triple(doc[src], edge_name, doc[dst])
+        for src, edge_name, _edge_id, dst in match_triple_indices(
+            doc, i, matches, max_conjuncts, max_triples)
+    )
+
+
+def on_match_arrays(_matcher, doc, i, matches, max_conjuncts=None, max_triples=None):
+
+    arrays = doc._.triple_arrays
+    for src, _edge_name, edge_id, dst in match_triple_indices(
+            doc, i, matches, max_conjuncts, max_triples):
+        arrays.append(src, edge_id, dst)
+
+
+def match_triple_indices(doc, i, matches, max_conjuncts=None, max_triples=None):
+    """ Lazily get the triples of a match as token indices, within limits
+
+    The number of triples skipped because of the limits is added to
+    doc._.pruned_triples.
+
+    Returns:
+        triples: Iterator of (src index, edge name, edge id, dst index)
+    """
 
     match_id, match_token_ids = matches[i]
     pattern_key = doc.vocab.strings[match_id]
-    triples = patterns.get_all_triples(match_token_ids, pattern_key, doc)
-    doc._.triples.extend(triples)
+
+    conjunct_matches = patterns.get_conjunct_matches(match_token_ids, pattern_key, doc)
+    conj_matches, num_pruned = patterns.expand_conjunct_matches(
+        conjunct_matches, max_conjuncts, max_triples)
+
+    if num_pruned:
+        doc._.pruned_triples += num_pruned
+
+    return (
+        patterns.get_triple_indices(conj_match, pattern_key, doc)
+        for conj_match in conj_matches
+    )
+
+
+def iter_triples(doc):
+    """ Lazily yield the matched triples of a doc as Triples
+
+    Reads doc._.triple_arrays where the triples were matched with
+    compact=True, and doc._.triples otherwise.
+    """
+
+    arrays = doc._.triple_arrays
+    if arrays is not None:
+        yield from arrays.triples(doc)
+    else:
+        yield from doc._.triples
+
+
+def triple_indices(doc):
+    """ Get the matched triples of a doc as arrays, however they were matched
+
+    Returns:
+        src: Integer array of src token indices
+        edge: uint64 array of edge ids, hashes in doc.vocab.strings
+        dst: Integer array of dst token indices
+    """
+
+    arrays = doc._.triple_arrays
+    if arrays is not None:
+        return arrays.to_numpy()
+
+    strings = doc.vocab.strings
+    return (
+        np.array([triple.src.i for triple in doc._.triples], dtype=np.int_),
+        np.array([strings.add(triple.edge) for triple in doc._.triples], dtype=np.uint64),
+        np.array([triple.dst.i for triple in doc._.triples], dtype=np.int_),
+    )
@@ -1,3 +1,7 @@
+from spacy.attrs import IDX
+import numpy as np
+
+
 def getInboundDependencies(span):
     """ Get the set of dependencies from arcs leading into the span """
 
@@ -23,3 +27,27 @@ def getOutboundDependencies(span):
                 outbound_deps.append(tok.dep_)
 
     return outbound_deps
+
+
+def getTokenExtensionValues(doc, name):
+    """ Get the values a token extension is set to, by token index
+
+    Token extension values are stored in doc.user_data, keyed by the token's
+    character offset, so only the tokens with a value set are looked at.
+    Values that are None are left out.
+    """
+
+    values = {
+        key[2]: value for key, value in doc.user_data.items()
+        if isinstance(key, tuple) and len(key) == 4
+        and key[:2] == ('._.', name) and key[2] is not None and key[3] is None
+        and value is not None
+    }
+
+    if not values:
+        return {}
+
+    char_offsets = doc.to_array(IDX).astype(np.int64)
+    indices = np.searchsorted(char_offsets, list(values))
+
+    return dict(zip(indices.tolist(), values.values()))
@@ -0,0 +1,238 @@
+""" An on-disk store for word-context pairs which can be memory mapped.
+
+A pairs file is a small fixed size header followed by the pairs themselves,
+as a raw little-endian int32 array of shape (N, 2) holding (word id,
+context id) rows. Because the data is raw, it can be opened with
+numpy.memmap and indexed without ever being loaded into memory as a whole.
+
+Header layout (64 bytes):
+
+    magic       8 bytes   b'PVPAIRS\\0'
+    version     uint32
+    columns     uint32    always 2
+    num_pairs   uint64
+    (padding to 64 bytes)
+
+Typical usage example:
+
+    with PairsWriter('pairs.bin') as writer:
+        for shard_pairs in shards:
+            writer.write(shard_pairs)
+
+    pairs = open_pairs('pairs.bin')
+    pairs.shape
+
+    > (num_pairs, 2)
+"""
+import struct
+import os
+
+import numpy as np
+
+
+MAGIC = b'PVPAIRS\0'
+VERSION = 1
+COLUMNS = 2
+DTYPE = np.dtype('<i4')
+
+HEADER_SIZE = 64
+HEADER_FORMAT = '<8sIIQ'
+
+
+def write_header(outfile, num_pairs):
+    """ Write a pairs file header at the start of an open binary file """
+
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, COLUMNS, num_pairs)
+    outfile.seek(0)
+    outfile.write(header.ljust(HEADER_SIZE, b'\0'))
+
+
+def read_header(fp):
+    """ Read and validate a pairs file header
+
+    Args:
+        fp: Path to a pairs file
+
+    Returns:
+        num_pairs: The number of complete pairs recorded in the file
+    """
+
+    with open(fp, 'rb') as infile:
+        header = infile.read(HEADER_SIZE)
+
+    if len(header) < HEADER_SIZE:
+        raise ValueError("'{}' is too short to be a pairs file.".format(fp))
+
+    magic, version, columns, num_pairs = struct.unpack_from(
+        HEADER_FORMAT, header)
+
+    if magic != MAGIC:
+        raise ValueError("'{}' is not a pairs file.".format(fp))
+
+    if version != VERSION or columns != COLUMNS:
+        raise ValueError(
+            "Unsupported pairs file version {} with {} columns in '{}'."
+            .format(version, columns, fp))
+
+    return num_pairs
+
+
+def open_pairs(fp, mode='r'):
+    """ Memory map the pairs in a pairs file
+
+    Args:
+        fp: Path to a pairs file
+        mode: numpy.memmap mode, 'r' for read only or 'c' for copy-on-write
+
+    Returns:
+        pairs: A (N, 2) int32 numpy.memmap
+    """
+
+    num_pairs = read_header(fp)
+
+    # numpy cannot map an empty region
+    if num_pairs == 0:
+        return np.zeros((0, COLUMNS), dtype=DTYPE)
+
+    return np.memmap(
+        fp,
+        dtype=DTYPE,
+        mode=mode,
+        offset=HEADER_SIZE,
+        shape=(num_pairs, COLUMNS)
+    )
+
+
+def subsample_keep_probs(counts, threshold=1e-5):
+    """ Get the probability of keeping each id when subsampling
+
+    Uses the word2vec formulation of Mikolov et al. subsampling, where an id
+    with relative frequency f is kept with probability sqrt(t / f) + t / f
+    for a threshold t, capped at 1.
+
+    Args:
+        counts: Occurrence counts indexed by id
+        threshold: The subsampling threshold t, 1e-5 in the original paper
+
+    Returns:
+        keep_probs: float64 array of keep probabilities indexed by id
+    """
+
+    counts = np.asarray(counts, dtype=np.float64)
+    freqs = counts / max(counts.sum(), 1)
+    ratios = threshold / np.maximum(freqs, np.finfo(np.float64).tiny)
+    return np.minimum(np.sqrt(ratios) + ratios, 1.0)
+
+
+def subsample_pairs(
+    pairs,
+    wcounts=None,
+    ccounts=None,
+    threshold=1e-5,
+    seed=None
+):
+    """ Randomly drop pairs with very frequent words or contexts
+
+    A pair is kept with the product of its word's and its context's keep
+    probabilities (see subsample_keep_probs).
+
+    Args:
+        pairs: (N, 2) array of (word id, context id) pairs
+        wcounts: Word counts indexed by word id, counted from pairs if None
+        ccounts: Context counts indexed by context id, counted from pairs
+            if None
+        threshold: The subsampling threshold
+        seed: Seed for the random draws
+
+    Returns:
+        pairs: The kept pairs, in their original order
+    """
+
+    pairs = np.asarray(pairs)
+
+    if wcounts is None:
+        wcounts = np.bincount(pairs[:, 0])
+    if ccounts is None:
+        ccounts = np.bincount(pairs[:, 1])
+
+    keep_probs = subsample_keep_probs(wcounts, threshold)[pairs[:, 0]]
+    keep_probs *= subsample_keep_probs(ccounts, threshold)[pairs[:, 1]]
+
+    rng = np.random.default_rng(seed)
+    return pairs[rng.random(len(pairs)) < keep_probs]
+
+
+def write_pairs(fp, pairs):
+    """ Write a complete (N, 2) array of pairs to a new pairs file """
+
+    with PairsWriter(fp) as writer:
+        writer.write(pairs)
+
+
+class PairsWriter:
+    """ Writes pairs to a pairs file in chunks
+
+    The header pair count is only updated when the writer is closed, so an
+    interrupted write leaves the file at its last complete state. Opening
+    with append=True discards anything past that count and continues from it.
+
+    Attributes:
+        fp: Path to the pairs file being written
+        num_pairs: The number of pairs in the file so far
+    """
+
+    def __init__(self, fp, append=False):
+
+        self.fp = fp
+
+        if append and os.path.exists(fp):
+            self.num_pairs = read_header(fp)
+            self._file = open(fp, 'r+b')
+            self._file.truncate(
+                HEADER_SIZE + self.num_pairs * COLUMNS * DTYPE.itemsize)
+
+        else:
+            self.num_pairs = 0
+            self._file = open(fp, 'w+b')
+            write_header(self._file, self.num_pairs)
+
+        self._file.seek(0, os.SEEK_END)
+
+    def write(self, pairs):
+        """ Append a (n, 2) array of pairs """
+
+        pairs = np.ascontiguousarray(pairs, dtype=DTYPE)
+
+        if pairs.ndim != 2 or pairs.shape[1] != COLUMNS:
+            raise ValueError("Expected pairs of shape (n, {}), got {}.".format(
+                COLUMNS, pairs.shape))
+
+        self._file.write(pairs.tobytes())
+        self.num_pairs += len(pairs)
+
+    def truncate(self, num_pairs):
+        """ Discard every pair past the first num_pairs """
+
+        if num_pairs > self.num_pairs:
+            raise ValueError("Cannot truncate {} pairs to {}.".format(
+                self.num_pairs, num_pairs))
+
+        self.num_pairs = num_pairs
+        self._file.truncate(HEADER_SIZE + num_pairs * COLUMNS * DTYPE.itemsize)
+        self._file.seek(0, os.SEEK_END)
+
+    def close(self):
+        """ Record the final pair count and close the file """
+
+        if self._file.closed:
+            return
+
+        self._file.flush()
+        write_header(self._file, self.num_pairs)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,123 @@
+""" Read parsed docs from DocBin files by doc range, and split them into ranges.
+
+A DocBin file is a single compressed message, so every read of it
+decompresses the whole file, and holds all of it in memory until the
+requested docs' token arrays have been copied out. After that only the
+arrays of the requested doc range are kept, docs are built one at a time
+as they are iterated over, and each doc's arrays are released as soon as
+its Doc has been built. Reading k ranges of a file with read_docs therefore
+decompresses it k times, and each reader needs memory for a whole file.
+
+Large parse files can instead be split into doc ranges with a single read,
+with split_doc_bin, and each range written out and handed to a different
+worker, so that one big file or a few uneven ones don't keep most workers
+idle.
+
+Typical usage example:
+
+    for (start, stop), doc_bin in split_doc_bin('0001.spacy', 250):
+        doc_bin.to_disk('0001.docs_{}_{}.spacy'.format(start, stop))
+
+    for doc in read_docs('0001.docs_0_250.spacy', nlp.vocab):
+        ...
+"""
+from copy import copy
+
+from spacy.tokens import DocBin
+import numpy as np
+
+
+# Lists a DocBin holds with one entry per doc, which get_docs reads by index
+_DOC_FIELDS = ['tokens', 'spaces', 'flags', 'cats', 'span_groups', 'user_data']
+
+
+def load_doc_bin(fp, start=0, stop=None):
+    """ Load a DocBin, keeping only the docs in [start, stop)
+
+    The kept token and space arrays are copied out of the decompressed
+    file, so that the rest of it can be freed.
+    """
+
+    doc_bin = DocBin().from_disk(fp)
+    _keep_range(doc_bin, start, stop, copy_arrays=True)
+
+    return doc_bin
+
+
+def _keep_range(doc_bin, start, stop, copy_arrays=False):
+    """ Drop the per-doc entries of a DocBin outside [start, stop) in place """
+
+    for field in _DOC_FIELDS:
+        values = getattr(doc_bin, field, None)
+        if values is None:
+            continue
+
+        setattr(doc_bin, field, [
+            value.copy() if copy_arrays and isinstance(value, np.ndarray) else value
+            for value in values[start:stop]
+        ])
+
+
+def read_docs(fp, vocab, start=0, stop=None):
+    """ Yield the docs of a DocBin file one at a time, optionally a range
+
+    Args:
+        fp: Path to a .spacy DocBin file
+        vocab: Vocab to build the docs with, e.g. nlp.vocab
+        start: Index of the first doc to read
+        stop: Index one past the last doc to read, None for the end
+
+    Yields:
+        doc: Each parsed Doc in the range, in order
+    """
+
+    doc_bin = load_doc_bin(fp, start, stop)
+
+    for i, doc in enumerate(doc_bin.get_docs(vocab)):
+
+        # get_docs only reads each doc's arrays once, so drop them
+        doc_bin.tokens[i] = None
+        doc_bin.spaces[i] = None
+
+        yield doc
+
+
+def count_docs(fp):
+    """ Get the number of docs in a DocBin file """
+    return len(DocBin().from_disk(fp))
+
+
+def split_doc_bin(fp, docs_per_range):
+    """ Split a DocBin file into DocBins of doc ranges, reading it once
+
+    The range DocBins share the attrs and strings of the file, and are
+    sliced from its token arrays without building any Docs.
+
+    Args:
+        fp: Path to a .spacy DocBin file
+        docs_per_range: Most docs in each range
+
+    Yields:
+        doc_range: The (start, stop) doc indices of the range
+        doc_bin: DocBin of only the docs in the range
+    """
+
+    doc_bin = DocBin().from_disk(fp)
+
+    for start, stop in doc_ranges(len(doc_bin), docs_per_range):
+        range_bin = copy(doc_bin)
+        _keep_range(range_bin, start, stop)
+        yield (start, stop), range_bin
+
+
+def doc_ranges(num_docs, docs_per_range):
+    """ Split num_docs into [start, stop) ranges of at most docs_per_range """
+
+    if docs_per_range < 1:
+        raise ValueError("docs_per_range must be positive, got {}.".format(
+            docs_per_range))
+
+    return [
+        (start, min(start + docs_per_range, num_docs))
+        for start in range(0, num_docs, docs_per_range)
+    ]
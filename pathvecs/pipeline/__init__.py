@@ -0,0 +1 @@
+""" Command line stages of the data pipeline, each runnable with python -m. """
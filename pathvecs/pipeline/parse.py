@@ -0,0 +1,258 @@
+""" Parse a WikiExtractor corpus into DocBin files, resumably.
+
+Texts are streamed from the corpus folder in a fixed order and parsed with
+nlp.pipe, and every `docs_per_file` parsed docs are written to the next
+numbered DocBin file in the output folder. Components the matchers don't
+read, such as the NER, are excluded from the pipeline.
+
+Each DocBin file is written atomically, and a manifest recording how many
+texts have been parsed so far is updated after it. An interrupted run, or
+one stopped with --max-files, skips the texts already parsed and carries on
+from the next file.
+
+Typical usage example:
+
+    python -m pathvecs.pipeline.parse \\
+        --corpus data/corpora/wikipedia_20220101 \\
+        --output data/parses/wikipedia_20220101 \\
+        --model en_core_web_lg \\
+        --processes 8
+
+    > 000012.spacy  12,000 docs  4,812 tokens/s
+    > ...
+
+Both the plain ('<doc id=...>' blocks) and --json outputs of WikiExtractor
+are read.
+"""
+from pathlib import Path
+import itertools
+import argparse
+import json
+import time
+import re
+import os
+
+from spacy.tokens import DocBin
+import spacy
+
+
+MANIFEST = 'manifest.json'
+
+# Pipeline components whose annotations the matchers never read
+EXCLUDED_PIPES = ['ner']
+
+_DOC_START = re.compile(r'<doc id="([^"]*)"[^>]*?title="([^"]*)"')
+
+
+def read_wiki_file(fp):
+    """ Yield the (doc id, text) of each article in a WikiExtractor file """
+
+    with open(fp, encoding='utf-8') as infile:
+
+        doc_id, title, lines = None, None, []
+        for line in infile:
+
+            if doc_id is None and line.startswith('{'):
+                record = json.loads(line)
+                yield record['id'], record['text'].strip()
+
+            elif doc_id is None:
+                match = _DOC_START.match(line)
+                if match:
+                    doc_id, title = match.groups()
+                    lines = []
+
+            elif line.startswith('</doc>'):
+
+                # The title is repeated as the first line of the text
+                if lines and lines[0].strip() == title:
+                    lines = lines[1:]
+
+                yield doc_id, ''.join(lines).strip()
+                doc_id = None
+
+            else:
+                lines.append(line)
+
+
+def read_corpus(corpus, max_length=None):
+    """ Yield the (doc id, text) of every article in a corpus, in order
+
+    Files are read in sorted order, from any depth of the corpus folder.
+    Empty texts, and texts longer than max_length characters, are skipped.
+    """
+
+    files = sorted(
+        fp for fp in Path(corpus).rglob('*')
+        if fp.is_file() and not fp.name.startswith('.')
+    )
+
+    for fp in files:
+        for doc_id, text in read_wiki_file(fp):
+            if text and (max_length is None or len(text) <= max_length):
+                yield doc_id, text
+
+
+def load_manifest(output):
+    """ Load the manifest of a parses folder
+
+    Returns:
+        manifest: dict with the model name, the docs per file, and the number
+            of files and docs written so far, with the id of the last doc.
+            None for a new folder.
+    """
+
+    fp = Path(output).joinpath(MANIFEST)
+    if not fp.exists():
+        return None
+
+    with open(fp) as infile:
+        return json.load(infile)
+
+
+def save_manifest(output, manifest):
+    """ Atomically replace the manifest of a parses folder """
+
+    fp = Path(output).joinpath(MANIFEST)
+    tmp_fp = fp.with_suffix('.tmp')
+    with open(tmp_fp, 'w') as outfile:
+        json.dump(manifest, outfile, indent=1)
+    os.replace(tmp_fp, fp)
+
+
+def write_doc_bin(fp, doc_bin):
+    """ Write a DocBin through a temporary file, so it is always complete """
+
+    tmp_fp = str(fp) + '.tmp'
+    with open(tmp_fp, 'wb') as outfile:
+        outfile.write(doc_bin.to_bytes())
+    os.replace(tmp_fp, fp)
+
+
+def parse_corpus(
+    corpus,
+    output,
+    model='en_core_web_lg',
+    exclude=EXCLUDED_PIPES,
+    docs_per_file=1000,
+    batch_size=64,
+    num_processes=1,
+    max_files=None,
+    log=print
+):
+    """ Parse the texts of a corpus not parsed yet into numbered DocBin files
+
+    Args:
+        corpus: Folder of WikiExtractor output files
+        output: Folder for the DocBin files and their manifest
+        model: Name or path of the spaCy pipeline to parse with
+        exclude: Pipeline components not to load
+        docs_per_file: Number of docs per DocBin file
+        batch_size: Texts per nlp.pipe batch
+        num_processes: Processes for nlp.pipe to parse with
+        max_files: Stop after writing this many files, None for no limit
+        log: Callable to log progress messages with
+
+    Returns:
+        tokens_per_sec: Throughput over the docs parsed by this run
+    """
+
+    os.makedirs(output, exist_ok=True)
+
+    manifest = load_manifest(output)
+    if manifest is None:
+        manifest = {
+            'model': model,
+            'docs_per_file': docs_per_file,
+            'num_files': 0,
+            'num_docs': 0,
+            'last_doc_id': None
+        }
+
+    for key, value in [('model', model), ('docs_per_file', docs_per_file)]:
+        if manifest[key] != value:
+            raise ValueError("{} {} does not match {} of the existing parses.".format(
+                key, value, manifest[key]))
+
+    nlp = spacy.load(model, exclude=exclude)
+    texts = read_corpus(corpus, max_length=nlp.max_length)
+
+    # Skip over the texts parsed by earlier runs, checking the corpus order
+    if manifest['num_docs']:
+        parsed = list(itertools.islice(texts, manifest['num_docs'] - 1, manifest['num_docs']))
+        if not parsed or parsed[0][0] != manifest['last_doc_id']:
+            raise ValueError(
+                "The corpus no longer matches the parses, doc {:,} should be '{}'.".format(
+                    manifest['num_docs'], manifest['last_doc_id']))
+
+        log("Resuming after {:,} files, {:,} docs".format(
+            manifest['num_files'], manifest['num_docs']))
+
+    # Parse only the texts needed to fill the remaining files
+    if max_files is not None:
+        texts = itertools.islice(texts, max_files * docs_per_file)
+
+    docs = nlp.pipe(
+        ((text, doc_id) for doc_id, text in texts),
+        as_tuples=True,
+        batch_size=batch_size,
+        n_process=num_processes
+    )
+
+    start = time.perf_counter()
+    num_tokens = 0
+
+    while True:
+        batch = list(itertools.islice(docs, docs_per_file))
+        if not batch:
+            break
+
+        doc_bin = DocBin(docs=[doc for doc, _doc_id in batch])
+        fp = Path(output).joinpath('{:06d}.spacy'.format(manifest['num_files']))
+        write_doc_bin(fp, doc_bin)
+
+        manifest['num_files'] += 1
+        manifest['num_docs'] += len(batch)
+        manifest['last_doc_id'] = batch[-1][1]
+        save_manifest(output, manifest)
+
+        num_tokens += sum(len(doc) for doc, _doc_id in batch)
+        log("{}  {:,} docs  {:,.0f} tokens/s".format(
+            fp.name, manifest['num_docs'], num_tokens / (time.perf_counter() - start)))
+
+    return num_tokens / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parse a WikiExtractor corpus into DocBin files.")
+    parser.add_argument('--corpus', required=True,
+        help="folder of WikiExtractor output")
+    parser.add_argument('--output', required=True,
+        help="folder for the DocBin files")
+    parser.add_argument('--model', default='en_core_web_lg')
+    parser.add_argument('--exclude', nargs='*', default=EXCLUDED_PIPES,
+        help="pipeline components not to load")
+    parser.add_argument('--docs-per-file', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=64,
+        help="texts per nlp.pipe batch")
+    parser.add_argument('--processes', type=int, default=1,
+        help="processes for nlp.pipe to parse with")
+    parser.add_argument('--max-files', type=int, default=None,
+        help="stop after writing N more files")
+    args = parser.parse_args()
+
+    parse_corpus(
+        args.corpus,
+        args.output,
+        model=args.model,
+        exclude=args.exclude,
+        docs_per_file=args.docs_per_file,
+        batch_size=args.batch_size,
+        num_processes=args.processes,
+        max_files=args.max_files
+    )
+
+
+if __name__ == '__main__':
+    main()
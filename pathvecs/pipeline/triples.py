@@ -0,0 +1,579 @@
+""" Extract triples from parsed DocBin files, in parallel and resumably.
+
+Each worker process builds a blank Language with only the matcher
+components, which is all that is needed to read DocBins and match the
+triple patterns. Parse files whose triples file already exists and is
+valid are skipped, so an interrupted run picks up where it left off, and
+new parses can be added to a folder and processed incrementally.
+
+Typical usage example:
+
+    python -m pathvecs.pipeline.triples \\
+        --parses data/parses/wikipedia_20220101 \\
+        --output data/triples/wikipedia_20220101
+
+    > 100/1000 shards  98,312 docs  412 docs/s  1,204 triples pruned
+    > ...
+
+Triples files are written flat into the output folder, named after the
+path of their parse file relative to the parses folder, e.g.
+'batch_2/0001.spacy' becomes 'batch_2__0001.npz'.
+
+With --docs-per-task, parse files are split into doc ranges which are
+processed as separate tasks, each written to its own triples file, e.g.
+'0001.docs_0_250.npz'. Later stages treat these as any other shard. Each
+parse file is read once by a worker, which writes its unprocessed ranges
+to DocBins under output/.ranges, and every range task then reads only its
+own. The number of docs in a file is taken from the manifest of its parses
+folder if it has one, so a file whose ranges are all done or already
+written is not read again when resuming. A parse file with a whole-file
+triples file is never split again, but the same output folder should not
+be resumed with a different split.
+
+Matches with conjoined src or dst tokens are expanded into a triple for
+each of at most --max-conjuncts conjuncts, and to at most --max-triples
+triples. The number of triples these limits skipped is logged.
+"""
+from multiprocessing import Pool
+from pathlib import Path
+import itertools
+import argparse
+import time
+import os
+
+from spacy.attrs import DEP, HEAD, LEMMA
+import numpy as np
+import pandas as pd
+
+from pathvecs.matchers import COMBINED_PIPE, load_matchers_nlp, match, triple_indices
+from pathvecs.matchers.utils import getTokenExtensionValues
+from pathvecs.parses import doc_ranges, read_docs, split_doc_bin
+from pathvecs.pipeline.parse import load_manifest, write_doc_bin
+from pathvecs.triples import (
+    SUFFIX,
+    clean_triples,
+    concat_interned,
+    intern_tuples,
+    is_valid,
+    save_triples
+)
+
+
+DEFAULT_TRIPLE_PATTERNS = [
+    'prep',
+    'intransitive_verb_prep',
+    'appos_noun_prep',
+    'be_noun_prep',
+    'poss_noun_appos',
+    'poss_noun_prep'
+]
+
+# Matcher families run over each doc before its triples are collected
+TRIPLE_FAMILIES = ['relative_pronouns', 'triples']
+
+IGNORED_DEPS = {'dep', 'det', 'punct', 'pobj', 'ROOT', 'prep', 'cc'}
+
+# Subfolder of the output for the DocBins of doc ranges still to process
+RANGES = '.ranges'
+
+# Conjunct expansion limits, so list-like sentences with dozens of conjoined
+# nouns don't give a triple for every pairing of them
+MAX_CONJUNCTS = 10
+MAX_TRIPLES = 50
+
+
+def load_triples_nlp(
+    lang='en',
+    triple_patterns=None,
+    max_conjuncts=MAX_CONJUNCTS,
+    max_triples=MAX_TRIPLES
+):
+    """ Build a blank Language matching only what triple extraction reads
+
+    The built-in patterns are covered by the test suite, so they are not
+    validated again in every worker, and triples are matched compactly.
+    """
+
+    return load_matchers_nlp(
+        lang,
+        pipes=[COMBINED_PIPE],
+        triple_patterns=triple_patterns,
+        families=TRIPLE_FAMILIES,
+        validate=False,
+        compact=True,
+        max_conjuncts=max_conjuncts,
+        max_triples=max_triples
+    )
+
+
+def dependency_triples(doc):
+    """ Get the 1-hop dependency triples of every token, one Token at a time
+
+    The reference for dependency_hash_triples, which is used when extracting.
+    Relative pronouns are swapped for their antecedents.
+    """
+
+    triples = []
+
+    for sent in doc.sents:
+        for token in sent:
+
+            dst = token
+            if dst._.antecedent is not None:
+                dst = dst._.antecedent
+
+            dep = dst.dep_
+            if dep in IGNORED_DEPS:
+                continue
+
+            src = token.head
+            if src._.antecedent is not None:
+                src = src._.antecedent
+
+            # edge cases
+            if src == dst:
+                continue
+
+            triples.append((src.lemma_.lower(), dep, dst.lemma_.lower()))
+
+    return triples
+
+
+def antecedent_indices(doc):
+    """ Get the index of every token, or of its antecedent where one is set
+
+    Antecedents are found from the extension values stored in doc.user_data,
+    so only tokens which have one are looked at.
+    """
+
+    indices = np.arange(len(doc))
+    for i, antecedent in getTokenExtensionValues(doc, 'antecedent').items():
+        indices[i] = antecedent.i
+
+    return indices
+
+
+def dependency_hash_triples(doc):
+    """ Get the 1-hop dependency triples of every token, as string hashes
+
+    Equivalent to dependency_triples, but works on the doc's HEAD, DEP and
+    LEMMA arrays without creating a Token per token.
+
+    Returns:
+        hashes: (N, 3) uint64 array of src lemma, dep and dst lemma hashes
+    """
+
+    if not len(doc):
+        return np.zeros((0, 3), dtype=np.uint64)
+
+    array = doc.to_array([HEAD, DEP, LEMMA])
+    heads = np.arange(len(doc)) + array[:, 0].astype(np.int64)
+    deps = array[:, 1]
+    lemmas = array[:, 2]
+
+    antecedents = antecedent_indices(doc)
+    dst = antecedents
+    src = antecedents[heads]
+
+    ignored = np.array([doc.vocab.strings[dep] for dep in IGNORED_DEPS], dtype=np.uint64)
+    keep = ~np.isin(deps[dst], ignored) & (src != dst)
+    src, dst = src[keep], dst[keep]
+
+    return np.stack([lemmas[src], deps[dst], lemmas[dst]], axis=1)
+
+
+def intern_hash_triples(hashes, string_store):
+    """ Intern dependency hash triples, with their lemmas lowercased
+
+    Each distinct hash is looked up in the StringStore once.
+
+    Args:
+        hashes: (N, 3) uint64 array of src lemma, dep and dst lemma hashes
+        string_store: The StringStore the hashes were made with
+
+    Returns:
+        strings: pandas Index, the string table
+        codes: (N, 3) int32 array of positions in strings
+    """
+
+    lemma_codes, lemma_hashes = pd.factorize(hashes[:, [0, 2]].ravel())
+    dep_codes, dep_hashes = pd.factorize(hashes[:, 1])
+
+    table = pd.Index(
+        [string_store[int(h)].lower() for h in lemma_hashes] +
+        [string_store[int(h)] for h in dep_hashes],
+        dtype=object
+    )
+
+    lemma_codes = lemma_codes.reshape(-1, 2)
+    codes = np.stack([
+        lemma_codes[:, 0],
+        dep_codes + len(lemma_hashes),
+        lemma_codes[:, 1]
+    ], axis=1)
+
+    # Lowercasing can map distinct lemmas to one string
+    strings, (codes,) = concat_interned([(table, codes)])
+    return strings, codes
+
+
+def matcher_triples(doc):
+    """ Get the (src, path, dst) string triples of the doc's matched triples
+
+    Relative pronouns are swapped for their antecedents, and edges which are
+    not prepositions are split into nsubj and dobj triples. Works on the
+    matched token indices and the doc's LEMMA array, whether the triples
+    were matched compactly or not.
+    """
+
+    src, edges, dst = triple_indices(doc)
+    if not len(src):
+        return []
+
+    antecedents = antecedent_indices(doc)
+    lemmas = doc.to_array(LEMMA)
+    src, dst = antecedents[src], antecedents[dst]
+
+    # Dont create / add frames that are internal to an entity name
+    keep = src != dst
+    src_lemmas = lemmas[src[keep]].tolist()
+    dst_lemmas = lemmas[dst[keep]].tolist()
+    edges = edges[keep].tolist()
+
+    # Each distinct hash is looked up once
+    strings = doc.vocab.strings
+    texts = {h: strings[h].lower() for h in set(src_lemmas + dst_lemmas)}
+    edge_names = {h: strings[h] for h in set(edges)}
+
+    triples = []
+
+    for src_lemma, edge, dst_lemma in zip(src_lemmas, edges, dst_lemmas):
+
+        edge = edge_names[edge]
+        src_text = texts[src_lemma]
+        dst_text = texts[dst_lemma]
+
+        if edge.startswith('prep_'):
+            triples.append((src_text, edge, dst_text))
+
+        else:
+            # Treat the edge as if it were an active transitive verb
+            triples.append((edge, 'nsubj', src_text))
+            triples.append((edge, 'dobj', dst_text))
+
+    return triples
+
+
+def doc_triples(doc):
+    """ Get the (src, path, dst) string triples of a matched doc
+
+    Includes the 1-hop dependency triples of every token, as well as the
+    triples found by the triple matcher.
+    """
+
+    return dependency_triples(doc) + matcher_triples(doc)
+
+
+def docs_to_triples(docs, nlp):
+    """ Run the matchers over docs and collect their cleaned, interned triples
+
+    Triples are in the same order as doc_triples would give them, doc by doc.
+
+    Returns:
+        strings: pandas Index, the string table
+        codes: (N, 3) int32 array of src, path and dst positions in strings
+        num_docs: The number of docs processed
+        num_pruned: The number of triples skipped by the conjunct limits
+    """
+
+    hash_blocks = [np.zeros((0, 3), dtype=np.uint64)]
+    tuple_blocks = [[]]
+    num_docs = 0
+    num_pruned = 0
+    for doc in docs:
+        doc = match(doc, nlp)
+        hash_blocks.append(dependency_hash_triples(doc))
+        tuple_blocks.append(matcher_triples(doc))
+        num_pruned += doc._.pruned_triples
+        num_docs += 1
+
+    strings, (hash_codes, tuple_codes) = concat_interned([
+        intern_hash_triples(np.concatenate(hash_blocks), nlp.vocab.strings),
+        intern_tuples(itertools.chain.from_iterable(tuple_blocks))
+    ])
+
+    # Put each doc's matched triples back after its dependency triples
+    hash_blocks = np.split(hash_codes, np.cumsum([len(b) for b in hash_blocks])[:-1])
+    tuple_blocks = np.split(tuple_codes, np.cumsum([len(b) for b in tuple_blocks])[:-1])
+    codes = np.concatenate([
+        block for blocks in zip(hash_blocks, tuple_blocks) for block in blocks])
+
+    strings, codes = clean_triples(strings, codes)
+
+    return strings, codes, num_docs, num_pruned
+
+
+def triples_path(parse_fp, parses, output, doc_range=None):
+    """ Get the triples file for a parse file, or a doc range of one """
+
+    relative = Path(parse_fp).relative_to(parses).with_suffix('')
+    name = '__'.join(relative.parts)
+
+    if doc_range is not None:
+        name += '.docs_{}_{}'.format(*doc_range)
+
+    return Path(output).joinpath(name + SUFFIX)
+
+
+def range_path(triples_fp):
+    """ Get the DocBin file of the doc range a triples file is made from """
+
+    triples_fp = Path(triples_fp)
+    return triples_fp.parent.joinpath(RANGES, triples_fp.name).with_suffix('.spacy')
+
+
+def remove_done_ranges(output):
+    """ Remove the range DocBins whose triples are saved, then their folder
+
+    Range tasks remove their own DocBin, so these are only left over by a
+    run interrupted in between.
+    """
+
+    ranges_dir = Path(output).joinpath(RANGES)
+
+    for range_fp in list(ranges_dir.iterdir()):
+        if is_valid(Path(output).joinpath(range_fp.with_suffix(SUFFIX).name)):
+            range_fp.unlink()
+
+    if not any(ranges_dir.iterdir()):
+        ranges_dir.rmdir()
+
+
+def manifest_num_docs(parse_files):
+    """ Get the number of docs in parse files from their folders' manifests
+
+    Only files written by pathvecs.pipeline.parse, numbered in the folder of
+    a manifest, are counted without being read.
+
+    Returns:
+        num_docs: List of the number of docs in each file, None where the
+            manifest doesn't say
+    """
+
+    manifests = {}
+    num_docs = []
+
+    for fp in map(Path, parse_files):
+        if fp.parent not in manifests:
+            manifests[fp.parent] = load_manifest(fp.parent)
+        manifest = manifests[fp.parent]
+
+        index = int(fp.stem) if fp.stem.isdigit() else None
+        if manifest is None or index is None or index >= manifest['num_files']:
+            num_docs.append(None)
+            continue
+
+        num_docs.append(min(
+            manifest['docs_per_file'],
+            manifest['num_docs'] - index * manifest['docs_per_file']))
+
+    return num_docs
+
+
+def range_tasks(parse_fp, ranges, parses, output):
+    """ Get the (range_fp, triples_fp) of a parse file's unprocessed ranges """
+
+    tasks = []
+    for doc_range in ranges:
+        triples_fp = triples_path(parse_fp, parses, output, doc_range)
+        if not is_valid(triples_fp):
+            tasks.append((str(range_path(triples_fp)), str(triples_fp)))
+
+    return tasks
+
+
+_nlp = None
+
+
+def _init_worker(lang, triple_patterns, max_conjuncts, max_triples):
+    global _nlp
+    _nlp = load_triples_nlp(lang, triple_patterns, max_conjuncts, max_triples)
+
+
+def _extract_shard(task):
+    """ Extract and save the triples of a parse file's doc range """
+
+    parse_fp, start, stop, triples_fp = task
+
+    docs = read_docs(parse_fp, _nlp.vocab, start, stop)
+    strings, codes, num_docs, num_pruned = docs_to_triples(docs, _nlp)
+    save_triples(triples_fp, strings, codes)
+
+    return num_docs, num_pruned
+
+
+def _split_parse_file(task):
+    """ Write the unprocessed doc ranges of a parse file to their DocBins """
+
+    parse_fp, docs_per_task, parses, output = task
+
+    tasks = []
+    for doc_range, doc_bin in split_doc_bin(parse_fp, docs_per_task):
+        for range_task in range_tasks(parse_fp, [doc_range], parses, output):
+            if not os.path.exists(range_task[0]):
+                write_doc_bin(range_task[0], doc_bin)
+            tasks.append(range_task)
+
+    return tasks
+
+
+def _extract_range(task):
+    """ Extract and save the triples of a doc range's DocBin, then remove it """
+
+    range_fp, triples_fp = task
+
+    result = _extract_shard((range_fp, 0, None, triples_fp))
+    os.remove(range_fp)
+
+    return result
+
+
+def extract_triples(
+    parses,
+    output,
+    lang='en',
+    triple_patterns=DEFAULT_TRIPLE_PATTERNS,
+    num_processes=None,
+    limit=None,
+    docs_per_task=None,
+    max_conjuncts=MAX_CONJUNCTS,
+    max_triples=MAX_TRIPLES,
+    log=print
+):
+    """ Extract triples from every parse file that has no valid triples yet
+
+    Args:
+        parses: Folder of .spacy DocBin files, searched recursively
+        output: Folder for the triples files
+        lang: Language of the blank pipeline the docs are read with
+        triple_patterns: Triple pattern keys, or None for all of them
+        num_processes: Pool size, defaults to the number of cores
+        limit: Optional maximum number of parse files to consider
+        docs_per_task: Split parse files into tasks of this many docs, or
+            None to process each file as one task
+        max_conjuncts: Most conjuncts of a triple's src or dst to expand
+            to, or None for all of them
+        max_triples: Most triples to expand a triple match to, or None
+        log: Callable to log progress messages with
+
+    Returns:
+        docs_per_sec: Throughput over the parse files processed
+    """
+
+    os.makedirs(output, exist_ok=True)
+
+    all_parse_files = sorted(Path(parses).rglob('*.spacy'))[:limit]
+    parse_files = [
+        fp for fp in all_parse_files
+        if not is_valid(triples_path(fp, parses, output))
+    ]
+
+    log("{:,} of {:,} parse files to process".format(
+        len(parse_files), len(all_parse_files)))
+    if not parse_files:
+        return 0.0
+
+    num_processes = num_processes or os.cpu_count()
+
+    with Pool(
+            processes=num_processes,
+            initializer=_init_worker,
+            initargs=(lang, triple_patterns, max_conjuncts, max_triples)) as pool:
+
+        if docs_per_task is None:
+            extract = _extract_shard
+            tasks = [
+                (str(fp), 0, None, str(triples_path(fp, parses, output)))
+                for fp in parse_files
+            ]
+
+        else:
+            extract = _extract_range
+            tasks, split_tasks = [], []
+            os.makedirs(Path(output).joinpath(RANGES), exist_ok=True)
+
+            # Files whose ranges are known and already written aren't read
+            for fp, num_docs in zip(parse_files, manifest_num_docs(parse_files)):
+                if num_docs is not None:
+                    file_tasks = range_tasks(
+                        fp, doc_ranges(num_docs, docs_per_task), parses, output)
+                    if all(os.path.exists(task[0]) for task in file_tasks):
+                        tasks.extend(file_tasks)
+                        continue
+
+                split_tasks.append((str(fp), docs_per_task, parses, output))
+
+            for file_tasks in pool.imap_unordered(_split_parse_file, split_tasks):
+                tasks.extend(file_tasks)
+
+        log_every = max(len(tasks) // 10, 1)
+
+        start = time.perf_counter()
+        num_docs = 0
+        num_pruned = 0
+
+        for num_done, (shard_docs, shard_pruned) in enumerate(
+                pool.imap_unordered(extract, tasks), start=1):
+            num_docs += shard_docs
+            num_pruned += shard_pruned
+
+            if num_done % log_every == 0 or num_done == len(tasks):
+                elapsed = time.perf_counter() - start
+                log("{}/{} shards  {:,} docs  {:,.0f} docs/s  {:,} triples pruned".format(
+                    num_done, len(tasks), num_docs, num_docs / elapsed, num_pruned))
+
+    if docs_per_task is not None:
+        remove_done_ranges(output)
+
+    return num_docs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract triples from parsed DocBin files.")
+    parser.add_argument('--parses', required=True,
+        help="folder of .spacy DocBin files")
+    parser.add_argument('--output', required=True,
+        help="folder for the triples files")
+    parser.add_argument('--lang', default='en')
+    parser.add_argument('--patterns', nargs='*', default=DEFAULT_TRIPLE_PATTERNS,
+        help="triple pattern keys to match")
+    parser.add_argument('--all-patterns', action='store_true',
+        help="match every triple pattern, overriding --patterns")
+    parser.add_argument('--processes', type=int, default=None,
+        help="worker processes, defaults to the number of cores")
+    parser.add_argument('--limit', type=int, default=None,
+        help="only consider the first N parse files")
+    parser.add_argument('--docs-per-task', type=int, default=None,
+        help="split parse files into tasks of N docs each")
+    parser.add_argument('--max-conjuncts', type=int, default=MAX_CONJUNCTS,
+        help="most conjuncts of a src or dst to expand to, -1 for no limit")
+    parser.add_argument('--max-triples', type=int, default=MAX_TRIPLES,
+        help="most triples to expand a match to, -1 for no limit")
+    args = parser.parse_args()
+
+    extract_triples(
+        args.parses,
+        args.output,
+        lang=args.lang,
+        triple_patterns=None if args.all_patterns else args.patterns,
+        num_processes=args.processes,
+        limit=args.limit,
+        docs_per_task=args.docs_per_task,
+        max_conjuncts=None if args.max_conjuncts < 0 else args.max_conjuncts,
+        max_triples=None if args.max_triples < 0 else args.max_triples
+    )
+
+
+if __name__ == '__main__':
+    main()
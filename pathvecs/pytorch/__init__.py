@@ -1 +1,4 @@
 from .dataset import *
+from .streaming import *
+from .model import *
+from .hogwild import train_hogwild
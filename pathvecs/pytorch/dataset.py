@@ -1,5 +1,12 @@
+import copy
+import os
+
+import numpy as np
 import torch
 from torch.utils.data import Sampler, Dataset, RandomSampler
+from torch.utils.data.dataloader import default_collate
+
+from pathvecs.pairs import open_pairs, subsample_keep_probs
 
 
 class WordContextDataset(Dataset):
@@ -7,17 +14,72 @@ class WordContextDataset(Dataset):
 
     For every drawn sample pair, (N) additional contexts are randomly drawn as
     negative samples.
+
+    When used with a DataLoader, pass `collate_fn=collate_batch` so that
+    whole batches are drawn through __getitems__, with the negatives for the
+    batch sampled as a single (B x N) block.
+
+    The negative sampler backend is picked with `sampler`, one of:
+        'table': UnigramSampler, the original paper's large unigram table
+        'cdf': UnigramCDFSampler, a search over the cumulative distribution
+
+    pairs_data can also be the path to a pairs file (see pathvecs.pairs), in
+    which case the pairs are memory mapped rather than loaded into memory.
+
+    With a `subsample` threshold, pairs with frequent words or contexts are
+    randomly dropped from each batch drawn through __getitems__ (see
+    pathvecs.pairs.subsample_keep_probs), so batches come out smaller than
+    the requested batch size. __getitem__ is not subsampled.
     """
 
-    def __init__(self, pairs_data, negative_samples=5):
+    def __init__(
+        self,
+        pairs_data,
+        negative_samples=5,
+        sampler='table',
+        table_size=1e8,
+        subsample=None
+    ):
         super(WordContextDataset).__init__()
 
+        if isinstance(pairs_data, (str, os.PathLike)):
+            self.pairs_file = str(pairs_data)
+            pairs_data = load_pairs(self.pairs_file)
+        else:
+            self.pairs_file = None
+
         self.pairs_data = pairs_data
         self.negative_samples = negative_samples
-        self.negative_sampler = UnigramSampler(
-            data_source=self.pairs_data[:,1],
-            num_samples=negative_samples
-        )
+
+        # Counted a block at a time, so memory mapped columns aren't copied
+        ccounts = count_pairs(self.pairs_data.numpy(), 1)
+
+        if sampler == 'table':
+            self.negative_sampler = UnigramSampler(
+                data_source=self.pairs_data[:,1],
+                num_samples=negative_samples,
+                table_size=table_size,
+                freqs=ccounts
+            )
+
+        elif sampler == 'cdf':
+            self.negative_sampler = UnigramCDFSampler(
+                data_source=self.pairs_data[:,1],
+                num_samples=negative_samples,
+                freqs=ccounts
+            )
+
+        else:
+            raise KeyError("No negative sampler found for key '{}'.".format(
+                sampler))
+
+        self.subsample = subsample
+        if subsample is not None:
+            wcounts = count_pairs(self.pairs_data.numpy(), 0)
+            self.w_keep_probs = torch.from_numpy(
+                subsample_keep_probs(wcounts.numpy(), subsample))
+            self.c_keep_probs = torch.from_numpy(
+                subsample_keep_probs(ccounts.numpy(), subsample))
 
     def __getitem__(self, idx):
         w_pos = self.pairs_data[idx, 0]
@@ -26,9 +88,139 @@ class WordContextDataset(Dataset):
 
         return w_pos, c_pos, c_neg
 
+    def __getitems__(self, indices):
+        """ Get a whole batch of samples for a list of indices
+
+        Returns (with B <= len(indices) when subsampling):
+            w_pos: B
+            c_pos: B
+            c_neg: B x N
+        """
+        indices = torch.as_tensor(indices, dtype=torch.int64)
+        w_pos = self.pairs_data[indices, 0]
+        c_pos = self.pairs_data[indices, 1]
+
+        if self.subsample is not None:
+            keep_probs = self.w_keep_probs[w_pos.long()]
+            keep_probs = keep_probs * self.c_keep_probs[c_pos.long()]
+            keep = torch.rand(
+                len(indices),
+                dtype=torch.float64,
+                generator=self.negative_sampler.generator
+            ) < keep_probs
+            w_pos = w_pos[keep]
+            c_pos = c_pos[keep]
+
+        c_neg = self.negative_sampler.sample(len(w_pos))
+
+        return w_pos, c_pos, c_neg
+
     def __len__(self):
         return len(self.pairs_data)
 
+    def __getstate__(self):
+
+        # Memory mapped pairs are reopened from the file rather than pickled
+        state = self.__dict__.copy()
+        if self.pairs_file is not None:
+            state['pairs_data'] = None
+            state['negative_sampler'] = copy.copy(self.negative_sampler)
+            state['negative_sampler'].data_source = None
+
+        return state
+
+    def __setstate__(self, state):
+
+        self.__dict__.update(state)
+        if self.pairs_file is not None:
+            self.pairs_data = load_pairs(self.pairs_file)
+            self.negative_sampler.data_source = self.pairs_data[:,1]
+
+    def share_memory(self):
+        """ Move the pairs data and sampling distribution to shared memory
+
+        DataLoader workers then attach to the same tensors when the dataset
+        is sent to them, rather than each worker holding its own copy. Memory
+        mapped pairs are already shared through the page cache and are left
+        in place.
+        """
+
+        if self.pairs_file is None:
+            self.pairs_data.share_memory_()
+
+        self.negative_sampler.share_memory()
+        if self.subsample is not None:
+            self.w_keep_probs.share_memory_()
+            self.c_keep_probs.share_memory_()
+
+        return self
+
+
+def load_pairs(fp):
+    """ Memory map a pairs file as a (N, 2) int32 tensor
+
+    The mapping is copy-on-write, so the file itself is never modified.
+    """
+
+    return torch.from_numpy(open_pairs(fp, mode='c'))
+
+
+def count_pairs(pairs, column, block_size=2**22):
+    """ Count id occurrences in one column of (N, 2) pairs, a block at a time
+
+    Only one block of the column is copied at a time, so memory mapped
+    pairs are never read into memory whole.
+
+    Returns:
+        counts: Tensor of occurrence counts indexed by id
+    """
+
+    counts = np.zeros(0, dtype=np.int64)
+    for start in range(0, len(pairs), block_size):
+        block_counts = np.bincount(pairs[start:start + block_size, column])
+        if len(block_counts) > len(counts):
+            counts = np.pad(counts, (0, len(block_counts) - len(counts)))
+        counts[:len(block_counts)] += block_counts
+
+    return torch.from_numpy(counts)
+
+
+def count_column(pairs_files, column, block_size=2**22):
+    """ Count id occurrences in one column of pairs files, a block at a time
+
+    Args:
+        pairs_files: Paths to pairs files
+        column: 0 to count words, 1 to count contexts
+        block_size: Pairs read per block
+
+    Returns:
+        counts: Tensor of occurrence counts indexed by id
+    """
+
+    counts = torch.zeros(0, dtype=torch.int64)
+    for fp in pairs_files:
+        file_counts = count_pairs(open_pairs(fp), column, block_size)
+        if len(file_counts) > len(counts):
+            counts = torch.nn.functional.pad(
+                counts, (0, len(file_counts) - len(counts)))
+        counts[:len(file_counts)] += file_counts
+
+    return counts
+
+
+def collate_batch(batch):
+    """ Collate function for DataLoaders over a WordContextDataset
+
+    Batches drawn through __getitems__ are already collated and are passed
+    through as is. Anything else, e.g. from torch versions that do not call
+    __getitems__, falls back to the default per-item collation.
+    """
+
+    if isinstance(batch, tuple):
+        return batch
+
+    return default_collate(batch)
+
 
 class UnigramSampler(Sampler):
     """ Draws samples from the unigram (word frequency) distribution
@@ -36,6 +228,9 @@ class UnigramSampler(Sampler):
     This can be used for negative sampling. Using the table method from the
     original paper ended up being faster than pytorch's WeightedRandomSampler,
     probably with memory overhead cost which is fine at this scale
+
+    Precomputed observation counts can be passed as `freqs` in place of
+    counting the data_source.
     """
 
     def __init__(
@@ -43,7 +238,8 @@ class UnigramSampler(Sampler):
         data_source,
         num_samples=5,
         table_size=1e8,
-        generator=None
+        generator=None,
+        freqs=None
     ):
 
         self.data_source = data_source
@@ -51,7 +247,10 @@ class UnigramSampler(Sampler):
         self.num_samples = num_samples
 
         self.generator = generator
-        self._init_unigram_table(data_source)
+        if freqs is None:
+            freqs = torch.bincount(data_source)
+
+        self._init_unigram_table(freqs)
         self.random_sampler = RandomSampler(
             self.unigram_table,
             num_samples=num_samples,
@@ -68,15 +267,36 @@ class UnigramSampler(Sampler):
     def __len__(self):
         return len(self.data_source)
 
-    def _init_unigram_table(self, data):
-        """ Initialize a unigram table to sample from given the observed data
+    def share_memory(self):
+        """ Move the unigram table to shared memory """
+
+        self.unigram_table.share_memory_()
+        return self
+
+    def sample(self, batch_size):
+        """ Draw a (batch_size x num_samples) block of samples at once
+
+        Table indices are drawn with a single randint call, in the same order
+        and from the same generator stream as iterating the sampler
+        batch_size times, so for a seeded generator the two are identical.
+        """
+
+        indices = torch.randint(
+            high=len(self.unigram_table),
+            size=(batch_size, self.num_samples),
+            dtype=torch.int64,
+            generator=self.generator
+        )
+        return self.unigram_table[indices]
+
+    def _init_unigram_table(self, freqs):
+        """ Initialize a unigram table to sample from given observation counts
 
         Create a large ( n >> len(vocab) ) vector of sample indices allocated
         proportional to the frequency of the observations raised to some power.
         pow = 0.75 is what was used in Mikolov et al.
         """
 
-        freqs = torch.bincount(data)
         sample_ratios = freqs.pow(0.75)
         sample_ratios /= sample_ratios.sum()
         allotments = (sample_ratios * self.table_size).type(torch.int32)
@@ -85,3 +305,73 @@ class UnigramSampler(Sampler):
             for i, num in enumerate(allotments.data.tolist())
         ]
         self.unigram_table = torch.cat(samples)
+
+
+class UnigramCDFSampler(Sampler):
+    """ Draws samples from the unigram (word frequency) distribution
+
+    A compact alternative to UnigramSampler. Rather than a large table,
+    only the cumulative distribution over the observed values is kept
+    (O(vocab) memory) and uniform draws are mapped through it with a binary
+    search. It builds in milliseconds, and samples from the exact powered
+    distribution where the table truncates each entry's allotment.
+
+    Precomputed observation counts can be passed as `freqs` in place of the
+    data_source, e.g. when the data is streamed rather than held in memory.
+    """
+
+    def __init__(
+        self,
+        data_source=None,
+        num_samples=5,
+        generator=None,
+        freqs=None
+    ):
+
+        self.data_source = data_source
+        self.num_samples = num_samples
+
+        self.generator = generator
+
+        if freqs is None:
+            freqs = torch.bincount(data_source)
+
+        self.num_observations = int(freqs.sum())
+        self._init_cdf(freqs)
+
+        super().__init__(self.data_source)
+
+    def __iter__(self):
+        yield from self.sample(1)[0]
+
+    def __len__(self):
+        return self.num_observations
+
+    def share_memory(self):
+        """ Move the cumulative distribution to shared memory """
+
+        self.cdf.share_memory_()
+        return self
+
+    def sample(self, batch_size):
+        """ Draw a (batch_size x num_samples) block of samples at once """
+
+        uniform = torch.rand(
+            (batch_size, self.num_samples),
+            dtype=torch.float64,
+            generator=self.generator
+        )
+        samples = torch.searchsorted(self.cdf, uniform * self.cdf[-1], right=True)
+
+        # Guard against a draw rounding up to the total
+        return samples.clamp_(max=len(self.cdf) - 1)
+
+    def _init_cdf(self, freqs):
+        """ Initialize the cumulative sampling distribution from counts
+
+        Observation frequencies are raised to the same 0.75 power as the
+        unigram table, from Mikolov et al.
+        """
+
+        sample_ratios = freqs.to(torch.float64).pow(0.75)
+        self.cdf = torch.cumsum(sample_ratios, dim=0)
@@ -0,0 +1,201 @@
+""" Hogwild style multi-process training of the skip gram model.
+
+As in word2vec and word2vecf, several workers update the same embeddings
+without any locking. The model's embeddings are moved to shared memory and
+each worker process trains on its own contiguous shard of the pairs with
+sparse SGD, linearly decaying its learning rate over its shard. Collisions
+between workers are rare enough with sparse updates that they do not hurt
+convergence, and throughput scales with the number of cores.
+
+Typical usage example:
+
+    model = SkipGramModel(wvocab, cvocab, emb_dim=128)
+    train_hogwild(model, 'pairs.bin', num_processes=8)
+"""
+import time
+import os
+
+import torch
+import torch.nn as nn
+import torch.multiprocessing as mp
+
+from pathvecs.pytorch.dataset import UnigramCDFSampler, count_pairs, load_pairs
+from pathvecs.pytorch.model import sgns_scores
+
+
+def train_hogwild(
+    model,
+    pairs_data,
+    num_processes=None,
+    batch_size=256,
+    negative_samples=5,
+    num_epochs=1,
+    lr=0.025,
+    min_lr=1e-4,
+    seed=0,
+    log_every=10.0,
+    log=print
+):
+    """ Train a SkipGramModel in place with lock-free worker processes
+
+    The loss is summed rather than averaged over each batch, so that every
+    pair gets a full SGD step as in word2vec; batches only amortize the
+    per-step overhead and should be kept small.
+
+    Args:
+        model: SkipGramModel, its embeddings are moved to shared memory
+        pairs_data: (N, 2) tensor of pairs, or the path to a pairs file
+        num_processes: Number of workers, defaults to the number of cores
+        batch_size: Pairs per update
+        negative_samples: Negative contexts drawn per pair
+        num_epochs: Passes over each worker's shard
+        lr: Starting learning rate, decayed linearly to min_lr
+        min_lr: Floor for the learning rate
+        seed: Seed for the per-worker batch order and negative samples
+        log_every: Seconds between throughput logs
+        log: Callable to log progress messages with
+
+    Returns:
+        pairs_per_sec: Overall training throughput
+    """
+
+    num_processes = num_processes or os.cpu_count()
+
+    # Workers reopen pairs files themselves, and attach to shared tensors
+    if isinstance(pairs_data, (str, os.PathLike)):
+        pairs_data = str(pairs_data)
+        pairs = load_pairs(pairs_data)
+    else:
+        pairs = pairs_data.share_memory_()
+
+    # Counted a block at a time, so memory mapped columns aren't copied
+    sampler = UnigramCDFSampler(
+        freqs=count_pairs(pairs.numpy(), 1),
+        num_samples=negative_samples
+    )
+
+    model.share_memory()
+
+    config = {
+        'batch_size': batch_size,
+        'num_epochs': num_epochs,
+        'lr': lr,
+        'min_lr': min_lr,
+        'seed': seed
+    }
+
+    context = mp.get_context('spawn')
+    progress = context.Value('q', 0)
+    total_pairs = len(pairs) * num_epochs
+
+    processes = []
+    for rank in range(num_processes):
+        process = context.Process(
+            target=_train_worker,
+            args=(
+                rank,
+                num_processes,
+                model.w_embeddings.weight,
+                model.c_embeddings.weight,
+                pairs_data,
+                sampler,
+                config,
+                progress
+            )
+        )
+        process.start()
+        processes.append(process)
+
+    start = time.perf_counter()
+    running = True
+    while running:
+        for process in processes:
+            process.join(timeout=log_every / num_processes)
+        running = any(p.is_alive() for p in processes)
+
+        elapsed = time.perf_counter() - start
+        done = progress.value
+        log("{:,} / {:,} pairs ({:.1%})  {:,.0f} pairs/s".format(
+            done, total_pairs, done / max(total_pairs, 1), done / elapsed))
+
+    failed = [p.exitcode for p in processes if p.exitcode != 0]
+    if failed:
+        raise RuntimeError(
+            "{} hogwild worker(s) failed with exit codes {}".format(
+                len(failed), failed))
+
+    return progress.value / elapsed
+
+
+def _train_worker(
+    rank,
+    num_processes,
+    w_weight,
+    c_weight,
+    pairs_data,
+    sampler,
+    config,
+    progress
+):
+    """ Train on one shard of the pairs, updating the shared embeddings """
+
+    # Parallelism comes from the processes, not from intra-op threads
+    torch.set_num_threads(1)
+
+    if isinstance(pairs_data, str):
+        pairs_data = load_pairs(pairs_data)
+
+    start = rank * len(pairs_data) // num_processes
+    end = (rank + 1) * len(pairs_data) // num_processes
+
+    # Embedding modules around the shared weights, no copies are made
+    w_embeddings = nn.Embedding.from_pretrained(
+        w_weight, freeze=False, sparse=True)
+    c_embeddings = nn.Embedding.from_pretrained(
+        c_weight, freeze=False, sparse=True)
+
+    optimizer = torch.optim.SGD(
+        [w_embeddings.weight, c_embeddings.weight], lr=config['lr'])
+
+    generator = torch.Generator().manual_seed(config['seed'] + rank)
+    sampler.generator = generator
+
+    batch_size = config['batch_size']
+    total = max((end - start) * config['num_epochs'], 1)
+    done = 0
+    unreported = 0
+
+    for _epoch in range(config['num_epochs']):
+
+        batch_starts = torch.arange(start, end, batch_size)
+        order = torch.randperm(len(batch_starts), generator=generator)
+
+        for batch_start in batch_starts[order].tolist():
+            batch = pairs_data[batch_start:min(batch_start + batch_size, end)]
+
+            lr = config['lr'] * (1 - done / total)
+            optimizer.param_groups[0]['lr'] = max(lr, config['min_lr'])
+            optimizer.zero_grad()
+
+            pos_score, neg_score = sgns_scores(
+                w_embeddings,
+                c_embeddings,
+                batch[:, 0].long(),
+                batch[:, 1].long(),
+                sampler.sample(len(batch))
+            )
+            loss = -1 * (pos_score + neg_score)
+            loss.backward()
+            optimizer.step()
+
+            done += len(batch)
+            unreported += len(batch)
+
+            # Report in chunks to keep contention on the counter low
+            if unreported >= 100 * batch_size:
+                with progress.get_lock():
+                    progress.value += unreported
+                unreported = 0
+
+    with progress.get_lock():
+        progress.value += unreported
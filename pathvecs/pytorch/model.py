@@ -0,0 +1,166 @@
+import torch.nn.functional as F
+import torch.nn as nn
+import torch
+
+
+class SkipGramModel(nn.Module):
+    """ Skip gram with negative sampling
+
+    Words and contexts have separate embedding tables, since their
+    vocabularies are disjoint.
+    """
+
+    def __init__(self, wvocab, cvocab, emb_dim):
+
+        super().__init__()
+
+        # Vocabulary maps
+        self.w2i = wvocab
+        self.i2w = {i: w for w, i in wvocab.items()}
+
+        self.c2i = cvocab
+        self.i2c = {i: c for c, i in cvocab.items()}
+
+        # Model parameters
+        self.emb_dim = emb_dim
+
+        self.w_embeddings = nn.Embedding(len(wvocab), emb_dim, sparse=True)
+        self.c_embeddings = nn.Embedding(len(cvocab), emb_dim, sparse=True)
+
+        nn.init.uniform_(self.w_embeddings.weight, -1.0, 1.0)
+        nn.init.uniform_(self.c_embeddings.weight, -1.0, 1.0)
+
+    def forward(self, w_pos, c_pos, c_neg):
+        """
+        With B = batch_size, N = negative_samples
+        w_pos: B
+        c_pos: B
+        c_neg: B x N
+        """
+
+        return sgns_scores(
+            self.w_embeddings, self.c_embeddings, w_pos, c_pos, c_neg)
+
+    def top_w_sims(self, word, k=5):
+        """ Get the k nearest words to a word by cosine similarity """
+
+        yield from top_sims(self.w_embeddings.weight, self.w2i, self.i2w, word, k)
+
+
+def sgns_scores(w_embeddings, c_embeddings, w_pos, c_pos, c_neg):
+    """ Get the summed positive and negative log sigmoid scores for a batch
+
+    Args:
+        w_embeddings: Word nn.Embedding
+        c_embeddings: Context nn.Embedding
+        w_pos: B word ids
+        c_pos: B positive context ids
+        c_neg: B x N negative context ids
+
+    Returns:
+        score, neg_score: Scalar sums over the batch
+    """
+
+    w_emb = w_embeddings(w_pos)
+    c_emb = c_embeddings(c_pos)
+    c_neg_emb = c_embeddings(c_neg)
+
+    score = torch.sum(torch.mul(w_emb, c_emb), dim=1)
+    score = F.logsigmoid(score)
+
+    neg_score = torch.bmm(c_neg_emb, w_emb.unsqueeze(2)).squeeze(2)
+    neg_score = F.logsigmoid(-neg_score)
+    neg_score = torch.sum(neg_score, dim=1)
+
+    return torch.sum(score), torch.sum(neg_score)
+
+
+def top_sims(embeddings, w2i, i2w, word, k=5):
+    """ Get the k nearest neighbors to a word in a set of embeddings
+
+    Takes the embedding weights directly, so that it can also be run on a
+    snapshot of the weights while the model keeps training.
+
+    Yields:
+        (word, similarity) pairs, most similar first
+    """
+
+    with torch.no_grad():
+        topk_sims = F.cosine_similarity(
+            embeddings[w2i[word]],
+            embeddings
+        ).topk(k)
+
+    indices = topk_sims.indices.tolist()
+    values = topk_sims.values.tolist()
+    for wi, sim in zip(indices, values):
+        yield i2w[wi], sim
+
+
+def sgns_gradients(w_weight, c_weight, w_pos, c_pos, c_neg):
+    """ Compute the summed SGNS loss and its gradients by hand
+
+    Equivalent to backpropagating the negated sgns_scores, without building
+    an autograd graph or sparse gradient tensors.
+
+    Args:
+        w_weight: Word embedding weights
+        c_weight: Context embedding weights
+        w_pos: B word ids
+        c_pos: B positive context ids
+        c_neg: B x N negative context ids
+
+    Returns:
+        loss: Scalar loss summed over the batch
+        w_grad: B x D gradients for the rows w_pos
+        c_grad: B x D gradients for the rows c_pos
+        c_neg_grad: B x N x D gradients for the rows c_neg
+    """
+
+    w_emb = w_weight[w_pos]
+    c_emb = c_weight[c_pos]
+    c_neg_emb = c_weight[c_neg]
+
+    score = torch.sum(torch.mul(w_emb, c_emb), dim=1)
+    neg_score = torch.bmm(c_neg_emb, w_emb.unsqueeze(2)).squeeze(2)
+
+    loss = -1 * (F.logsigmoid(score).sum() + F.logsigmoid(-neg_score).sum())
+
+    # d/dx -log(sigmoid(x)) = sigmoid(x) - 1
+    # d/dx -log(sigmoid(-x)) = sigmoid(x)
+    pos_coef = (torch.sigmoid(score) - 1).unsqueeze(1)
+    neg_coef = torch.sigmoid(neg_score)
+
+    w_grad = pos_coef * c_emb
+    w_grad += torch.bmm(neg_coef.unsqueeze(1), c_neg_emb).squeeze(1)
+    c_grad = pos_coef * w_emb
+    c_neg_grad = neg_coef.unsqueeze(2) * w_emb.unsqueeze(1)
+
+    return loss, w_grad, c_grad, c_neg_grad
+
+
+def sgns_sgd_step(w_weight, c_weight, w_pos, c_pos, c_neg, lr):
+    """ Take a fused SGD step on the summed SGNS loss of a batch
+
+    Gradients are computed by hand and added directly into the embedding
+    tables with index_add_, which accumulates repeated ids the same way a
+    sparse gradient would. There is no autograd graph and no optimizer state.
+
+    Returns:
+        loss: Scalar loss summed over the batch, from before the update
+    """
+
+    w_pos = w_pos.long()
+    c_pos = c_pos.long()
+    c_neg = c_neg.long()
+
+    with torch.no_grad():
+        loss, w_grad, c_grad, c_neg_grad = sgns_gradients(
+            w_weight, c_weight, w_pos, c_pos, c_neg)
+
+        w_weight.index_add_(0, w_pos, w_grad, alpha=-lr)
+        c_weight.index_add_(0, c_pos, c_grad, alpha=-lr)
+        c_weight.index_add_(
+            0, c_neg.flatten(), c_neg_grad.flatten(0, 1), alpha=-lr)
+
+    return loss
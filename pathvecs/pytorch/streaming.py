@@ -0,0 +1,171 @@
+""" A streaming interface for word-context pairs stored in pairs files.
+
+Rather than shuffling the whole dataset up front, pairs are read in
+contiguous blocks from one or more pairs files (see pathvecs.pairs). Blocks
+are visited in a random order and shuffled together in a bounded buffer, so
+peak memory depends on the buffer size rather than on the size of the corpus.
+
+Pairs with frequent words or contexts can be subsampled as they are read
+(see pathvecs.pairs.subsample_keep_probs), so that batches stay full.
+
+Typical usage example:
+
+    dataset = StreamingWordContextDataset(
+        pairs_files, batch_size=2048, negative_samples=10)
+
+    # Batches come out of the dataset ready made, so disable auto-batching
+    dataloader = DataLoader(dataset, batch_size=None, num_workers=4)
+
+    for epoch in range(num_epochs):
+        dataset.set_epoch(epoch)
+        for w_pos, c_pos, c_neg in dataloader:
+            ...
+"""
+import copy
+import os
+
+import numpy as np
+import torch
+from torch.utils.data import IterableDataset, get_worker_info
+
+from pathvecs.pairs import open_pairs, read_header, subsample_keep_probs
+from pathvecs.pytorch.dataset import UnigramCDFSampler, count_column
+
+
+class StreamingWordContextDataset(IterableDataset):
+    """ Iterable-style interface for a set of word-context pairs
+
+    Yields batches of (w_pos, c_pos, c_neg), with (N) negative contexts drawn
+    for every pair. The pairs files are split into blocks of block_size pairs
+    and the shuffled block order is dealt out between DataLoader workers, so
+    that each pair is seen by exactly one worker per epoch.
+
+    Attributes:
+        blocks: (file index, start, end) ranges of pairs to be read
+        num_pairs: Total number of pairs over all files
+        negative_sampler: Sampler over the context frequencies of all files
+    """
+
+    def __init__(
+        self,
+        pairs_files,
+        batch_size=2048,
+        negative_samples=5,
+        block_size=2**16,
+        buffer_size=2**22,
+        drop_last=False,
+        seed=0,
+        subsample=None
+    ):
+        super().__init__()
+
+        if isinstance(pairs_files, (str, os.PathLike)):
+            pairs_files = [pairs_files]
+
+        self.pairs_files = [str(fp) for fp in pairs_files]
+        self.batch_size = batch_size
+        self.negative_samples = negative_samples
+        self.block_size = block_size
+        self.buffer_size = max(buffer_size, batch_size)
+        self.drop_last = drop_last
+        self.seed = seed
+        self.epoch = 0
+
+        self.blocks = []
+        for file_index, fp in enumerate(self.pairs_files):
+            num_pairs = read_header(fp)
+            for start in range(0, num_pairs, block_size):
+                end = min(start + block_size, num_pairs)
+                self.blocks.append((file_index, start, end))
+
+        self.num_pairs = sum(end - start for _, start, end in self.blocks)
+
+        # Negatives are drawn from the frequencies before subsampling
+        ccounts = count_column(self.pairs_files, 1)
+        self.negative_sampler = UnigramCDFSampler(
+            freqs=ccounts,
+            num_samples=negative_samples
+        )
+
+        self.subsample = subsample
+        if subsample is not None:
+            wcounts = count_column(self.pairs_files, 0)
+            self.w_keep_probs = subsample_keep_probs(wcounts.numpy(), subsample)
+            self.c_keep_probs = subsample_keep_probs(ccounts.numpy(), subsample)
+
+    def set_epoch(self, epoch):
+        """ Set the epoch, which reseeds the block and pair order """
+        self.epoch = epoch
+
+    def __iter__(self):
+
+        worker_info = get_worker_info()
+        worker_id, num_workers = 0, 1
+        if worker_info is not None:
+            worker_id, num_workers = worker_info.id, worker_info.num_workers
+
+        # The block order is shared so that workers can split it evenly
+        generator = torch.Generator().manual_seed(self.seed + self.epoch)
+        order = torch.randperm(len(self.blocks), generator=generator).tolist()
+        blocks = [self.blocks[i] for i in order[worker_id::num_workers]]
+
+        # Everything else is drawn independently by each worker
+        seed = np.random.SeedSequence([self.seed, self.epoch, worker_id])
+        generator = torch.Generator().manual_seed(int(seed.generate_state(1)[0]))
+        sampler = copy.copy(self.negative_sampler)
+        sampler.generator = generator
+
+        pairs_maps = {}
+        buffer = []
+        buffered = 0
+
+        for file_index, start, end in blocks:
+
+            if file_index not in pairs_maps:
+                pairs_maps[file_index] = open_pairs(self.pairs_files[file_index])
+
+            block = np.array(pairs_maps[file_index][start:end])
+            if self.subsample is not None:
+                block = self._subsample(block, generator)
+
+            buffer.append(block)
+            buffered += len(block)
+
+            if buffered >= self.buffer_size:
+                leftover = yield from self._shuffled_batches(
+                    buffer, sampler, generator, final=False)
+                buffer = [leftover]
+                buffered = len(leftover)
+
+        if buffered:
+            yield from self._shuffled_batches(
+                buffer, sampler, generator, final=True)
+
+    def _subsample(self, block, generator):
+        """ Randomly drop pairs from a block by their keep probabilities """
+
+        keep_probs = self.w_keep_probs[block[:, 0]]
+        keep_probs = keep_probs * self.c_keep_probs[block[:, 1]]
+        draws = torch.rand(len(block), dtype=torch.float64, generator=generator)
+        return block[draws.numpy() < keep_probs]
+
+    def _shuffled_batches(self, buffer, sampler, generator, final):
+        """ Shuffle the buffered blocks together and batch them
+
+        Returns:
+            leftover: Pairs short of a full batch, to carry into the next
+                buffer. Only emitted as a partial batch on the final buffer.
+        """
+
+        pairs = torch.from_numpy(np.concatenate(buffer))
+        pairs = pairs[torch.randperm(len(pairs), generator=generator)]
+
+        num_batches = len(pairs) // self.batch_size
+        if final and not self.drop_last and len(pairs) % self.batch_size:
+            num_batches += 1
+
+        for i in range(num_batches):
+            batch = pairs[i * self.batch_size:(i + 1) * self.batch_size]
+            yield batch[:, 0], batch[:, 1], sampler.sample(len(batch))
+
+        return pairs[num_batches * self.batch_size:].numpy()
@@ -0,0 +1,398 @@
+""" Training for the skip gram model over word-context pairs.
+
+Typical usage example:
+
+    python -m pathvecs.pytorch.train \\
+        --pairs data/pairs/wikipedia_20220101/pairs.bin \\
+        --vocab data/vocab/wikipedia_20220101 \\
+        --output data/models/wikipedia_20220101 \\
+        --num-threads 8 \\
+        --neighbors book be_author_of move-to
+
+    > epoch 0 step 1000  loss 3.4121  412,331 pairs/s
+    > ...
+
+With --step fused, each step computes the SGNS gradient by hand and applies
+it as plain SGD with index_add_, skipping autograd and SparseAdam. With
+--hogwild N, training instead runs lock-free over N processes with sparse
+SGD, see pathvecs.pytorch.hogwild.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import argparse
+import time
+import os
+
+import torch
+from torch.utils.data import DataLoader
+
+from pathvecs.pytorch.dataset import WordContextDataset, collate_batch
+from pathvecs.pytorch.streaming import StreamingWordContextDataset
+from pathvecs.pytorch.model import SkipGramModel, sgns_sgd_step, top_sims
+from pathvecs.pytorch.hogwild import train_hogwild
+from pathvecs.vocab import load_vocab
+
+
+class Trainer:
+    """ Trains a SkipGramModel on batches of (w_pos, c_pos, c_neg)
+
+    Loss and throughput are accumulated without synchronizing on every step
+    and logged every log_every steps. Sample neighbors are computed on a
+    snapshot of the word embeddings in a background thread, so that training
+    carries on while they are found.
+
+    The step is one of:
+        'autograd': SparseAdam on the mean batch loss
+        'fused': Hand computed SGD on the summed batch loss (sgns_sgd_step),
+            so lr is a per-pair rate as in word2vec, e.g. 0.025
+
+    Attributes:
+        model: The SkipGramModel being trained
+        optimizer: Optimizer over the model's sparse parameters, or None for
+            the fused step
+        epoch: The current epoch
+        step: The number of steps taken over all epochs
+    """
+
+    def __init__(
+        self,
+        model,
+        lr=1e-2,
+        step='autograd',
+        checkpoint_dir=None,
+        checkpoint_every=None,
+        log_every=1000,
+        neighbor_words=None,
+        num_neighbors=5,
+        log=print
+    ):
+
+        self.model = model
+        self.lr = lr
+
+        if step == 'autograd':
+            self.optimizer = torch.optim.SparseAdam(model.parameters(), lr=lr)
+            self.train_step = self.autograd_step
+
+        elif step == 'fused':
+            self.optimizer = None
+            self.train_step = self.fused_step
+
+        else:
+            raise KeyError("No training step found for key '{}'.".format(step))
+
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_every = checkpoint_every
+        self.log_every = log_every
+        self.neighbor_words = [
+            w for w in (neighbor_words or []) if w in model.w2i]
+        self.num_neighbors = num_neighbors
+        self.log = log
+
+        self.epoch = 0
+        self.step = 0
+
+        self._neighbors_executor = ThreadPoolExecutor(max_workers=1)
+        self._neighbors_future = None
+
+    def autograd_step(self, w_pos, c_pos, c_neg):
+        """ Take one gradient step on a batch
+
+        Returns:
+            loss: The detached mean batch loss, left as a tensor
+        """
+
+        self.optimizer.zero_grad()
+
+        pos_score, neg_score = self.model(w_pos, c_pos, c_neg)
+        loss = -1 * (pos_score + neg_score) / len(w_pos)
+        loss.backward()
+
+        self.optimizer.step()
+        return loss.detach()
+
+    def fused_step(self, w_pos, c_pos, c_neg):
+        """ Take one fused SGD step on a batch
+
+        Returns:
+            loss: The mean batch loss, left as a tensor
+        """
+
+        loss = sgns_sgd_step(
+            self.model.w_embeddings.weight,
+            self.model.c_embeddings.weight,
+            w_pos,
+            c_pos,
+            c_neg,
+            self.lr
+        )
+        return loss / len(w_pos)
+
+    def train(self, batches, num_epochs=1):
+        """ Train over an iterable of batches for a number of epochs
+
+        If the batches come from a DataLoader over a dataset with set_epoch,
+        e.g. StreamingWordContextDataset, it is called at every epoch.
+        """
+
+        dataset = getattr(batches, 'dataset', None)
+
+        for epoch in range(self.epoch, num_epochs):
+            self.epoch = epoch
+
+            if hasattr(dataset, 'set_epoch'):
+                dataset.set_epoch(epoch)
+
+            loss_sum = torch.zeros(())
+            num_pairs = 0
+            num_steps = 0
+            start = time.perf_counter()
+
+            for w_pos, c_pos, c_neg in batches:
+
+                # Subsampling can drop every pair of a batch
+                if not len(w_pos):
+                    continue
+
+                loss_sum += self.train_step(w_pos, c_pos, c_neg)
+                num_pairs += len(w_pos)
+                num_steps += 1
+                self.step += 1
+
+                if self.log_every and self.step % self.log_every == 0:
+                    elapsed = time.perf_counter() - start
+                    self.log_metrics(
+                        loss_sum.item() / num_steps, num_pairs / elapsed)
+                    self.log_neighbors()
+
+                    loss_sum.zero_()
+                    num_pairs = 0
+                    num_steps = 0
+                    start = time.perf_counter()
+
+                if (self.checkpoint_every
+                        and self.step % self.checkpoint_every == 0):
+                    self.save_checkpoint()
+
+            self.epoch = epoch + 1
+            self.save_checkpoint()
+
+        self.wait_for_neighbors()
+
+    def log_metrics(self, loss, pairs_per_sec):
+        self.log("epoch {} step {}  loss {:.4f}  {:,.0f} pairs/s".format(
+            self.epoch, self.step, loss, pairs_per_sec))
+
+    def log_neighbors(self):
+        """ Log sample neighbors from a snapshot of the word embeddings
+
+        Skipped if the neighbors from the last snapshot are still being found.
+        """
+
+        if not self.neighbor_words:
+            return
+
+        future = self._neighbors_future
+        if future is not None and not future.done():
+            return
+
+        snapshot = self.model.w_embeddings.weight.detach().clone()
+        self._neighbors_future = self._neighbors_executor.submit(
+            self._log_neighbors, snapshot, self.step)
+
+    def _log_neighbors(self, embeddings, step):
+
+        lines = ["neighbors at step {}".format(step)]
+        for word in self.neighbor_words:
+            neighbors = top_sims(
+                embeddings,
+                self.model.w2i,
+                self.model.i2w,
+                word,
+                k=self.num_neighbors + 1
+            )
+            lines.append("{:<25} {}".format(word, ', '.join(
+                "{} ({:.3f})".format(w, sim)
+                for w, sim in neighbors if w != word)))
+
+        self.log('\n'.join(lines))
+
+    def wait_for_neighbors(self):
+        """ Block until any background neighbor logging has finished """
+
+        if self._neighbors_future is not None:
+            self._neighbors_future.result()
+
+    def save_checkpoint(self):
+        """ Save model and optimizer state to the checkpoint directory
+
+        Written to a temporary file first, so that an interrupted save
+        never replaces the last good checkpoint.
+        """
+
+        if self.checkpoint_dir is None:
+            return
+
+        optimizer_state = None
+        if self.optimizer is not None:
+            optimizer_state = self.optimizer.state_dict()
+
+        checkpoint = {
+            'model': self.model.state_dict(),
+            'optimizer': optimizer_state,
+            'epoch': self.epoch,
+            'step': self.step
+        }
+
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        fp = Path(self.checkpoint_dir).joinpath('checkpoint.pth')
+        tmp_fp = fp.with_suffix('.tmp')
+        torch.save(checkpoint, tmp_fp)
+        os.replace(tmp_fp, fp)
+
+    def load_checkpoint(self, fp):
+        """ Resume from a checkpoint
+
+        Training restarts from the beginning of the epoch that was in
+        progress when the checkpoint was saved.
+        """
+
+        checkpoint = torch.load(fp)
+        self.model.load_state_dict(checkpoint['model'])
+        if self.optimizer is not None and checkpoint['optimizer'] is not None:
+            self.optimizer.load_state_dict(checkpoint['optimizer'])
+        self.epoch = checkpoint['epoch']
+        self.step = checkpoint['step']
+
+
+def get_dataloader(args):
+    """ Build a dataloader over the pairs files given on the command line """
+
+    if args.streaming:
+        dataset = StreamingWordContextDataset(
+            args.pairs,
+            batch_size=args.batch_size,
+            negative_samples=args.negative_samples,
+            subsample=args.subsample
+        )
+        return DataLoader(
+            dataset,
+            batch_size=None,
+            num_workers=args.num_workers
+        )
+
+    dataset = WordContextDataset(
+        args.pairs[0],
+        negative_samples=args.negative_samples,
+        sampler='cdf',
+        subsample=args.subsample
+    ).share_memory()
+
+    return DataLoader(
+        dataset,
+        batch_size=args.batch_size,
+        shuffle=True,
+        collate_fn=collate_batch,
+        num_workers=args.num_workers
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train path2vec skip gram embeddings on word-context pairs.")
+    parser.add_argument('--pairs', nargs='+', required=True,
+        help="pairs file(s), more than one requires --streaming")
+    parser.add_argument('--vocab', required=True,
+        help="folder with wvocab.txt and cvocab.txt")
+    parser.add_argument('--output', required=True,
+        help="folder for checkpoints and the final model.pth")
+    parser.add_argument('--streaming', action='store_true',
+        help="stream block-shuffled pairs rather than memory mapping them")
+    parser.add_argument('--emb-dim', type=int, default=128)
+    parser.add_argument('--batch-size', type=int, default=2048)
+    parser.add_argument('--negative-samples', type=int, default=10)
+    parser.add_argument('--subsample', type=float, default=None,
+        help="subsampling threshold for frequent words and contexts, e.g. 1e-5")
+    parser.add_argument('--epochs', type=int, default=1)
+    parser.add_argument('--lr', type=float, default=None,
+        help="learning rate, defaults to 1e-2 (SparseAdam) or 0.025 (SGD)")
+    parser.add_argument('--step', choices=['autograd', 'fused'],
+        default='autograd', help="training step implementation")
+    parser.add_argument('--hogwild', type=int, default=None, metavar='N',
+        help="train lock-free with sparse SGD over N processes")
+    parser.add_argument('--num-threads', type=int, default=None,
+        help="torch intra-op threads, defaults to torch's own choice")
+    parser.add_argument('--num-workers', type=int, default=2)
+    parser.add_argument('--log-every', type=int, default=1000)
+    parser.add_argument('--checkpoint-every', type=int, default=10000)
+    parser.add_argument('--neighbors', nargs='*', default=[],
+        help="words to log nearest neighbors for")
+    parser.add_argument('--resume', action='store_true',
+        help="resume from the checkpoint in the output folder")
+    args = parser.parse_args()
+
+    if len(args.pairs) > 1 and not args.streaming:
+        parser.error("multiple pairs files require --streaming")
+
+    if args.hogwild and (args.streaming or len(args.pairs) > 1):
+        parser.error("--hogwild trains on a single pairs file")
+
+    if args.hogwild and args.subsample is not None:
+        parser.error("--hogwild trains on pairs as they are, subsample them "
+            "with pathvecs.pairs.subsample_pairs instead")
+
+    # Hogwild workers only log throughput and save the final model
+    hogwild_ignored = [
+        '--step', '--log-every', '--checkpoint-every', '--neighbors', '--resume',
+        '--num-workers']
+    for flag in hogwild_ignored:
+        dest = flag[2:].replace('-', '_')
+        if args.hogwild and getattr(args, dest) != parser.get_default(dest):
+            parser.error("{} is not supported with --hogwild".format(flag))
+
+    if args.num_threads is not None:
+        torch.set_num_threads(args.num_threads)
+
+    wvocab = load_vocab(Path(args.vocab).joinpath('wvocab.txt'))
+    cvocab = load_vocab(Path(args.vocab).joinpath('cvocab.txt'))
+
+    model = SkipGramModel(wvocab=wvocab, cvocab=cvocab, emb_dim=args.emb_dim)
+
+    if args.hogwild:
+        train_hogwild(
+            model,
+            args.pairs[0],
+            num_processes=args.hogwild,
+            batch_size=args.batch_size,
+            negative_samples=args.negative_samples,
+            num_epochs=args.epochs,
+            lr=args.lr or 0.025
+        )
+
+        os.makedirs(args.output, exist_ok=True)
+        torch.save(model.state_dict(), Path(args.output).joinpath('model.pth'))
+        return
+
+    default_lr = 1e-2 if args.step == 'autograd' else 0.025
+    trainer = Trainer(
+        model,
+        lr=args.lr or default_lr,
+        step=args.step,
+        checkpoint_dir=args.output,
+        checkpoint_every=args.checkpoint_every,
+        log_every=args.log_every,
+        neighbor_words=args.neighbors
+    )
+
+    checkpoint_fp = Path(args.output).joinpath('checkpoint.pth')
+    if args.resume and checkpoint_fp.exists():
+        trainer.load_checkpoint(checkpoint_fp)
+
+    trainer.train(get_dataloader(args), num_epochs=args.epochs)
+
+    # Saved as a plain state_dict, as loaded in inspect_neighbors
+    torch.save(model.state_dict(), Path(args.output).joinpath('model.pth'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+""" A Count-Min sketch for finding frequent keys in bounded memory.
+
+Keys are hashed to 64 bits with pandas' hash_array, which is stable across
+processes, so sketches and hashes can be built in worker processes. Each of
+the sketch's `depth` rows maps a hash to one of `width` counters, and the
+estimate of a key's count is the minimum of its counters. Estimates never
+fall below the true count, and overshoot it by at most e * total / width
+with probability 1 - exp(-depth).
+
+The width needed therefore grows with the total count. With sketch_width,
+it is sized so that the overshoot stays below a fraction of min_count,
+which keeps the number of rare keys estimated to reach min_count, and so
+the candidates counted exactly, bounded however large the corpus.
+
+Typical usage example:
+
+    sketch = CountMinSketch(width=sketch_width(total, min_count=100), depth=4)
+    for counts in shard_counts:
+        sketch.add(hash_keys(counts.index), counts.values)
+
+    # Keys which may have been seen at least 100 times
+    candidates = counts[sketch.query(hash_keys(counts.index)) >= 100]
+"""
+import numpy as np
+import pandas as pd
+
+
+def hash_keys(keys):
+    """ Hash an array of keys to uint64, consistently across processes """
+    return pd.util.hash_array(np.asarray(keys, dtype=object))
+
+
+def sketch_width(total, min_count, error=0.5):
+    """ Get the width for which estimates overshoot by less than error * min_count
+
+    Each key's estimate stays within the bound with probability at least
+    1 - exp(-depth). Memory is 8 * depth * width bytes, which grows with
+    total / min_count rather than with the number of distinct keys.
+
+    Args:
+        total: Sum of all the counts the sketch will hold, or an upper bound
+        min_count: Count that candidate keys must reach
+        error: Largest overshoot, as a fraction of min_count
+
+    Returns:
+        width: Counters per sketch row
+    """
+
+    return max(int(np.ceil(np.e * total / (error * min_count))), 1)
+
+
+class CountMinSketch:
+    """ Count-Min sketch over uint64 key hashes
+
+    The counters of each row are found by double hashing, from the low and
+    high 32 bits of the key hash.
+
+    Attributes:
+        table: (depth, width) int64 array of counters
+        total: Sum of all counts added
+    """
+
+    def __init__(self, width=2**22, depth=4):
+
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def _columns(self, hashes):
+        """ Yield the column of every hash, for each row in turn """
+
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        low = hashes & np.uint64(0xffffffff)
+        high = hashes >> np.uint64(32)
+
+        for i in range(self.depth):
+            yield ((low + np.uint64(i) * high) % np.uint64(self.width)).astype(
+                np.int64)
+
+    def add(self, hashes, counts):
+        """ Add counts for a batch of key hashes, repeats allowed """
+
+        counts = np.asarray(counts, dtype=np.float64)
+        for row, columns in zip(self.table, self._columns(hashes)):
+            row += np.rint(np.bincount(
+                columns, weights=counts, minlength=self.width)).astype(np.int64)
+
+        self.total += int(counts.sum())
+
+    def query(self, hashes):
+        """ Get the estimated counts of key hashes, never underestimates """
+
+        estimates = None
+        for row, columns in zip(self.table, self._columns(hashes)):
+            row_estimates = row[columns]
+            if estimates is None:
+                estimates = row_estimates
+            else:
+                np.minimum(estimates, row_estimates, out=estimates)
+
+        if estimates is None:
+            return np.zeros(len(hashes), dtype=np.int64)
+
+        return estimates
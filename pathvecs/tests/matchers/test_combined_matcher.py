@@ -0,0 +1,103 @@
+# pylint: disable=line-too-long
+
+import pytest
+from spacy.tokens import Doc
+
+from pathvecs.matchers import COMBINED_PIPE, MATCHER_PIPES, load_matchers_nlp, match
+
+params = [
+({
+    'words': ['Alice', ',', 'who', 'was', 'friends', 'with', 'Bob', '.'],
+    'lemmas': ['Alice', ',', 'who', 'be', 'friend', 'with', 'Bob', '.'],
+    'pos': ['PROPN', 'PUNCT', 'PRON', 'AUX', 'NOUN', 'ADP', 'PROPN', 'PUNCT'],
+    'tags': ['NNP', ',', 'WP', 'VBD', 'NNS', 'IN', 'NNP', '.'],
+    'deps': ['ROOT', 'punct', 'nsubj', 'relcl', 'attr', 'prep', 'pobj', 'punct'],
+    'heads': [0, 0, 3, 0, 3, 4, 5, 0],
+    'spaces': ['', ' ', ' ', ' ', ' ', ' ', '', ''],
+}),
+({
+    'words': ['Bob', 'ate', 'one', 'of', 'the', 'cakes', '.'],
+    'lemmas': ['Bob', 'eat', 'one', 'of', 'the', 'cake', '.'],
+    'pos': ['PROPN', 'VERB', 'NUM', 'ADP', 'DET', 'NOUN', 'PUNCT'],
+    'tags': ['NNP', 'VBD', 'CD', 'IN', 'DT', 'NNS', '.'],
+    'deps': ['nsubj', 'ROOT', 'dobj', 'prep', 'det', 'pobj', 'punct'],
+    'heads': [1, 1, 1, 2, 5, 3, 1],
+    'spaces': [' ', ' ', ' ', ' ', ' ', '', ''],
+}),
+({
+    'words': ['Alice', 'took', 'a', 'cup', 'of', 'sugar', '.'],
+    'lemmas': ['Alice', 'take', 'a', 'cup', 'of', 'sugar', '.'],
+    'pos': ['PROPN', 'VERB', 'DET', 'NOUN', 'ADP', 'NOUN', 'PUNCT'],
+    'tags': ['NNP', 'VBD', 'DT', 'NN', 'IN', 'NN', '.'],
+    'deps': ['nsubj', 'ROOT', 'det', 'dobj', 'prep', 'pobj', 'punct'],
+    'heads': [1, 1, 3, 1, 3, 4, 1],
+    'spaces': [' ', ' ', ' ', ' ', ' ', '', ''],
+}),
+({
+    'words': ['Bob', 'claimed', 'in', 'his', 'December', '2002', 'interview', '.'],
+    'lemmas': ['Bob', 'claim', 'in', 'his', 'December', '2002', 'interview', '.'],
+    'pos': ['PROPN', 'VERB', 'ADP', 'PRON', 'PROPN', 'NUM', 'NOUN', 'PUNCT'],
+    'tags': ['NNP', 'VBD', 'IN', 'PRP$', 'NNP', 'CD', 'NN', '.'],
+    'deps': ['nsubj', 'ROOT', 'prep', 'poss', 'nmod', 'nummod', 'pobj', 'punct'],
+    'heads': [1, 1, 1, 6, 6, 4, 2, 1],
+    'spaces': [' ', ' ', ' ', ' ', ' ', ' ', '', ''],
+}),
+({
+    'words': ['Bob', 'was', 'born', 'on', 'June', '16', ',', '2022', '.'],
+    'lemmas': ['Bob', 'be', 'bear', 'on', 'June', '16', ',', '2022', '.'],
+    'pos': ['PROPN', 'AUX', 'VERB', 'ADP', 'PROPN', 'NUM', 'PUNCT', 'NUM', 'PUNCT'],
+    'tags': ['NNP', 'VBD', 'VBN', 'IN', 'NNP', 'CD', ',', 'CD', '.'],
+    'deps': ['nsubjpass', 'auxpass', 'ROOT', 'prep', 'pobj', 'nummod', 'punct', 'nummod', 'punct'],
+    'heads': [2, 2, 2, 2, 3, 4, 4, 4, 2],
+    'spaces': [' ', ' ', ' ', ' ', ' ', '', ' ', '', ''],
+}),
+]
+
+
+def annotations(doc):
+    """ Everything the matchers annotate a doc with, comparable across docs """
+
+    return {
+        'triples': [(t.src.i, t.edge, t.dst.i) for t in doc._.triples],
+        'antecedents': [t._.antecedent.i if t._.antecedent is not None else None for t in doc],
+        'quantifieds': [[q.i for q in t._.quantifieds] for t in doc],
+        'dates': [t._.matchers_is_date for t in doc],
+        'nominals': [(s.start, s.end) for s in doc.spans['nominals']],
+        'modifiers': [(s.start, s.end) for s in doc.spans['modifiers']],
+    }
+
+
+@pytest.mark.parametrize('params', params)
+def test_combined_matches_chained(params):
+    """ The combined component should annotate docs as the chained ones do """
+
+    chained = load_matchers_nlp(pipes=MATCHER_PIPES)
+    combined = load_matchers_nlp(pipes=[COMBINED_PIPE])
+
+    chained_doc = match(Doc(chained.vocab, **params), chained)
+    combined_doc = match(Doc(combined.vocab, **params), combined)
+
+    assert annotations(combined_doc) == annotations(chained_doc)
+
+
+def test_combined_date_nominals():
+    """ Dates should be tagged before the span patterns that match them """
+
+    nlp = load_matchers_nlp(pipes=[COMBINED_PIPE])
+    doc = match(Doc(nlp.vocab, **params[4]), nlp)
+
+    assert (4, 8) in [(s.start, s.end) for s in doc.spans['nominals']]
+
+
+def test_combined_families():
+    """ Only the selected families should be matched """
+
+    nlp = load_matchers_nlp(
+        pipes=[COMBINED_PIPE], triple_patterns=['prep'], families=['triples'])
+    doc = match(Doc(nlp.vocab, **params[2]), nlp)
+
+    assert [(t.src.i, t.edge, t.dst.i) for t in doc._.triples] == [(3, 'prep_of', 5)]
+    assert 'nominals' not in doc.spans
+
+    with pytest.raises(KeyError):
+        load_matchers_nlp(pipes=[COMBINED_PIPE], families=['verbs'])
@@ -0,0 +1,95 @@
+import gc
+import weakref
+
+import pytest
+import spacy
+from spacy.language import Language
+
+from pathvecs.matchers import (
+    NominalSpanMatcher,
+    PathvecsMatchers,
+    RelativePronounMatcher,
+    TripleMatcher,
+    load_matchers_nlp
+)
+from pathvecs.matchers.registry import cached_matcher, clear_matchers
+
+
+@pytest.fixture
+def nlp(en_vocab):
+    return Language(en_vocab)
+
+
+def test_matchers_shared_per_vocab(nlp):
+    assert TripleMatcher(nlp).matcher is TripleMatcher(nlp).matcher
+    assert RelativePronounMatcher(nlp).matcher is RelativePronounMatcher(nlp).matcher
+    assert NominalSpanMatcher(nlp).matcher is NominalSpanMatcher(nlp).matcher
+
+    combined = PathvecsMatchers(nlp)
+    assert combined.dependency_matcher is PathvecsMatchers(nlp).dependency_matcher
+    assert combined.span_matcher is PathvecsMatchers(nlp).span_matcher
+
+
+def test_matchers_keyed_by_patterns(nlp):
+    matcher = TripleMatcher(nlp, use_patterns=['prep']).matcher
+
+    assert matcher is TripleMatcher(nlp, use_patterns=['prep']).matcher
+    assert matcher is not TripleMatcher(nlp).matcher
+    assert len(matcher) == 1
+
+    families = PathvecsMatchers(nlp, families=['triples'])
+    assert families.dependency_matcher is not PathvecsMatchers(nlp).dependency_matcher
+
+
+def test_matchers_not_shared_across_vocabs(nlp):
+    other = spacy.blank('en')
+
+    assert TripleMatcher(nlp).matcher is not TripleMatcher(other).matcher
+    assert TripleMatcher(other).matcher.vocab is other.vocab
+
+
+def test_clear_matchers(nlp):
+    matcher = TripleMatcher(nlp).matcher
+    clear_matchers(nlp.vocab)
+
+    assert TripleMatcher(nlp).matcher is not matcher
+
+
+def test_cached_matcher_builds_once(en_vocab):
+    built = []
+
+    def build():
+        built.append(True)
+        return object()
+
+    clear_matchers(en_vocab)
+    assert cached_matcher(en_vocab, 'key', build) is cached_matcher(en_vocab, 'key', build)
+    assert len(built) == 1
+
+
+def test_unvalidated_same_patterns():
+    validated = load_matchers_nlp(validate=True)
+    unvalidated = load_matchers_nlp(validate=False)
+
+    for name, component in validated.pipeline:
+        other = unvalidated.get_pipe(name)
+        assert len(component.matcher) == len(other.matcher)
+
+
+def test_matchers_held_by_vocab():
+    vocab = spacy.blank('en').vocab
+    vocab_ref = weakref.ref(vocab)
+    TripleMatcher(Language(vocab))
+
+    del vocab
+    gc.collect()
+
+    assert vocab_ref() is None
+
+
+def test_matchers_keyed_by_validate(nlp):
+    unvalidated = TripleMatcher(nlp, validate=False).matcher
+
+    assert TripleMatcher(nlp, validate=True).matcher is not unvalidated
+    assert PathvecsMatchers(nlp, validate=True).span_matcher is not \
+        PathvecsMatchers(nlp, validate=False).span_matcher
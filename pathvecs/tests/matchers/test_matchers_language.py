@@ -0,0 +1,40 @@
+import pytest
+from spacy.tokens import Doc, DocBin
+
+from pathvecs.matchers import MATCHER_PIPES, load_matchers_nlp, match
+
+
+def test_load_matchers_nlp():
+    """ Every matcher pipe should be added, in order, to a blank pipeline """
+
+    nlp = load_matchers_nlp()
+    assert nlp.pipe_names == MATCHER_PIPES
+    assert not nlp.vocab.vectors.shape[0]
+
+    nlp = load_matchers_nlp(pipes=['triple_matcher'], triple_patterns=['prep'])
+    assert nlp.pipe_names == ['triple_matcher']
+
+    with pytest.raises(KeyError):
+        load_matchers_nlp(pipes=['parser'])
+
+
+def test_match_docbin_docs(en_vocab):
+    """ Docs read with the blank pipeline's vocab should be matched """
+
+    doc = Doc(
+        en_vocab,
+        words=['A', 'cup', 'of', 'sugar', '.'],
+        lemmas=['a', 'cup', 'of', 'sugar', '.'],
+        pos=['DET', 'NOUN', 'ADP', 'NOUN', 'PUNCT'],
+        tags=['DT', 'NN', 'IN', 'NN', '.'],
+        deps=['det', 'ROOT', 'prep', 'pobj', 'punct'],
+        heads=[1, 1, 1, 2, 1],
+        spaces=[' ', ' ', ' ', '', '']
+    )
+    doc_bin = DocBin(docs=[doc])
+
+    nlp = load_matchers_nlp(pipes=['triple_matcher'], triple_patterns=['prep'])
+    doc_bin = DocBin().from_bytes(doc_bin.to_bytes())
+    docs = [match(doc, nlp) for doc in doc_bin.get_docs(nlp.vocab)]
+
+    assert [(t.src.i, t.edge, t.dst.i) for t in docs[0]._.triples] == [(1, 'prep_of', 3)]
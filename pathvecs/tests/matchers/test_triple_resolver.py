@@ -0,0 +1,92 @@
+# pylint: disable=line-too-long
+
+import pytest
+from spacy.tokens import Doc
+from spacy.language import Language
+
+from pathvecs.matchers import (
+    QuantifiedObjectMatcher,
+    RelativePronounMatcher,
+    TripleMatcher,
+    TripleResolver
+)
+from pathvecs.matchers.triples.patterns import Triple
+
+params = [
+({
+    'description': "Relative pronouns should be swapped for their antecedents.",
+    'words': ['Alice', ',', 'who', 'was', 'friends', 'with', 'Bob', '.'],
+    'antecedents': [(2, 0)],
+    'quantifieds': [],
+    'triples': [(2, 'be_friend_with', 6)],
+    'gold_triples': [(0, 'be_friend_with', 6)],
+}),
+({
+    'description': "Quantifiers should be swapped for their quantified objects.",
+    'words': ['Bob', 'ate', 'one', 'of', 'the', 'cakes', '.'],
+    'antecedents': [],
+    'quantifieds': [(2, [5])],
+    'triples': [(0, 'eat', 2)],
+    'gold_triples': [(0, 'eat', 5)],
+}),
+({
+    'description': "Quantifiers of several objects should give a triple for each.",
+    'words': ['Bob', 'ate', 'some', 'of', 'the', 'cakes', 'and', 'pies', '.'],
+    'antecedents': [],
+    'quantifieds': [(2, [5, 7])],
+    'triples': [(0, 'eat', 2)],
+    'gold_triples': [(0, 'eat', 5), (0, 'eat', 7)],
+}),
+({
+    'description': "Antecedents should be resolved before quantifiers.",
+    'words': ['Some', 'of', 'the', 'cakes', ',', 'which', 'Bob', 'ate', '.'],
+    'antecedents': [(5, 0)],
+    'quantifieds': [(0, [3])],
+    'triples': [(6, 'eat', 5)],
+    'gold_triples': [(6, 'eat', 3)],
+}),
+({
+    'description': "Self loops and duplicates should be dropped once resolved.",
+    'words': ['Alice', ',', 'who', 'liked', 'Alice', 'and', 'Bob', '.'],
+    'antecedents': [(2, 0)],
+    'quantifieds': [],
+    'triples': [(2, 'like', 0), (2, 'like', 6), (0, 'like', 6)],
+    'gold_triples': [(0, 'like', 6)],
+}),
+]
+
+
+@pytest.fixture
+def resolver(en_vocab):
+    nlp = Language(en_vocab)
+
+    # Registers the extensions the resolver reads
+    RelativePronounMatcher(nlp)
+    QuantifiedObjectMatcher(nlp)
+    TripleMatcher(nlp, use_patterns=[])
+
+    return TripleResolver(nlp)
+
+
+@pytest.mark.parametrize('params', params)
+def test_triple_resolver(params, resolver, en_vocab):
+    """ Test that matched triples are resolved to the right tokens """
+
+    description = params['description']
+    doc = Doc(en_vocab, words=params['words'])
+
+    for pronoun, antecedent in params['antecedents']:
+        doc[pronoun]._.antecedent = doc[antecedent]
+
+    for quantifier, objects in params['quantifieds']:
+        doc[quantifier]._.quantifieds = [doc[i] for i in objects]
+
+    doc._.triples = [Triple(doc[src], edge, doc[dst]) for src, edge, dst in params['triples']]
+
+    doc = resolver(doc)
+
+    resolved = [(t.src.i, t.edge, t.dst.i) for t in doc._.resolved_triples]
+    assert resolved == params['gold_triples'], description
+
+    # The matched triples are left as they were
+    assert [(t.src.i, t.edge, t.dst.i) for t in doc._.triples] == params['triples']
@@ -1,10 +1,12 @@
 # pylint: disable=line-too-long
 
 import pytest
+import spacy
 from spacy.tokens import Doc
 from spacy.language import Language
 
-from pathvecs.matchers import TripleMatcher
+from pathvecs.matchers import TripleMatcher, iter_triples, triple_indices
+from pathvecs.matchers.triples.patterns import expand_conjunct_matches
 
 params = [
 
@@ -349,6 +351,7 @@ def assert_count_matches_gold(gold_triples, doc, desc):
 def test_triple_matcher(params, en_vocab):
     """ Test that the triple matcher gets the correct triples for each doc """
 
+    params = dict(params)
     use_patterns = params.pop('use_patterns', None)
     description = params.pop('description')
     gold_triples = params.pop('gold_triples')
@@ -366,3 +369,97 @@ def test_triple_matcher(params, en_vocab):
 
     for triple in doc._.triples:
         assert_triple_matches_gold(triple, gold_triples, doc, description)
+
+
+@pytest.mark.parametrize("params", params)
+def test_compact_triple_matcher(params, en_vocab):
+    """ Test that compact triples are the same as the list of triples """
+
+    params = dict(params)
+    use_patterns = params.pop('use_patterns', None)
+    params.pop('description')
+    params.pop('gold_triples')
+
+    nlp = Language(en_vocab)
+    listed = TripleMatcher(nlp, use_patterns=use_patterns)(Doc(en_vocab, **params))
+    compact = TripleMatcher(nlp, use_patterns=use_patterns, compact=True)(Doc(en_vocab, **params))
+
+    assert compact._.triples == []
+    assert len(compact._.triple_arrays) == len(listed._.triples)
+
+    as_indices = lambda doc: [(t.src.i, t.edge, t.dst.i) for t in iter_triples(doc)]
+    assert as_indices(compact) == as_indices(listed)
+
+    for listed_array, compact_array in zip(triple_indices(listed), triple_indices(compact)):
+        assert listed_array.tolist() == compact_array.tolist()
+
+
+@pytest.mark.parametrize("max_conjuncts,max_triples,num_kept", [
+    (None, None, 12),
+    (1, None, 4),
+    (None, 5, 5),
+    (0, 5, 1),
+])
+def test_expand_conjunct_matches(max_conjuncts, max_triples, num_kept):
+    """ Test that conjunct expansion is lazy, limited and counts what it skips """
+
+    conjunct_matches = [[0, 1, 2], [3], [4, 5, 6, 7]]
+    conj_matches, num_pruned = expand_conjunct_matches(
+        conjunct_matches, max_conjuncts, max_triples)
+
+    assert not isinstance(conj_matches, list)
+
+    conj_matches = list(conj_matches)
+    assert len(conj_matches) == num_kept
+    assert num_pruned == 12 - num_kept
+    assert conj_matches[0] == (0, 3, 4)
+
+
+def test_triple_matcher_conjunct_limits(en_vocab):
+    """ Test that the conjunct limits prune triples and count them per doc """
+
+    params = {
+        'words': ['Australia', 'is', 'a', 'country', 'and', 'a', 'continent', '.'],
+        'lemmas': ['Australia', 'be', 'a', 'country', 'and', 'a', 'continent', '.'],
+        'pos': ['PROPN', 'AUX', 'DET', 'NOUN', 'CCONJ', 'DET', 'NOUN', 'PUNCT'],
+        'tags': ['NNP', 'VBZ', 'DT', 'NN', 'CC', 'DT', 'NN', '.'],
+        'deps': ['nsubj', 'ROOT', 'det', 'attr', 'cc', 'det', 'conj', 'punct'],
+        'heads': [1, 1, 3, 1, 3, 6, 3, 1],
+        'spaces': [' ', ' ', ' ', ' ', ' ', ' ', '', ''],
+    }
+
+    nlp = Language(en_vocab)
+
+    for compact in [False, True]:
+        unlimited = TripleMatcher(nlp, use_patterns=['being_verb'], compact=compact)
+        limited = TripleMatcher(
+            nlp, use_patterns=['being_verb'], compact=compact, max_conjuncts=0)
+
+        doc = unlimited(Doc(en_vocab, **params))
+        assert [(t.src.i, t.dst.i) for t in iter_triples(doc)] == [(0, 3), (0, 6)]
+        assert doc._.pruned_triples == 0
+
+        doc = limited(Doc(en_vocab, **params))
+        assert [(t.src.i, t.dst.i) for t in iter_triples(doc)] == [(0, 3)]
+        assert doc._.pruned_triples == 1
+
+
+def test_compact_triples_across_vocabs():
+    """ Test that edge names are added to the store of each doc's vocab """
+
+    params = {
+        'words': ['California', 'is', 'a', 'state', '.'],
+        'lemmas': ['California', 'be', 'a', 'state', '.'],
+        'pos': ['PROPN', 'AUX', 'DET', 'NOUN', 'PUNCT'],
+        'tags': ['NNP', 'VBZ', 'DT', 'NN', '.'],
+        'deps': ['nsubj', 'ROOT', 'det', 'attr', 'punct'],
+        'heads': [1, 1, 3, 1, 1],
+        'spaces': [' ', ' ', ' ', '', ''],
+    }
+
+    for _ in range(2):
+        nlp = spacy.blank('en')
+        matcher = TripleMatcher(nlp, use_patterns=['being_verb'], compact=True)
+        doc = matcher(Doc(nlp.vocab, **params))
+
+        assert [(t.src.i, t.edge, t.dst.i) for t in iter_triples(doc)] == [(0, 'be', 3)]
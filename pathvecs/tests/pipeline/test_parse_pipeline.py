@@ -0,0 +1,95 @@
+import json
+
+import pytest
+import spacy
+
+from pathvecs.parses import read_docs
+from pathvecs.pipeline.parse import load_manifest, parse_corpus, read_corpus
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """ A WikiExtractor corpus of five articles, in plain and json files """
+
+    folder = tmp_path / 'corpus'
+    (folder / 'AA').mkdir(parents=True)
+
+    (folder / 'AA' / 'wiki_00').write_text(
+        '<doc id="1" url="https://en.wikipedia.org/wiki?curid=1" title="Alice">\n'
+        'Alice\n'
+        '\n'
+        'Alice is the queen of Antarctica.\n'
+        '</doc>\n'
+        '<doc id="2" url="https://en.wikipedia.org/wiki?curid=2" title="Empty">\n'
+        'Empty\n'
+        '</doc>\n'
+        '<doc id="3" url="https://en.wikipedia.org/wiki?curid=3" title="Bob">\n'
+        'Bob\n'
+        '\n'
+        'Bob took a cup of sugar.\n'
+        '</doc>\n'
+    )
+
+    (folder / 'AA' / 'wiki_01').write_text('\n'.join(
+        json.dumps({'id': str(i), 'url': '', 'title': '', 'text': 'Text number {}.'.format(i)})
+        for i in range(4, 7)
+    ) + '\n')
+
+    return folder
+
+
+def test_read_corpus(corpus):
+    """ Articles should be read in order, without titles or empty texts """
+
+    assert list(read_corpus(corpus)) == [
+        ('1', 'Alice is the queen of Antarctica.'),
+        ('3', 'Bob took a cup of sugar.'),
+        ('4', 'Text number 4.'),
+        ('5', 'Text number 5.'),
+        ('6', 'Text number 6.'),
+    ]
+
+
+def test_parse_corpus_resumes(corpus, tmp_path):
+    """ A stopped run should carry on from the next unparsed text """
+
+    output = tmp_path / 'parses'
+    kwargs = {'model': 'blank:en', 'docs_per_file': 2, 'log': lambda _: None}
+
+    parse_corpus(corpus, output, max_files=1, **kwargs)
+    assert load_manifest(output)['num_docs'] == 2
+    assert sorted(fp.name for fp in output.glob('*.spacy')) == ['000000.spacy']
+
+    parse_corpus(corpus, output, **kwargs)
+    manifest = load_manifest(output)
+    assert manifest['num_files'] == 3
+    assert manifest['num_docs'] == 5
+    assert manifest['last_doc_id'] == '6'
+
+    vocab = spacy.blank('en').vocab
+    texts = [
+        doc.text
+        for fp in sorted(output.glob('*.spacy'))
+        for doc in read_docs(fp, vocab)
+    ]
+    assert texts == [text for _doc_id, text in read_corpus(corpus)]
+
+    # Nothing left to parse
+    parse_corpus(corpus, output, **kwargs)
+    assert load_manifest(output) == manifest
+
+
+def test_parse_corpus_checks_order(corpus, tmp_path):
+    """ Resuming over a corpus that changed should fail """
+
+    output = tmp_path / 'parses'
+    kwargs = {'model': 'blank:en', 'docs_per_file': 2, 'log': lambda _: None}
+
+    parse_corpus(corpus, output, max_files=1, **kwargs)
+    (corpus / 'AA' / 'wiki_00').unlink()
+
+    with pytest.raises(ValueError):
+        parse_corpus(corpus, output, **kwargs)
+
+    with pytest.raises(ValueError):
+        parse_corpus(corpus, output, model='blank:en', docs_per_file=3)
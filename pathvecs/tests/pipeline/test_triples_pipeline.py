@@ -0,0 +1,185 @@
+import os
+
+import pytest
+from spacy.tokens import Doc, DocBin
+
+from pathvecs.matchers import load_matchers_nlp, match
+from pathvecs.pipeline.parse import save_manifest
+from pathvecs.pipeline.triples import (
+    dependency_hash_triples,
+    dependency_triples,
+    doc_triples,
+    docs_to_triples,
+    extract_triples,
+    manifest_num_docs,
+    matcher_triples,
+    triples_path
+)
+from pathvecs.triples import read_triples
+
+
+doc_data = {
+    'words': ['Alice', 'took', 'a', 'cup', 'of', 'sugar', '.'],
+    'lemmas': ['Alice', 'take', 'a', 'cup', 'of', 'sugar', '.'],
+    'pos': ['PROPN', 'VERB', 'DET', 'NOUN', 'ADP', 'NOUN', 'PUNCT'],
+    'tags': ['NNP', 'VBD', 'DT', 'NN', 'IN', 'NN', '.'],
+    'deps': ['nsubj', 'ROOT', 'det', 'dobj', 'prep', 'pobj', 'punct'],
+    'heads': [1, 1, 3, 1, 3, 4, 1],
+    'spaces': [' ', ' ', ' ', ' ', ' ', '', ''],
+}
+
+gold_triples = {
+    ('take', 'nsubj', 'alice'),
+    ('take', 'dobj', 'cup'),
+    ('cup', 'prep_of', 'sugar'),
+}
+
+
+relative_pronoun_doc_data = {
+    'words': ['Alice', ',', 'who', 'wrote', 'the', 'Book', ',', 'and', 'Bob', ',', 'who', 'published', 'it', '.'],
+    'lemmas': ['Alice', ',', 'who', 'write', 'the', 'Book', ',', 'and', 'Bob', ',', 'who', 'publish', 'it', '.'],
+    'pos': ['PROPN', 'PUNCT', 'PRON', 'VERB', 'DET', 'NOUN', 'PUNCT', 'CCONJ', 'PROPN', 'PUNCT', 'PRON', 'VERB', 'PRON', 'PUNCT'],
+    'tags': ['NNP', ',', 'WP', 'VBD', 'DT', 'NN', ',', 'CC', 'NNP', ',', 'WP', 'VBD', 'PRP', '.'],
+    'deps': ['ROOT', 'punct', 'nsubj', 'relcl', 'det', 'dobj', 'punct', 'cc', 'conj', 'punct', 'nsubj', 'relcl', 'dobj', 'punct'],
+    'heads': [0, 0, 3, 0, 5, 3, 0, 0, 0, 8, 11, 8, 11, 0],
+    'spaces': ['', ' ', ' ', ' ', ' ', '', ' ', ' ', '', ' ', ' ', ' ', '', ''],
+}
+
+
+@pytest.fixture
+def parses(en_vocab, tmp_path):
+    """ Two parse files of two docs each, one in a nested folder """
+
+    folder = tmp_path / 'parses'
+    for fp in [folder / '0000.spacy', folder / 'batch' / '0001.spacy']:
+        doc_bin = DocBin()
+        for _ in range(2):
+            doc_bin.add(Doc(en_vocab, **doc_data))
+
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        doc_bin.to_disk(fp)
+
+    return folder
+
+
+def test_extract_triples(parses, tmp_path):
+    """ Every parse file should get a triples file of its docs' triples """
+
+    output = tmp_path / 'triples'
+    extract_triples(parses, output, triple_patterns=['prep'], num_processes=1)
+
+    assert sorted(fp.name for fp in output.iterdir()) == ['0000.npz', 'batch__0001.npz']
+
+    for fp in output.iterdir():
+        triples = read_triples(fp).astype(str)
+        assert len(triples) == 2 * len(gold_triples)
+        assert set(triples.itertuples(index=False, name=None)) == gold_triples
+
+
+def test_extract_triples_resumes(parses, tmp_path):
+    """ Valid triples files should be kept, and broken ones redone """
+
+    output = tmp_path / 'triples'
+    extract_triples(parses, output, triple_patterns=['prep'], num_processes=1)
+
+    done_fp = triples_path(parses / '0000.spacy', parses, output)
+    broken_fp = triples_path(parses / 'batch' / '0001.spacy', parses, output)
+    done_mtime = os.path.getmtime(done_fp)
+    broken_fp.write_bytes(b'not a triples file')
+
+    logs = []
+    extract_triples(
+        parses, output, triple_patterns=['prep'], num_processes=1, log=logs.append)
+
+    assert logs[0] == "1 of 2 parse files to process"
+    assert os.path.getmtime(done_fp) == done_mtime
+    assert len(read_triples(broken_fp)) == 2 * len(gold_triples)
+
+
+@pytest.mark.parametrize('data', [doc_data, relative_pronoun_doc_data])
+def test_dependency_hash_triples(data, en_vocab):
+    """ The array fast path should give the same triples as the Token loop """
+
+    nlp = load_matchers_nlp(pipes=['map_relative_pronouns', 'triple_matcher'])
+    doc = match(Doc(en_vocab, **data), nlp)
+
+    hashes = dependency_hash_triples(doc)
+    triples = [
+        (en_vocab.strings[src].lower(), en_vocab.strings[dep], en_vocab.strings[dst].lower())
+        for src, dep, dst in hashes.tolist()
+    ]
+
+    assert triples == dependency_triples(doc)
+
+
+@pytest.mark.parametrize('data', [doc_data, relative_pronoun_doc_data])
+def test_compact_matcher_triples(data, en_vocab):
+    """ Compactly matched triples should give the same string triples """
+
+    pipes = ['map_relative_pronouns', 'triple_matcher']
+    listed = match(Doc(en_vocab, **data), load_matchers_nlp(pipes=pipes))
+    compact = match(Doc(en_vocab, **data), load_matchers_nlp(pipes=pipes, compact=True))
+
+    assert compact._.triple_arrays is not None
+    assert matcher_triples(compact) == matcher_triples(listed)
+
+
+def test_docs_to_triples(en_vocab):
+    """ Docs' triples should be interned in order, doc by doc """
+
+    nlp = load_matchers_nlp(
+        pipes=['map_relative_pronouns', 'triple_matcher'], triple_patterns=['prep'])
+    make_docs = lambda: [Doc(en_vocab, **data) for data in [doc_data, relative_pronoun_doc_data]]
+
+    strings, codes, num_docs, num_pruned = docs_to_triples(make_docs(), nlp)
+
+    expected = [triple for doc in make_docs() for triple in doc_triples(match(doc, nlp))]
+    assert num_docs == 2
+    assert num_pruned == 0
+    assert [tuple(triple) for triple in strings.values[codes].tolist()] == expected
+
+
+def test_extract_triples_by_doc_range(parses, tmp_path):
+    """ Parse files split by doc range should give one shard per range """
+
+    output = tmp_path / 'triples'
+    extract_triples(
+        parses, output, triple_patterns=['prep'], num_processes=2, docs_per_task=1)
+
+    assert sorted(fp.name for fp in output.iterdir()) == [
+        '0000.docs_0_1.npz',
+        '0000.docs_1_2.npz',
+        'batch__0001.docs_0_1.npz',
+        'batch__0001.docs_1_2.npz'
+    ]
+
+    for fp in output.iterdir():
+        triples = read_triples(fp).astype(str)
+        assert set(triples.itertuples(index=False, name=None)) == gold_triples
+
+
+def test_extract_triples_resumes_doc_ranges(parses, tmp_path):
+    """ Only the ranges without triples should be processed again """
+
+    output = tmp_path / 'triples'
+    extract_triples(
+        parses, output, triple_patterns=['prep'], num_processes=2, docs_per_task=1)
+
+    os.remove(output / '0000.docs_1_2.npz')
+    extract_triples(
+        parses, output, triple_patterns=['prep'], num_processes=2, docs_per_task=1)
+
+    assert (output / '0000.docs_1_2.npz').exists()
+    assert not (output / '.ranges').exists()
+
+
+def test_manifest_num_docs(tmp_path):
+    """ Docs should be counted from the manifest for the files it numbers """
+
+    save_manifest(tmp_path, {
+        'model': 'model', 'docs_per_file': 3, 'num_files': 2, 'num_docs': 5,
+        'last_doc_id': '5'})
+
+    fps = [tmp_path / name for name in ['000000.spacy', '000001.spacy', '000002.spacy', 'other.spacy']]
+    assert manifest_num_docs(fps) == [3, 2, None, None]
+    assert manifest_num_docs([tmp_path / 'batch' / '000000.spacy']) == [None]
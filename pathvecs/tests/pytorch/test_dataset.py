@@ -0,0 +1,188 @@
+import pickle
+import math
+
+import pytest
+import torch
+from torch.utils.data import DataLoader
+
+from pathvecs.pytorch import (
+    WordContextDataset,
+    UnigramSampler,
+    UnigramCDFSampler,
+    collate_batch
+)
+from pathvecs.pairs import write_pairs
+
+
+@pytest.fixture
+def pairs_data():
+    generator = torch.Generator().manual_seed(0)
+    words = torch.randint(0, 50, (1000,), generator=generator)
+
+    # skewed context frequencies, so that sampling is not uniform
+    contexts = torch.randint(0, 20, (1000,), generator=generator)
+    contexts = contexts % (contexts % 7 + 1)
+
+    return torch.stack([words, contexts], dim=1)
+
+
+def test_batched_negatives_match_per_item_negatives(pairs_data):
+    """ A seeded batch draw should be identical to per-item iteration """
+
+    generator = torch.Generator()
+    sampler = UnigramSampler(
+        pairs_data[:, 1],
+        num_samples=10,
+        table_size=1e4,
+        generator=generator
+    )
+
+    generator.manual_seed(42)
+    per_item = torch.stack([
+        torch.as_tensor(list(iter(sampler))) for _ in range(64)
+    ])
+
+    generator.manual_seed(42)
+    batched = sampler.sample(64)
+
+    assert batched.shape == (64, 10)
+    assert torch.equal(per_item, batched)
+
+
+def test_getitems_matches_getitem(pairs_data):
+    """ The batched path should return the same pairs as the per-item path """
+
+    dataset = WordContextDataset(pairs_data, negative_samples=10, table_size=1e4)
+    indices = [3, 1, 4, 1, 5, 9, 2, 6]
+
+    w_pos, c_pos, c_neg = dataset.__getitems__(indices)
+
+    assert torch.equal(w_pos, torch.stack([dataset[i][0] for i in indices]))
+    assert torch.equal(c_pos, torch.stack([dataset[i][1] for i in indices]))
+    assert c_neg.shape == (len(indices), 10)
+
+
+def test_dataloader_batches(pairs_data):
+    """ DataLoader batches through collate_batch should be ready to train on """
+
+    dataset = WordContextDataset(pairs_data, negative_samples=10, table_size=1e4)
+    dataloader = DataLoader(dataset, batch_size=32, collate_fn=collate_batch)
+
+    w_pos, c_pos, c_neg = next(iter(dataloader))
+
+    assert torch.equal(w_pos, pairs_data[:32, 0])
+    assert torch.equal(c_pos, pairs_data[:32, 1])
+    assert c_neg.shape == (32, 10)
+    assert set(c_neg.unique().tolist()) <= set(pairs_data[:, 1].tolist())
+
+
+def assert_matches_unigram_distribution(samples, data):
+    """ Chi-squared goodness of fit against the powered unigram distribution """
+    __tracebackhide__ = True  # pylint: disable=unused-variable
+
+    probs = torch.bincount(data).to(torch.float64).pow(0.75)
+    probs /= probs.sum()
+
+    observed = torch.bincount(samples.flatten(), minlength=len(probs))
+    assert len(observed) == len(probs), "Sampled values outside of the data"
+    assert observed[probs == 0].sum() == 0, "Sampled unobserved values"
+
+    observed = observed[probs > 0].to(torch.float64)
+    expected = probs[probs > 0] * samples.numel()
+    chi2 = ((observed - expected) ** 2 / expected).sum().item()
+
+    # Generous bound, the statistic has mean df and variance 2 * df
+    df = len(expected) - 1
+    assert chi2 < df + 6 * math.sqrt(2 * df), "chi2={:.1f}, df={}".format(chi2, df)
+
+
+@pytest.mark.parametrize("sampler_cls, kwargs", [
+    (UnigramSampler, {'table_size': 1e6}),
+    (UnigramCDFSampler, {}),
+])
+def test_sampler_distribution(sampler_cls, kwargs, pairs_data):
+    """ Both sampler backends should draw from the same distribution """
+
+    generator = torch.Generator().manual_seed(0)
+    sampler = sampler_cls(
+        pairs_data[:, 1],
+        num_samples=10,
+        generator=generator,
+        **kwargs
+    )
+
+    assert_matches_unigram_distribution(sampler.sample(20000), pairs_data[:, 1])
+
+
+def test_cdf_sampler_iteration(pairs_data):
+    """ Iterating the sampler should yield num_samples observed values """
+
+    sampler = UnigramCDFSampler(pairs_data[:, 1], num_samples=7)
+    samples = torch.as_tensor(list(iter(sampler)))
+
+    assert samples.shape == (7,)
+    assert set(samples.tolist()) <= set(pairs_data[:, 1].tolist())
+
+
+def test_dataset_sampler_selection(pairs_data):
+    """ The negative sampler backend should be selectable by key """
+
+    dataset = WordContextDataset(pairs_data, negative_samples=3, sampler='cdf')
+    assert isinstance(dataset.negative_sampler, UnigramCDFSampler)
+
+    _w_pos, _c_pos, c_neg = dataset.__getitems__([0, 1])
+    assert c_neg.shape == (2, 3)
+
+    with pytest.raises(KeyError):
+        WordContextDataset(pairs_data, sampler='alias')
+
+
+@pytest.mark.parametrize("sampler", ['table', 'cdf'])
+def test_share_memory(sampler, pairs_data):
+    """ Pairs and sampling tensors should be moved to shared memory """
+
+    dataset = WordContextDataset(
+        pairs_data.clone(),
+        sampler=sampler,
+        table_size=1e4
+    ).share_memory()
+
+    assert dataset.pairs_data.is_shared()
+    assert dataset.negative_sampler.data_source.is_shared()
+
+    if sampler == 'table':
+        assert dataset.negative_sampler.unigram_table.is_shared()
+    else:
+        assert dataset.negative_sampler.cdf.is_shared()
+
+
+def test_dataset_from_pairs_file(pairs_data, tmp_path):
+    """ A pairs file should be memory mapped and survive pickling """
+
+    fp = tmp_path / 'pairs.bin'
+    write_pairs(fp, pairs_data.numpy())
+
+    dataset = WordContextDataset(fp, negative_samples=3, sampler='cdf')
+    assert dataset.pairs_file == str(fp)
+    assert torch.equal(dataset.pairs_data.long(), pairs_data)
+
+    unpickled = pickle.loads(pickle.dumps(dataset))
+    assert torch.equal(unpickled.pairs_data, dataset.pairs_data)
+    assert len(unpickled.negative_sampler) == len(pairs_data)
+
+    w_pos, _c_pos, c_neg = unpickled.__getitems__([0, 5])
+    assert torch.equal(w_pos.long(), pairs_data[[0, 5], 0])
+    assert c_neg.shape == (2, 3)
+
+
+def test_subsampled_batches(pairs_data):
+    """ Subsampling should drop pairs from batches but never change them """
+
+    dataset = WordContextDataset(pairs_data, negative_samples=3, subsample=1e-2)
+    w_pos, c_pos, c_neg = dataset.__getitems__(list(range(len(pairs_data))))
+
+    assert 0 < len(w_pos) < len(pairs_data)
+    assert c_neg.shape == (len(w_pos), 3)
+
+    kept = set(map(tuple, torch.stack([w_pos, c_pos], dim=1).tolist()))
+    assert kept <= set(map(tuple, pairs_data.tolist()))
@@ -0,0 +1,48 @@
+import torch
+
+from pathvecs.pytorch import SkipGramModel, train_hogwild
+from pathvecs.pytorch.model import sgns_scores
+
+
+def clustered_pairs(num_pairs, generator):
+    """ Words 0-9 only take contexts 0-9, words 10-19 only contexts 10-19 """
+
+    words = torch.randint(0, 20, (num_pairs,), generator=generator)
+    contexts = (words // 10) * 10 + torch.randint(0, 10, (num_pairs,), generator=generator)
+    return torch.stack([words, contexts], dim=1)
+
+
+def test_hogwild_trains_shared_model():
+    """ Workers should update the parent's embeddings and reduce the loss """
+
+    torch.manual_seed(0)
+    generator = torch.Generator().manual_seed(0)
+
+    wvocab = {'w{}'.format(i): i for i in range(20)}
+    cvocab = {'c{}'.format(i): i for i in range(20)}
+    model = SkipGramModel(wvocab, cvocab, emb_dim=8)
+
+    pairs = clustered_pairs(20000, generator)
+    c_neg = torch.randint(0, 20, (len(pairs), 5), generator=generator)
+
+    def loss():
+        with torch.no_grad():
+            scores = sgns_scores(
+                model.w_embeddings, model.c_embeddings,
+                pairs[:, 0], pairs[:, 1], c_neg)
+        return -sum(scores).item() / len(pairs)
+
+    before = loss()
+    logs = []
+    pairs_per_sec = train_hogwild(
+        model,
+        pairs.clone(),
+        num_processes=2,
+        batch_size=32,
+        num_epochs=2,
+        log=logs.append
+    )
+
+    assert loss() < before
+    assert pairs_per_sec > 0
+    assert logs and '40,000 / 40,000' in logs[-1]
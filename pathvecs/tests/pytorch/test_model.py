@@ -0,0 +1,77 @@
+import copy
+
+import pytest
+import torch
+
+from pathvecs.pytorch import SkipGramModel
+from pathvecs.pytorch.model import sgns_gradients, sgns_scores, sgns_sgd_step
+
+
+@pytest.fixture
+def model():
+    torch.manual_seed(0)
+    wvocab = {'w{}'.format(i): i for i in range(10)}
+    cvocab = {'c{}'.format(i): i for i in range(12)}
+    model = SkipGramModel(wvocab=wvocab, cvocab=cvocab, emb_dim=6)
+    return model.double()
+
+
+@pytest.fixture
+def batch():
+    generator = torch.Generator().manual_seed(0)
+
+    # Small vocabularies, so ids repeat within and across c_pos and c_neg
+    w_pos = torch.randint(0, 10, (16,), generator=generator)
+    c_pos = torch.randint(0, 12, (16,), generator=generator)
+    c_neg = torch.randint(0, 12, (16, 4), generator=generator)
+    return w_pos, c_pos, c_neg
+
+
+def test_gradients_match_autograd(model, batch):
+    """ Hand computed gradients should match autograd's """
+
+    pos_score, neg_score = sgns_scores(
+        model.w_embeddings, model.c_embeddings, *batch)
+    autograd_loss = -1 * (pos_score + neg_score)
+    autograd_loss.backward()
+
+    w_pos, c_pos, c_neg = batch
+    loss, w_grad, c_grad, c_neg_grad = sgns_gradients(
+        model.w_embeddings.weight.detach(),
+        model.c_embeddings.weight.detach(),
+        w_pos, c_pos, c_neg)
+
+    # Scatter the per-row gradients into dense tables to compare
+    w_dense = torch.zeros_like(model.w_embeddings.weight).index_add_(
+        0, w_pos, w_grad)
+    c_dense = torch.zeros_like(model.c_embeddings.weight).index_add_(
+        0, c_pos, c_grad).index_add_(
+        0, c_neg.flatten(), c_neg_grad.flatten(0, 1))
+
+    assert torch.allclose(loss, autograd_loss.detach())
+    assert torch.allclose(w_dense, model.w_embeddings.weight.grad.to_dense())
+    assert torch.allclose(c_dense, model.c_embeddings.weight.grad.to_dense())
+
+
+def test_fused_step_matches_sgd(model, batch):
+    """ A fused step should land on the same weights as autograd with SGD """
+
+    fused_model = copy.deepcopy(model)
+
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+    pos_score, neg_score = model(*batch)
+    (-1 * (pos_score + neg_score)).backward()
+    optimizer.step()
+
+    sgns_sgd_step(
+        fused_model.w_embeddings.weight,
+        fused_model.c_embeddings.weight,
+        *batch,
+        lr=0.1
+    )
+
+    assert torch.allclose(
+        fused_model.w_embeddings.weight, model.w_embeddings.weight)
+    assert torch.allclose(
+        fused_model.c_embeddings.weight, model.c_embeddings.weight)
+    assert fused_model.w_embeddings.weight.grad is None
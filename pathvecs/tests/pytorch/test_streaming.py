@@ -0,0 +1,115 @@
+import pytest
+import torch
+from torch.utils.data import DataLoader
+
+from pathvecs.pytorch import StreamingWordContextDataset
+from pathvecs.pairs import open_pairs, write_pairs
+
+
+@pytest.fixture
+def pairs_files(tmp_path):
+    generator = torch.Generator().manual_seed(0)
+
+    pairs_files = []
+    for i, num_pairs in enumerate([1000, 337]):
+        pairs = torch.randint(0, 30, (num_pairs, 2), generator=generator)
+        fp = tmp_path / 'pairs_{}.bin'.format(i)
+        write_pairs(fp, pairs.numpy())
+        pairs_files.append(fp)
+
+    return pairs_files
+
+
+def all_pairs(pairs_files):
+    return torch.cat([torch.from_numpy(open_pairs(fp)) for fp in pairs_files])
+
+
+def sorted_rows(pairs):
+    """ Sort (N, 2) pairs by row, to compare pairs as a multiset """
+    keys = pairs[:, 0].long() * (pairs[:, 1].max() + 1) + pairs[:, 1]
+    return pairs[keys.argsort()]
+
+
+def collect(batches, negative_samples):
+    pairs = []
+    for w_pos, c_pos, c_neg in batches:
+        assert c_neg.shape == (len(w_pos), negative_samples)
+        pairs.append(torch.stack([w_pos, c_pos], dim=1))
+    return torch.cat(pairs)
+
+
+def test_every_pair_once_per_epoch(pairs_files):
+    """ An epoch should emit every pair exactly once in batches """
+
+    dataset = StreamingWordContextDataset(
+        pairs_files,
+        batch_size=64,
+        negative_samples=4,
+        block_size=100,
+        buffer_size=300
+    )
+    assert dataset.num_pairs == 1337
+
+    batches = list(dataset)
+    assert all(len(w_pos) == 64 for w_pos, _, _ in batches[:-1])
+
+    streamed = collect(batches, 4)
+    expected = all_pairs(pairs_files)
+    assert torch.equal(sorted_rows(streamed), sorted_rows(expected))
+
+
+def test_shuffled_between_epochs(pairs_files):
+    """ Pair order should change between epochs, but not for the same epoch """
+
+    dataset = StreamingWordContextDataset(
+        pairs_files, batch_size=64, block_size=100, buffer_size=300)
+
+    first = collect(dataset, 5)
+    again = collect(dataset, 5)
+    dataset.set_epoch(1)
+    second = collect(dataset, 5)
+
+    assert torch.equal(first, again)
+    assert not torch.equal(first, second)
+    assert not torch.equal(first, all_pairs(pairs_files))
+
+
+def test_drop_last(pairs_files):
+    """ With drop_last, only full batches should be emitted """
+
+    dataset = StreamingWordContextDataset(
+        pairs_files, batch_size=64, block_size=100, drop_last=True)
+
+    batches = list(dataset)
+    assert len(batches) == 1337 // 64
+    assert all(len(w_pos) == 64 for w_pos, _, _ in batches)
+
+
+def test_workers_split_pairs(pairs_files):
+    """ DataLoader workers should each stream a disjoint share of the pairs """
+
+    dataset = StreamingWordContextDataset(
+        pairs_files, batch_size=64, block_size=100, buffer_size=300)
+    dataloader = DataLoader(dataset, batch_size=None, num_workers=2)
+
+    streamed = collect(dataloader, 5)
+    expected = all_pairs(pairs_files)
+    assert torch.equal(sorted_rows(streamed), sorted_rows(expected))
+
+
+def test_subsampled_batches_stay_full(pairs_files):
+    """ Subsampled pairs are dropped before batching, keeping batches full """
+
+    dataset = StreamingWordContextDataset(
+        pairs_files,
+        batch_size=64,
+        block_size=100,
+        buffer_size=300,
+        subsample=1e-2
+    )
+
+    batches = list(dataset)
+    assert all(len(w_pos) == 64 for w_pos, _, _ in batches[:-1])
+
+    streamed = collect(batches, 5)
+    assert 0 < len(streamed) < dataset.num_pairs
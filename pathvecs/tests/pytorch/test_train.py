@@ -0,0 +1,111 @@
+import pytest
+import torch
+
+from pathvecs.pytorch import SkipGramModel
+from pathvecs.pytorch.train import Trainer
+
+
+@pytest.fixture
+def model():
+    torch.manual_seed(0)
+    wvocab = {'w{}'.format(i): i for i in range(20)}
+    cvocab = {'c{}'.format(i): i for i in range(30)}
+    return SkipGramModel(wvocab=wvocab, cvocab=cvocab, emb_dim=8)
+
+
+@pytest.fixture
+def batches():
+    generator = torch.Generator().manual_seed(0)
+
+    # Each word only ever appears with two contexts, so there is signal to fit
+    batches = []
+    for _ in range(20):
+        w_pos = torch.randint(0, 20, (32,), generator=generator)
+        c_pos = w_pos + torch.randint(0, 2, (32,), generator=generator)
+        c_neg = torch.randint(0, 30, (32, 5), generator=generator)
+        batches.append((w_pos, c_pos, c_neg))
+
+    return batches
+
+
+def test_forward_single_pair(model):
+    """ The forward pass should handle batches of a single pair """
+
+    pos_score, neg_score = model(
+        torch.tensor([1]), torch.tensor([2]), torch.tensor([[3, 4, 5]]))
+
+    assert pos_score.shape == ()
+    assert neg_score.shape == ()
+
+
+@pytest.mark.parametrize("step, lr", [('autograd', 0.1), ('fused', 0.025)])
+def test_training_reduces_loss(step, lr, model, batches):
+    """ Loss should go down over a few epochs on learnable batches """
+
+    logs = []
+    trainer = Trainer(
+        model, lr=lr, step=step, log_every=len(batches), log=logs.append)
+
+    first_loss = sum(trainer.train_step(*b) for b in batches) / len(batches)
+    trainer.train(batches, num_epochs=5)
+    last_loss = sum(trainer.train_step(*b) for b in batches) / len(batches)
+
+    assert last_loss < first_loss
+    assert trainer.epoch == 5
+    assert len(logs) == 5
+    assert 'pairs/s' in logs[0]
+
+
+@pytest.mark.parametrize("step", ['autograd', 'fused'])
+def test_empty_batches_skipped(step, model, batches):
+    """ Batches emptied by subsampling should not be trained on """
+
+    empty = (
+        torch.zeros(0, dtype=torch.int64),
+        torch.zeros(0, dtype=torch.int64),
+        torch.zeros((0, 5), dtype=torch.int64)
+    )
+
+    logs = []
+    trainer = Trainer(model, step=step, log_every=len(batches), log=logs.append)
+    trainer.train([empty] + batches + [empty])
+
+    assert trainer.step == len(batches)
+    assert 'nan' not in logs[0]
+    assert not torch.isnan(model.w_embeddings.weight).any()
+
+
+def test_neighbor_logging(model, batches):
+    """ Neighbors should be logged from a snapshot in the background """
+
+    logs = []
+    trainer = Trainer(
+        model,
+        log_every=10,
+        neighbor_words=['w1', 'w2', 'not_in_vocab'],
+        num_neighbors=3,
+        log=logs.append
+    )
+    trainer.train(batches)
+
+    neighbor_logs = [l for l in logs if l.startswith('neighbors')]
+    assert neighbor_logs
+    assert 'w1' in neighbor_logs[0]
+    assert 'not_in_vocab' not in neighbor_logs[0]
+
+
+def test_checkpoint_round_trip(model, batches, tmp_path):
+    """ A checkpoint should restore the model, optimizer, epoch and step """
+
+    trainer = Trainer(model, checkpoint_dir=tmp_path, log_every=None)
+    trainer.train(batches, num_epochs=2)
+
+    resumed = Trainer(
+        SkipGramModel(model.w2i, model.c2i, emb_dim=8), log_every=None)
+    resumed.load_checkpoint(tmp_path / 'checkpoint.pth')
+
+    assert resumed.epoch == 2
+    assert resumed.step == 2 * len(batches)
+    assert torch.equal(
+        resumed.model.w_embeddings.weight, model.w_embeddings.weight)
+    assert not (tmp_path / 'checkpoint.tmp').exists()
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+from pathvecs.pairs import (
+    PairsWriter,
+    open_pairs,
+    read_header,
+    write_pairs,
+    subsample_keep_probs,
+    subsample_pairs
+)
+
+
+@pytest.fixture
+def pairs():
+    return np.arange(20, dtype=np.int32).reshape(10, 2)
+
+
+def test_write_and_open_pairs(pairs, tmp_path):
+    """ Pairs should round trip through a pairs file """
+
+    fp = tmp_path / 'pairs.bin'
+    write_pairs(fp, pairs)
+
+    assert read_header(fp) == len(pairs)
+    assert np.array_equal(open_pairs(fp), pairs)
+
+
+def test_append_pairs(pairs, tmp_path):
+    """ Appending should continue from the pairs already in the file """
+
+    fp = tmp_path / 'pairs.bin'
+    write_pairs(fp, pairs[:4])
+
+    with PairsWriter(fp, append=True) as writer:
+        writer.write(pairs[4:7])
+        writer.write(pairs[7:])
+
+    assert np.array_equal(open_pairs(fp), pairs)
+
+
+def test_interrupted_write_is_discarded(pairs, tmp_path):
+    """ Pairs written past the recorded count should be ignored and dropped """
+
+    fp = tmp_path / 'pairs.bin'
+    write_pairs(fp, pairs[:4])
+
+    # Simulate a crash before the header count is updated
+    writer = PairsWriter(fp, append=True)
+    writer.write(pairs[4:])
+    writer._file.close()  # pylint: disable=protected-access
+
+    assert np.array_equal(open_pairs(fp), pairs[:4])
+
+    with PairsWriter(fp, append=True) as writer:
+        writer.write(pairs[4:6])
+
+    assert np.array_equal(open_pairs(fp), pairs[:6])
+
+
+def test_truncate_pairs(pairs, tmp_path):
+    """ Truncating should drop the pairs past the given count """
+
+    fp = tmp_path / 'pairs.bin'
+    write_pairs(fp, pairs)
+
+    with PairsWriter(fp, append=True) as writer:
+        writer.truncate(6)
+        writer.write(pairs[:2])
+
+    assert np.array_equal(open_pairs(fp), np.concatenate([pairs[:6], pairs[:2]]))
+
+    with pytest.raises(ValueError):
+        with PairsWriter(fp, append=True) as writer:
+            writer.truncate(100)
+
+
+def test_empty_pairs_file(tmp_path):
+    """ An empty pairs file should open as an empty (0, 2) array """
+
+    fp = tmp_path / 'pairs.bin'
+    with PairsWriter(fp):
+        pass
+
+    assert open_pairs(fp).shape == (0, 2)
+
+
+def test_invalid_pairs(tmp_path):
+    """ Non-pairs files and badly shaped pairs should be rejected """
+
+    fp = tmp_path / 'pairs.bin'
+    fp.write_bytes(b'not a pairs file'.ljust(64, b'\0'))
+
+    with pytest.raises(ValueError):
+        open_pairs(fp)
+
+    with pytest.raises(ValueError):
+        with PairsWriter(tmp_path / 'other.bin') as writer:
+            writer.write(np.zeros((3, 3)))
+
+
+def test_subsample_keep_probs():
+    """ Rare ids should be kept and frequent ids kept with sqrt(t/f) + t/f """
+
+    counts = np.array([0, 1, 10, 989])
+    keep_probs = subsample_keep_probs(counts, threshold=1e-3)
+
+    assert np.all(keep_probs[:3] == 1.0)
+
+    ratio = 1e-3 / 0.989
+    assert keep_probs[3] == pytest.approx(np.sqrt(ratio) + ratio)
+
+
+def test_subsample_pairs():
+    """ Frequent words should be thinned out while rare words are kept """
+
+    words = np.concatenate([np.zeros(9000), np.arange(1, 1001)])
+    contexts = np.arange(len(words)) % 1000
+    pairs = np.stack([words, contexts], axis=1).astype(np.int32)
+
+    kept = subsample_pairs(pairs, threshold=1e-3, seed=0)
+
+    expected = 9000 * subsample_keep_probs([9000, 1000], threshold=1e-3)[0]
+    assert abs((kept[:, 0] == 0).sum() - expected) < 0.1 * expected
+    assert (kept[:, 0] != 0).sum() == 1000
+
+    # Kept pairs are a subset of the input, in order, and reproducible
+    assert np.array_equal(kept, subsample_pairs(pairs, threshold=1e-3, seed=0))
+    assert np.array_equal(kept[kept[:, 0] != 0], pairs[9000:])
@@ -0,0 +1,53 @@
+import pytest
+from spacy.tokens import Doc, DocBin
+
+from pathvecs.parses import count_docs, doc_ranges, read_docs, split_doc_bin
+
+
+@pytest.fixture
+def parse_file(en_vocab, tmp_path):
+    """ A DocBin of five docs, each a single distinct word """
+
+    doc_bin = DocBin(docs=[
+        Doc(en_vocab, words=['word{}'.format(i)]) for i in range(5)
+    ])
+
+    fp = tmp_path / '0000.spacy'
+    doc_bin.to_disk(fp)
+    return fp
+
+
+def test_read_docs(parse_file, en_vocab):
+    """ Docs should be read in order, in full or by range """
+
+    assert count_docs(parse_file) == 5
+    assert [doc.text for doc in read_docs(parse_file, en_vocab)] == [
+        'word0', 'word1', 'word2', 'word3', 'word4']
+    assert [doc.text for doc in read_docs(parse_file, en_vocab, 1, 3)] == [
+        'word1', 'word2']
+    assert [doc.text for doc in read_docs(parse_file, en_vocab, 4)] == ['word4']
+
+
+def test_doc_ranges():
+    """ Ranges should cover every doc once, the last one possibly short """
+
+    assert doc_ranges(5, 2) == [(0, 2), (2, 4), (4, 5)]
+    assert doc_ranges(4, 2) == [(0, 2), (2, 4)]
+    assert doc_ranges(0, 2) == []
+
+    with pytest.raises(ValueError):
+        doc_ranges(5, 0)
+
+
+def test_split_doc_bin(parse_file, en_vocab, tmp_path):
+    """ Each range DocBin should hold just the docs of its range """
+
+    split = list(split_doc_bin(parse_file, 2))
+    assert [doc_range for doc_range, _doc_bin in split] == [(0, 2), (2, 4), (4, 5)]
+
+    for (start, stop), doc_bin in split:
+        fp = tmp_path / 'range.spacy'
+        doc_bin.to_disk(fp)
+
+        assert [doc.text for doc in read_docs(fp, en_vocab)] == [
+            'word{}'.format(i) for i in range(start, stop)]
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from pathvecs.sketch import CountMinSketch, hash_keys, sketch_width
+
+
+@pytest.fixture
+def keys_and_counts():
+    rng = np.random.default_rng(0)
+    keys = np.array(['key{}'.format(i) for i in range(2000)], dtype=object)
+    counts = rng.zipf(1.5, len(keys))
+    return keys, counts
+
+
+def test_hash_keys_is_stable():
+    """ Hashes should only depend on the keys """
+
+    keys = ['alice/nsubj', 'throw/dobj-1', 'alice/nsubj']
+    hashes = hash_keys(keys)
+
+    assert hashes.dtype == np.uint64
+    assert hashes[0] == hashes[2] != hashes[1]
+    assert np.array_equal(hash_keys(keys), hashes)
+
+
+def test_estimates_never_undercount(keys_and_counts):
+    """ Estimates should be at least the true counts, even with collisions """
+
+    keys, counts = keys_and_counts
+    sketch = CountMinSketch(width=256, depth=3)
+
+    # Added in two batches, with repeated keys
+    sketch.add(hash_keys(keys[:1500]), counts[:1500])
+    sketch.add(hash_keys(keys[1000:]), counts[1000:])
+
+    expected = counts.copy()
+    expected[1000:1500] *= 2
+
+    estimates = sketch.query(hash_keys(keys))
+    assert np.all(estimates >= expected)
+    assert sketch.total == expected.sum()
+
+
+def test_wide_sketch_is_exact(keys_and_counts):
+    """ With far more counters than keys, estimates should be exact """
+
+    keys, counts = keys_and_counts
+    sketch = CountMinSketch(width=2**20, depth=4)
+    sketch.add(hash_keys(keys), counts)
+
+    assert np.array_equal(sketch.query(hash_keys(keys)), counts)
+
+
+def test_sketch_width(keys_and_counts):
+    """ Estimates should overshoot by less than error * min_count """
+
+    keys, counts = keys_and_counts
+    width = sketch_width(counts.sum(), min_count=100, error=0.5)
+    assert width == int(np.ceil(np.e * counts.sum() / 50))
+
+    sketch = CountMinSketch(width=width, depth=4)
+    sketch.add(hash_keys(keys), counts)
+
+    overshoot = sketch.query(hash_keys(keys)) - counts
+    assert np.mean(overshoot >= 50) <= np.exp(-4)
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pathvecs.triples import (
+    clean_triples,
+    count_rows,
+    intern_triples,
+    intern_tuples,
+    list_triples_files,
+    load_triples,
+    read_triples,
+    write_triples
+)
+
+
+@pytest.fixture
+def triples():
+    return pd.DataFrame(
+        [
+            ('throw', 'nsubj', 'alice'),
+            ('throw', 'dobj', 'ball'),
+            ('be_queen_of', 'nsubj', 'alice'),
+            ('ball', 'prep_of', 'yarn'),
+        ],
+        columns=['src', 'path', 'dst']
+    )
+
+
+def test_intern_triples(triples):
+    """ Every string should be interned once, with codes into the table """
+
+    strings, codes = intern_triples(triples)
+
+    assert codes.shape == (4, 3) and codes.dtype == np.int32
+    assert len(strings) == len(set(strings)) == 8
+    assert np.array_equal(strings.values[codes], triples.values)
+
+
+def test_write_and_read_triples(triples, tmp_path):
+    """ Triples should round trip as categoricals over one string table """
+
+    fp = tmp_path / 'triples.npz'
+    write_triples(fp, triples)
+
+    strings, codes = load_triples(fp)
+    assert np.array_equal(strings.values[codes], triples.values)
+
+    loaded = read_triples(fp)
+    assert loaded.astype(str).equals(triples)
+    assert loaded['src'].cat.categories.equals(loaded['dst'].cat.categories)
+
+    # Shared categoricals are interned without re-hashing
+    reinterned_strings, reinterned_codes = intern_triples(loaded)
+    assert reinterned_strings.equals(strings)
+    assert np.array_equal(reinterned_codes, codes)
+
+
+def test_empty_triples(tmp_path):
+    """ An empty shard should round trip as an empty DataFrame """
+
+    fp = tmp_path / 'triples.npz'
+    write_triples(fp, pd.DataFrame(columns=['src', 'path', 'dst']))
+
+    assert len(read_triples(fp)) == 0
+    assert count_rows(fp) == 0
+
+
+def test_legacy_parquet_triples(triples, tmp_path):
+    """ Parquet triples files should be read and interned """
+
+    pytest.importorskip('fastparquet')
+
+    triples.to_parquet(tmp_path / 'old.df', engine='fastparquet')
+    write_triples(tmp_path / 'new.npz', triples)
+    (tmp_path / 'other.txt').write_text('')
+
+    triples_files = list_triples_files(tmp_path)
+    assert [fp.name for fp in triples_files] == ['new.npz', 'old.df']
+
+    for fp in triples_files:
+        assert read_triples(fp).astype(str).equals(triples)
+        assert count_rows(fp) == len(triples)
+
+
+def test_nul_characters_rejected(tmp_path):
+    """ Strings with the table separator cannot be written """
+
+    triples = pd.DataFrame([('a\0b', 'nsubj', 'c')], columns=['src', 'path', 'dst'])
+
+    with pytest.raises(ValueError):
+        write_triples(tmp_path / 'triples.npz', triples)
+
+
+def reference_clean_triples(df):
+    """ The original row-wise filters of the 1_triples notebook """
+
+    df = df[df.apply(lambda col: col.str.encode('ascii', errors='ignore').str.decode('utf-8')).all(axis=1)]
+    df = df[df.apply(lambda col: ~col.str.isspace()).all(axis=1)]
+    df = df[df.apply(lambda col: ~col.str.contains('\n')).all(axis=1)]
+    df = df[df.apply(lambda col: ~col.str.contains('=')).all(axis=1)]
+
+    df['src'] = df['src'].str.replace(' ', '_')
+    df['dst'] = df['dst'].str.replace(' ', '_')
+
+    return df
+
+
+def test_clean_triples(triples):
+    """ Cleaning interned triples should match the DataFrame filters """
+
+    dirty = [
+        ('new york', 'prep_in', 'state'),
+        ('new_york', 'prep of', 'big apple'),
+        ('caf\u00e9', 'nsubj', 'open'),
+        ('\u00e9\u00e9', 'nsubj', 'open'),
+        ('', 'dobj', 'thing'),
+        ('   ', 'dobj', 'thing'),
+        ('\u3000', 'dobj', 'thing'),
+        ('a\nb', 'dobj', 'thing'),
+        ('width=3', 'dobj', 'thing'),
+        ('thing', 'dobj=', 'other'),
+    ]
+    tuples = list(triples.itertuples(index=False, name=None)) + dirty
+
+    strings, codes = clean_triples(*intern_tuples(tuples))
+    expected = reference_clean_triples(
+        pd.DataFrame(tuples, columns=['src', 'path', 'dst']))
+
+    assert len(strings) == len(set(strings))
+    assert np.array_equal(strings.values[codes], expected.values)
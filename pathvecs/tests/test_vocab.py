@@ -0,0 +1,251 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pathvecs.pairs import open_pairs
+from pathvecs.triples import write_triples
+from pathvecs.vocab import (
+    PairBuilder,
+    count_triples,
+    count_vocab,
+    count_frequent,
+    build_vocab,
+    build_pairs,
+    update_vocab,
+    load_vocab,
+    load_manifest,
+    save_counts,
+    load_counts
+)
+
+
+@pytest.fixture
+def triples_shards():
+    return [
+        pd.DataFrame(
+            [
+                ('throw', 'nsubj', 'alice'),
+                ('throw', 'dobj', 'ball'),
+                ('be_queen_of', 'nsubj', 'alice'),
+                ('be_queen_of', 'dobj', 'antarctica'),
+            ],
+            columns=['src', 'path', 'dst']
+        ),
+        pd.DataFrame(
+            [
+                ('throw', 'nsubj', 'bob'),
+                ('throw', 'dobj', 'ball'),
+                ('ball', 'prep_of', 'yarn'),
+            ],
+            columns=['src', 'path', 'dst']
+        )
+    ]
+
+
+def reference_counts(shards):
+    """ The row by row counting that count_triples replaces """
+
+    wcounts, ccounts = Counter(), Counter()
+    for triples in shards:
+        for src, edge, dst in zip(triples['src'], triples['path'], triples['dst']):
+            wcounts[src] += 1
+            wcounts[dst] += 1
+            ccounts[dst + '/' + edge] += 1
+            ccounts[src + '/' + edge + '-1'] += 1
+
+    return wcounts, ccounts
+
+
+def reference_pairs(shards, wvocab, cvocab):
+    """ The row by row pair building that PairBuilder replaces """
+
+    pairs = []
+    for triples in shards:
+        for src, edge, dst in zip(triples['src'], triples['path'], triples['dst']):
+
+            src_context = dst + '/' + edge
+            if src in wvocab and src_context in cvocab:
+                pairs.append([wvocab[src], cvocab[src_context]])
+
+            dst_context = src + '/' + edge + '-1'
+            if dst in wvocab and dst_context in cvocab:
+                pairs.append([wvocab[dst], cvocab[dst_context]])
+
+    return np.array(pairs, dtype=np.int32).reshape(-1, 2)
+
+
+@pytest.fixture
+def vocabs(triples_shards):
+    wcounts, ccounts = reference_counts(triples_shards)
+
+    # Leave some words and contexts out, so that pairs are dropped
+    wvocab = {w: i for i, (w, _) in enumerate(wcounts.most_common()[:-2])}
+    cvocab = {c: i for i, (c, _) in enumerate(ccounts.most_common()[:-3])}
+
+    return wvocab, cvocab
+
+
+def test_count_triples(triples_shards):
+    """ Vectorized counts should match counting row by row """
+
+    wcounts, ccounts = count_triples(triples_shards[0])
+    expected_wcounts, expected_ccounts = reference_counts(triples_shards[:1])
+
+    assert wcounts.to_dict() == dict(expected_wcounts)
+    assert ccounts.to_dict() == dict(expected_ccounts)
+
+
+def test_count_vocab(triples_shards, tmp_path):
+    """ Merged shard counts should match counting all shards row by row """
+
+    pytest.importorskip('fastparquet')
+
+    triples_files = []
+    for i, triples in enumerate(triples_shards):
+        fp = tmp_path / '{}.df'.format(i)
+        triples.to_parquet(fp, engine='fastparquet')
+        triples_files.append(fp)
+
+    wcounts, ccounts = count_vocab(triples_files, num_processes=2, merge_every=1)
+    expected_wcounts, expected_ccounts = reference_counts(triples_shards)
+
+    assert wcounts.to_dict() == dict(expected_wcounts)
+    assert ccounts.to_dict() == dict(expected_ccounts)
+
+    # Most common first
+    assert list(wcounts.values) == sorted(wcounts.values, reverse=True)
+
+    save_counts(tmp_path / 'wcounts.df', wcounts)
+    assert load_counts(tmp_path / 'wcounts.df').to_dict() == wcounts.to_dict()
+
+
+def test_count_frequent(triples_shards, triples_files):
+    """ Keys reaching min_count should be found and counted exactly """
+
+    expected_wcounts, expected_ccounts = reference_counts(triples_shards)
+
+    # A tiny sketch, so that estimates collide
+    wcounts, ccounts = count_frequent(
+        triples_files, min_count=2, width=4, depth=2, num_processes=2)
+
+    for counts, expected in [(wcounts, expected_wcounts), (ccounts, expected_ccounts)]:
+        frequent = {key: count for key, count in expected.items() if count >= 2}
+        assert frequent.items() <= counts.to_dict().items()
+        assert counts.to_dict().items() <= dict(expected).items()
+
+
+def test_count_frequent_sized_from_total(triples_shards, triples_files):
+    """ Sketches sized from the number of triples should find the same keys """
+
+    expected_wcounts, _ = reference_counts(triples_shards)
+
+    wcounts, _ = count_frequent(triples_files, min_count=2, num_processes=2)
+    frequent = {key: count for key, count in expected_wcounts.items() if count >= 2}
+    assert frequent.items() <= wcounts.to_dict().items()
+
+
+def test_build_vocab():
+    """ Keys below min_count should be dropped, with ids in count order """
+
+    counts = pd.Series([5, 3, 3, 1], index=['a', 'b', 'c', 'd'])
+    assert build_vocab(counts, min_count=3) == {'a': 0, 'b': 1, 'c': 2}
+
+
+def test_load_vocab(tmp_path):
+    fp = tmp_path / 'wvocab.txt'
+    fp.write_text('be\nbook\nmove-to\n')
+    assert load_vocab(fp) == {'be': 0, 'book': 1, 'move-to': 2}
+
+
+def test_pair_builder(triples_shards, vocabs):
+    """ Integer joined pairs should match building them row by row """
+
+    wvocab, cvocab = vocabs
+    builder = PairBuilder(wvocab, cvocab)
+
+    for triples in triples_shards:
+        expected = reference_pairs([triples], wvocab, cvocab)
+        assert np.array_equal(builder.pairs(triples), expected)
+
+
+def test_pair_builder_empty_vocab(triples_shards):
+    """ No pairs should be built if no context is in the vocab """
+
+    builder = PairBuilder({'throw': 0}, {})
+    assert builder.pairs(triples_shards[0]).shape == (0, 2)
+
+
+@pytest.fixture
+def triples_files(triples_shards, tmp_path):
+    triples_files = []
+    for i, triples in enumerate(triples_shards):
+        fp = tmp_path / '{}.npz'.format(i)
+        write_triples(fp, triples)
+        triples_files.append(fp)
+
+    return triples_files
+
+
+def test_build_pairs(triples_shards, triples_files, vocabs, tmp_path):
+    """ Pairs should be written for all shards, in shard order """
+
+    wvocab, cvocab = vocabs
+    pairs_file = tmp_path / 'pairs.bin'
+    num_pairs = build_pairs(
+        triples_files, wvocab, cvocab, pairs_file, num_processes=2)
+
+    expected = reference_pairs(triples_shards, wvocab, cvocab)
+    assert num_pairs == len(expected)
+    assert np.array_equal(open_pairs(pairs_file), expected)
+
+
+def test_update_vocab(triples_shards, triples_files, tmp_path):
+    """ Updates should only process new shards and keep vocab ids stable """
+
+    pytest.importorskip('fastparquet')
+
+    output = tmp_path / 'vocab'
+    pairs_file = tmp_path / 'pairs.bin'
+
+    new_files = update_vocab(triples_files[:1], output, pairs_file, min_count=2)
+    assert new_files == triples_files[:1]
+
+    wvocab = load_vocab(output / 'wvocab.txt')
+    cvocab = load_vocab(output / 'cvocab.txt')
+    first_pairs = np.array(open_pairs(pairs_file))
+    assert np.array_equal(
+        first_pairs, reference_pairs(triples_shards[:1], wvocab, cvocab))
+
+    # Processed shards are skipped
+    assert update_vocab(triples_files[:1], output, pairs_file, min_count=2) == []
+
+    new_files = update_vocab(triples_files, output, pairs_file, min_count=2)
+    assert new_files == triples_files[1:]
+
+    # Existing ids are kept and new entries appended
+    new_wvocab = load_vocab(output / 'wvocab.txt')
+    new_cvocab = load_vocab(output / 'cvocab.txt')
+    assert list(new_wvocab.items())[:len(wvocab)] == list(wvocab.items())
+    assert list(new_cvocab.items())[:len(cvocab)] == list(cvocab.items())
+    assert 'ball' in new_wvocab and 'ball' not in wvocab
+
+    # Pairs for the new shard are appended after the existing ones
+    expected = np.concatenate([
+        first_pairs,
+        reference_pairs(triples_shards[1:], new_wvocab, new_cvocab)
+    ])
+    assert np.array_equal(open_pairs(pairs_file), expected)
+
+    manifest = load_manifest(output)
+    assert manifest['num_pairs'] == len(expected)
+    assert sorted(manifest['shards']) == ['0.npz', '1.npz']
+
+    wcounts = load_counts(output / 'wcounts-{}.df'.format(manifest['generation']))
+    expected_wcounts, _ = reference_counts(triples_shards)
+    assert wcounts.to_dict() == dict(expected_wcounts)
+    assert not output.joinpath('wcounts-{}.df'.format(manifest['generation'] - 1)).exists()
+
+    with pytest.raises(ValueError):
+        update_vocab(triples_files, output, pairs_file, min_count=3)
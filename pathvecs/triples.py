@@ -0,0 +1,270 @@
+""" An interned on-disk format for (src, path, dst) triples.
+
+Rather than a DataFrame of lemma strings, a triples file holds a string table
+with every distinct src, path and dst string stored once, and an int32 array
+of shape (N, 3) coding each triple as positions in that table. Later stages
+count, clean and join on the codes, and only touch the strings once per
+distinct value.
+
+Triples files are saved with numpy.savez, with the string table stored as
+the UTF-8 encoding of the strings joined by NUL characters:
+
+    triples     int32 (N, 3)   src, path and dst codes
+    strings     uint8          b'\\0'.join(string table)
+
+Typical usage example:
+
+    write_triples('0001.npz', df)
+
+    triples = read_triples('0001.npz')
+    triples['src'].cat.codes
+
+Parquet triples files of raw strings, as written by earlier versions of
+1_triples, are read and interned on the fly.
+"""
+from pathlib import Path
+import itertools
+import zipfile
+import re
+import os
+
+import numpy as np
+import pandas as pd
+
+
+TRIPLE_COLUMNS = ['src', 'path', 'dst']
+
+SUFFIX = '.npz'
+LEGACY_SUFFIX = '.df'
+
+_SEPARATOR = '\0'
+
+# At least one ASCII character, not only whitespace, no newlines or '='
+_VALID_STRING = re.compile(r'(?=[^\n=]*[\x00-\x7f])(?!\s*\Z)[^\n=]*')
+
+
+def intern_triples(triples):
+    """ Intern a DataFrame of triples into a string table and codes
+
+    Columns that are already categoricals over one shared string table, as
+    read by read_triples, are not re-hashed.
+
+    Args:
+        triples: DataFrame with src, path and dst columns
+
+    Returns:
+        strings: pandas Index, the string table
+        codes: (N, 3) int32 array of positions in strings, -1 for missing
+    """
+
+    columns = [triples[column] for column in TRIPLE_COLUMNS]
+
+    if all(isinstance(c.dtype, pd.CategoricalDtype) for c in columns):
+        strings = columns[0].cat.categories
+        if all(c.cat.categories.equals(strings) for c in columns[1:]):
+            codes = np.stack([c.cat.codes.to_numpy() for c in columns], axis=1)
+            return strings, codes.astype(np.int32)
+
+    codes, strings = pd.factorize(pd.concat(columns, ignore_index=True))
+    codes = codes.reshape(len(columns), len(triples)).T
+
+    return pd.Index(strings, dtype=object), np.ascontiguousarray(
+        codes, dtype=np.int32)
+
+
+def intern_tuples(triples):
+    """ Intern a sequence of (src, path, dst) string tuples
+
+    Returns:
+        strings: pandas Index, the string table
+        codes: (N, 3) int32 array of positions in strings
+    """
+
+    flat = np.array(list(itertools.chain.from_iterable(triples)), dtype=object)
+    codes, strings = pd.factorize(flat)
+
+    return pd.Index(strings, dtype=object), codes.reshape(-1, 3).astype(np.int32)
+
+
+def concat_interned(parts):
+    """ Put interned triples with separate string tables onto one table
+
+    Args:
+        parts: List of (strings, codes) pairs
+
+    Returns:
+        strings: pandas Index, the string table, without duplicates
+        codes: List of (N, 3) int32 arrays of positions in strings, one per part
+    """
+
+    table = np.concatenate([
+        np.asarray(strings, dtype=object) for strings, _codes in parts])
+    table_codes, uniques = pd.factorize(table)
+
+    offsets = np.cumsum([0] + [len(strings) for strings, _codes in parts])
+    codes = [
+        table_codes[offset + part_codes].astype(np.int32)
+        for offset, (_strings, part_codes) in zip(offsets, parts)
+    ]
+
+    return pd.Index(uniques, dtype=object), codes
+
+
+def valid_strings(strings):
+    """ Get a mask of the strings that may appear in a triple
+
+    A string must have at least one ASCII character, must not be only
+    whitespace, and must contain neither newlines nor equals signs (which
+    tend to be parts of wikipedia markdown / css elements).
+    """
+
+    return np.fromiter(
+        (_VALID_STRING.fullmatch(string) is not None for string in strings),
+        dtype=bool,
+        count=len(strings)
+    )
+
+
+def clean_triples(strings, codes):
+    """ Drop invalid triples and normalize spaces in src and dst as underscores
+
+    Strings are checked and normalized once each in the string table, rather
+    than once per triple.
+
+    Args:
+        strings: pandas Index, the string table
+        codes: (N, 3) int32 array of positions in strings
+
+    Returns:
+        strings: pandas Index, the string table of the remaining triples
+        codes: (M, 3) int32 array of positions in strings
+    """
+
+    codes = codes[valid_strings(strings)[codes].all(axis=1)]
+
+    # Paths keep their spaces, so src and dst codes point into a second,
+    # normalized copy of the table
+    normalized = strings.str.replace(' ', '_', regex=False)
+    codes = codes + np.array([len(strings), 0, len(strings)], dtype=np.int32)
+
+    # Keep only the strings still in use, without duplicates
+    table = np.concatenate([strings.to_numpy(), normalized.to_numpy()])
+    used, inverse = np.unique(codes.ravel(), return_inverse=True)
+    table_codes, table = pd.factorize(table[used])
+
+    return (
+        pd.Index(table, dtype=object),
+        table_codes[inverse].reshape(-1, 3).astype(np.int32)
+    )
+
+
+def triples_frame(strings, codes):
+    """ Build a DataFrame of categoricals sharing one string table """
+
+    dtype = pd.CategoricalDtype(strings)
+    return pd.DataFrame({
+        column: pd.Categorical.from_codes(codes[:, i], dtype=dtype)
+        for i, column in enumerate(TRIPLE_COLUMNS)
+    })
+
+
+def write_triples(fp, triples):
+    """ Write a DataFrame of triples to an interned triples file
+
+    Args:
+        fp: Path to write, which should end in '.npz'
+        triples: DataFrame with src, path and dst string columns
+    """
+
+    save_triples(fp, *intern_triples(triples))
+
+
+def save_triples(fp, strings, codes):
+    """ Write an interned string table and codes to a triples file
+
+    Args:
+        fp: Path to write, which should end in '.npz'
+        strings: pandas Index, the string table
+        codes: (N, 3) int32 array of positions in strings
+    """
+
+    if strings.str.contains(_SEPARATOR, regex=False).any():
+        raise ValueError("Triples may not contain NUL characters.")
+
+    table = _SEPARATOR.join(strings).encode('utf-8')
+
+    # Written to a temporary file first, so a triples file is always complete.
+    # Writing to an open file also stops savez from appending its own suffix.
+    tmp_fp = str(fp) + '.tmp'
+    with open(tmp_fp, 'wb') as outfile:
+        np.savez(
+            outfile,
+            triples=np.asarray(codes, dtype=np.int32),
+            strings=np.frombuffer(table, dtype=np.uint8)
+        )
+    os.replace(tmp_fp, fp)
+
+
+def load_triples(fp):
+    """ Load the string table and codes of an interned triples file
+
+    Returns:
+        strings: pandas Index, the string table
+        codes: (N, 3) int32 array of positions in strings
+    """
+
+    with np.load(fp) as data:
+        codes = data['triples']
+        table = data['strings'].tobytes().decode('utf-8')
+
+    strings = table.split(_SEPARATOR) if len(codes) else []
+    return pd.Index(strings, dtype=object), codes
+
+
+def is_valid(fp):
+    """ Check that an interned triples file exists and can be read """
+
+    try:
+        with np.load(fp) as data:
+            return {'triples', 'strings'}.issubset(data.files)
+    except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+        return False
+
+
+def count_rows(fp):
+    """ Get the number of triples in a triples file, reading only its header """
+
+    if not str(fp).endswith(SUFFIX):
+        return len(pd.read_parquet(fp, columns=['path'], engine='fastparquet'))
+
+    with zipfile.ZipFile(fp) as archive, archive.open('triples.npy') as infile:
+        version = np.lib.format.read_magic(infile)
+        if version == (1, 0):
+            shape, _fortran_order, _dtype = np.lib.format.read_array_header_1_0(infile)
+        else:
+            shape, _fortran_order, _dtype = np.lib.format.read_array_header_2_0(infile)
+
+    return shape[0]
+
+
+def read_triples(fp):
+    """ Read a triples file as a DataFrame of categorical columns
+
+    All three columns share a single string table as their categories.
+    Legacy parquet triples files are interned as they are read.
+    """
+
+    if str(fp).endswith(SUFFIX):
+        return triples_frame(*load_triples(fp))
+
+    triples = pd.read_parquet(fp, columns=TRIPLE_COLUMNS, engine='fastparquet')
+    return triples_frame(*intern_triples(triples))
+
+
+def list_triples_files(folder):
+    """ Get the triples files in a folder, interned or legacy, sorted """
+
+    return sorted(
+        fp for fp in Path(folder).iterdir()
+        if fp.suffix in (SUFFIX, LEGACY_SUFFIX)
+    )
@@ -0,0 +1,762 @@
+""" Word and context vocabularies counted over triples files.
+
+Each triple (src, path, dst) contributes the words src and dst, and the
+contexts 'dst/path' (for src) and 'src/path-1' (for dst). Counting is a
+map-reduce over the triples shards: every shard is counted on its own in a
+process pool, with pandas rather than a Python loop over the rows, and the
+partial counts are merged as they come in. Memory is bounded by the number
+of distinct words and contexts, not by the number of shards.
+
+Pairs are then built with PairBuilder, which joins the triples against the
+vocabularies on integer codes rather than on concatenated context strings,
+and written to a pairs file in bulk, one shard at a time.
+
+With --approximate, frequent keys are found with Count-Min sketches and
+only they are counted exactly (see count_frequent), bounding memory when
+there are too many distinct contexts to count them all.
+
+With --incremental, only triples files missing from the output folder's
+manifest are counted and have their pairs appended, and vocab ids stay
+stable between updates (see update_vocab).
+
+Typical usage example:
+
+    python -m pathvecs.vocab \\
+        --triples data/triples/wikipedia_20220101 \\
+        --output data/vocab/wikipedia_20220101 \\
+        --min-count 100 \\
+        --pairs data/pairs/wikipedia_20220101/pairs.bin
+
+    > 100/1000 shards
+    > ...
+    > wvocab 412,345 / 9,876,543  cvocab 1,234,567 / 48,765,432
+"""
+from multiprocessing import Pool
+from pathlib import Path
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from pathvecs.pairs import PairsWriter, subsample_pairs
+from pathvecs.sketch import CountMinSketch, hash_keys, sketch_width
+from pathvecs.triples import count_rows, intern_triples, list_triples_files, read_triples
+
+
+def context_strings(terms, edges, inverse=False):
+    """ Build context strings, 'term/edge' or 'term/edge-1' if inverse
+
+    Args:
+        terms: Index or array of terms
+        edges: Index or array of edges, aligned with terms
+
+    Returns:
+        contexts: pandas Index of context strings
+    """
+
+    contexts = pd.Index(terms).astype(str) + '/' + pd.Index(edges).astype(str)
+    if inverse:
+        contexts = contexts + '-1'
+
+    return contexts
+
+
+def count_triples(triples):
+    """ Count the words and contexts in a DataFrame of triples
+
+    Counting runs on the interned codes of the triples (see
+    pathvecs.triples). Context strings are only built once per distinct
+    (term, edge) combination rather than once per row.
+
+    Returns:
+        wcounts, ccounts: Series of counts indexed by word and by context
+    """
+
+    strings, codes = intern_triples(triples)
+    codes = codes[(codes >= 0).all(axis=1)].astype(np.int64)
+
+    wcounts = np.bincount(codes[:, 0], minlength=len(strings))
+    wcounts += np.bincount(codes[:, 2], minlength=len(strings))
+    wcounts = pd.Series(wcounts, index=strings)
+
+    ccounts = []
+    for term, inverse in [(2, False), (0, True)]:
+        keys = codes[:, term] * len(strings) + codes[:, 1]
+        keys, counts = np.unique(keys, return_counts=True)
+        ccounts.append(pd.Series(counts, index=context_strings(
+            strings[keys // len(strings)],
+            strings[keys % len(strings)],
+            inverse=inverse
+        )))
+
+    return merge_counts([wcounts]), merge_counts(ccounts)
+
+
+def count_shard(fp):
+    """ Count the words and contexts in one triples file """
+    return count_triples(read_triples(fp))
+
+
+def merge_counts(partials):
+    """ Sum a list of count Series over their shared keys """
+
+    counts = pd.concat(partials)
+    counts = counts[counts > 0]
+    return counts.groupby(level=0, sort=False).sum().astype('int64')
+
+
+def count_vocab(triples_files, num_processes=None, merge_every=64, log=None):
+    """ Count words and contexts over triples files in a process pool
+
+    Args:
+        triples_files: Paths to triples files
+        num_processes: Pool size, defaults to the number of cores
+        merge_every: Number of partial counts held before they are merged
+        log: Optional callable, given progress messages
+
+    Returns:
+        wcounts, ccounts: Series of counts, most common first
+    """
+
+    triples_files = [str(fp) for fp in triples_files]
+    num_processes = num_processes or os.cpu_count()
+
+    wcounts, ccounts = pd.Series(dtype='int64'), pd.Series(dtype='int64')
+    wpartials, cpartials = [], []
+
+    log_every = max(len(triples_files) // 10, 1)
+
+    with Pool(processes=num_processes) as pool:
+        shard_counts = pool.imap_unordered(count_shard, triples_files)
+
+        for num_done, (shard_wcounts, shard_ccounts) in enumerate(
+                shard_counts, start=1):
+            wpartials.append(shard_wcounts)
+            cpartials.append(shard_ccounts)
+
+            if len(wpartials) >= merge_every:
+                wcounts = merge_counts([wcounts] + wpartials)
+                ccounts = merge_counts([ccounts] + cpartials)
+                wpartials, cpartials = [], []
+
+            if log is not None and num_done % log_every == 0:
+                log("{}/{} shards".format(num_done, len(triples_files)))
+
+    wcounts = merge_counts([wcounts] + wpartials)
+    ccounts = merge_counts([ccounts] + cpartials)
+
+    return sort_counts(wcounts), sort_counts(ccounts)
+
+
+def _hash_shard(fp):
+    """ Count a triples file, keeping only the key hashes and counts """
+
+    wcounts, ccounts = count_shard(fp)
+    return (
+        (hash_keys(wcounts.index), wcounts.values),
+        (hash_keys(ccounts.index), ccounts.values)
+    )
+
+
+def _count_hashed_shard(fp):
+    """ Count a triples file, along with the hashes of the keys """
+
+    wcounts, ccounts = count_shard(fp)
+    return (
+        (wcounts, hash_keys(wcounts.index)),
+        (ccounts, hash_keys(ccounts.index))
+    )
+
+
+def count_frequent(
+    triples_files,
+    min_count,
+    width=None,
+    depth=4,
+    error=0.5,
+    num_processes=None,
+    merge_every=64,
+    log=None
+):
+    """ Count the words and contexts that occur at least min_count times
+
+    An approximate alternative to count_vocab, for when the distinct keys
+    do not fit in memory. A first pass adds every shard's counts to a
+    Count-Min sketch for words and one for contexts. A second pass recounts
+    exactly, keeping only the candidate keys whose sketch estimate reaches
+    min_count. Sketch estimates never undercount, so no frequent key is
+    missed. Memory is bounded by the sketches and the candidates rather than
+    by all distinct keys.
+
+    By default the sketches are sized from the number of triples, read from
+    the triples files' headers, so that estimates overshoot by less than
+    error * min_count (see sketch_width). A fixed width instead lets the
+    false candidates grow with the corpus.
+
+    Args:
+        triples_files: Paths to triples files
+        min_count: Count that a key must reach to be kept
+        width: Counters per sketch row, or None to size it from the total
+        depth: Rows per sketch
+        error: Largest overshoot the width is sized for, as a fraction of
+            min_count
+        num_processes: Pool size, defaults to the number of cores
+        merge_every: Number of partial counts held before they are merged
+        log: Optional callable, given progress messages
+
+    Returns:
+        wcounts, ccounts: Exact counts of the candidate keys, most common
+            first. Candidates below min_count may remain.
+    """
+
+    triples_files = [str(fp) for fp in triples_files]
+    num_processes = num_processes or os.cpu_count()
+
+    wcounts, ccounts = pd.Series(dtype='int64'), pd.Series(dtype='int64')
+    wpartials, cpartials = [], []
+
+    with Pool(processes=num_processes) as pool:
+
+        # Each triple gives two words and two contexts
+        if width is None:
+            total = 2 * sum(pool.map(count_rows, triples_files))
+            width = sketch_width(total, min_count, error)
+
+        wsketch = CountMinSketch(width, depth)
+        csketch = CountMinSketch(width, depth)
+
+        if log is not None:
+            log("sketch width {:,}, {:,.0f} MB each".format(
+                width, wsketch.nbytes / 2**20))
+
+        for (whashes, wshard), (chashes, cshard) in pool.imap_unordered(
+                _hash_shard, triples_files):
+            wsketch.add(whashes, wshard)
+            csketch.add(chashes, cshard)
+
+        if log is not None:
+            log("sketched {:,} words and {:,} contexts".format(
+                wsketch.total, csketch.total))
+
+        for (wshard, whashes), (cshard, chashes) in pool.imap_unordered(
+                _count_hashed_shard, triples_files):
+            wpartials.append(wshard[wsketch.query(whashes) >= min_count])
+            cpartials.append(cshard[csketch.query(chashes) >= min_count])
+
+            if len(wpartials) >= merge_every:
+                wcounts = merge_counts([wcounts] + wpartials)
+                ccounts = merge_counts([ccounts] + cpartials)
+                wpartials, cpartials = [], []
+
+    wcounts = merge_counts([wcounts] + wpartials)
+    ccounts = merge_counts([ccounts] + cpartials)
+
+    if log is not None:
+        log("{:,} word and {:,} context candidates".format(
+            len(wcounts), len(ccounts)))
+
+    return sort_counts(wcounts), sort_counts(ccounts)
+
+
+def sort_counts(counts):
+    """ Sort counts most common first, breaking ties by key """
+
+    counts = counts.sort_index(kind='stable')
+    return counts.sort_values(ascending=False, kind='stable')
+
+
+def build_vocab(counts, min_count):
+    """ Map the keys with at least min_count occurrences to ids
+
+    Ids follow the order of the counts, most common first for counts from
+    count_vocab, so that the id of a key is also its line in a vocab file.
+
+    Returns:
+        vocab: dict of key to id
+    """
+
+    keys = counts.index[counts.values >= min_count]
+    return {key: i for i, key in enumerate(keys)}
+
+
+def save_vocab(fp, vocab):
+    """ Write a vocab, one key per line in id order """
+
+    with open(fp, 'w') as outfile:
+        for key in vocab:
+            outfile.write(key)
+            outfile.write('\n')
+
+
+def save_counts(fp, counts):
+    """ Save counts as a parquet file with 'key' and 'count' columns """
+
+    df = pd.DataFrame({'key': counts.index.astype(str), 'count': counts.values})
+    df.to_parquet(fp, engine='fastparquet')
+
+
+def load_counts(fp):
+    """ Load counts saved with save_counts as a Series indexed by key """
+
+    df = pd.read_parquet(fp, engine='fastparquet')
+    return pd.Series(df['count'].values, index=pd.Index(df['key']), name='count')
+
+
+class PairBuilder:
+    """ Maps triples to (word id, context id) pairs with integer joins
+
+    The context vocab is parsed once into (term, edge, direction) codes, and
+    each context is keyed by a single integer combining the three. A shard's
+    interned string table is looked up once, and the pairs themselves are
+    found with NumPy indexing on the triple codes and a sorted search over
+    the context keys.
+
+    Edges are assumed not to contain '/', as is the case for dependency
+    labels and the edges of the triple patterns.
+
+    Attributes:
+        words: Index of words, by word id
+        terms: Index of the terms that appear in contexts
+        edges: Index of the edges that appear in contexts
+    """
+
+    def __init__(self, wvocab, cvocab):
+
+        self.words = pd.Index(sorted(wvocab, key=wvocab.get))
+
+        contexts = pd.Series(sorted(cvocab, key=cvocab.get), dtype=object)
+        inverse = contexts.str.endswith('-1').values
+        contexts = contexts.where(~inverse, contexts.str[:-2])
+        parts = contexts.str.rsplit('/', n=1, expand=True).reindex(
+            columns=[0, 1])
+
+        term_ids, self.terms = pd.factorize(parts[0])
+        edge_ids, self.edges = pd.factorize(parts[1])
+
+        keys = self._context_keys(term_ids, edge_ids, inverse)
+        context_ids = np.arange(len(contexts))[(term_ids >= 0) & (edge_ids >= 0)]
+
+        order = np.argsort(keys[context_ids], kind='stable')
+        self._keys = keys[context_ids][order]
+        self._context_ids = context_ids[order]
+
+    def _context_keys(self, term_ids, edge_ids, inverse):
+        keys = term_ids.astype(np.int64) * len(self.edges) + edge_ids
+        return keys * 2 + inverse
+
+    def _context_ids_of(self, term_ids, edge_ids, inverse):
+        """ Look up context ids, -1 where a context is not in the vocab """
+
+        if len(self._keys) == 0:
+            return np.full(len(term_ids), -1, dtype=np.int64)
+
+        keys = self._context_keys(term_ids, edge_ids, inverse)
+        pos = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+
+        found = (term_ids >= 0) & (edge_ids >= 0) & (self._keys[pos] == keys)
+        return np.where(found, self._context_ids[pos], -1)
+
+    def pairs(self, triples):
+        """ Get the word-context pairs of a DataFrame of triples
+
+        Pairs are in the same order as building them triple by triple: for
+        each triple, (src, dst/path) then (dst, src/path-1), keeping only
+        pairs whose word and context are both in the vocabs.
+
+        Returns:
+            pairs: (N, 2) int32 array of (word id, context id)
+        """
+
+        strings, codes = intern_triples(triples)
+        src, path, dst = codes.T
+
+        # Missing values have code -1, which picks the appended -1
+        words = np.append(self.words.get_indexer(strings), -1)
+        terms = np.append(self.terms.get_indexer(strings), -1)
+        edges = np.append(self.edges.get_indexer(strings), -1)
+
+        src_contexts = self._context_ids_of(terms[dst], edges[path], False)
+        dst_contexts = self._context_ids_of(terms[src], edges[path], True)
+
+        pairs = np.stack(
+            [words[src], src_contexts, words[dst], dst_contexts], axis=1)
+        pairs = pairs.reshape(-1, 2)
+
+        return pairs[(pairs >= 0).all(axis=1)].astype(np.int32)
+
+
+_pair_builder = None
+
+
+def _init_pair_builder(builder):
+    global _pair_builder
+    _pair_builder = builder
+
+
+def _shard_pairs(fp):
+    return _pair_builder.pairs(read_triples(fp))
+
+
+def map_shard_pairs(triples_files, wvocab, cvocab, num_processes=None):
+    """ Map triples files to their pairs in a process pool
+
+    Yields:
+        pairs: (N, 2) int32 array of pairs for each file, in file order
+    """
+
+    builder = PairBuilder(wvocab, cvocab)
+
+    with Pool(
+            processes=num_processes or os.cpu_count(),
+            initializer=_init_pair_builder,
+            initargs=(builder,)) as pool:
+        yield from pool.imap(_shard_pairs, [str(fp) for fp in triples_files])
+
+
+def build_pairs(
+    triples_files,
+    wvocab,
+    cvocab,
+    pairs_file,
+    num_processes=None,
+    subsample=None,
+    wcounts=None,
+    ccounts=None,
+    log=None
+):
+    """ Build the word-context pairs of triples files into a pairs file
+
+    Shards are mapped to pairs in a process pool and written in order, in
+    bulk, as they come back.
+
+    Args:
+        triples_files: Paths to triples files
+        wvocab: dict of word to word id
+        cvocab: dict of context to context id
+        pairs_file: Path of the pairs file to write, overwritten
+        num_processes: Pool size, defaults to the number of cores
+        subsample: Optional subsampling threshold (see
+            pathvecs.pairs.subsample_pairs), applied to each shard
+        wcounts: Word counts by word id, required with subsample
+        ccounts: Context counts by context id, required with subsample
+        log: Optional callable, given progress messages
+
+    Returns:
+        num_pairs: The number of pairs written
+    """
+
+    if subsample is not None and (wcounts is None or ccounts is None):
+        raise ValueError("Subsampling pairs requires wcounts and ccounts.")
+
+    log_every = max(len(triples_files) // 10, 1)
+
+    with PairsWriter(pairs_file) as writer:
+
+        shard_pairs = map_shard_pairs(
+            triples_files, wvocab, cvocab, num_processes)
+
+        for num_done, pairs in enumerate(shard_pairs, start=1):
+
+            if subsample is not None:
+                pairs = subsample_pairs(
+                    pairs, wcounts, ccounts, subsample, seed=num_done)
+
+            writer.write(pairs)
+
+            if log is not None and num_done % log_every == 0:
+                log("{}/{} shards  {:,} pairs".format(
+                    num_done, len(triples_files), writer.num_pairs))
+
+        return writer.num_pairs
+
+
+def load_vocab(fp):
+    """ Load a vocab file, one entry per line, as a map to line indices """
+
+    vocab = {}
+    with open(fp) as infile:
+        for i, line in enumerate(infile):
+            vocab[line.strip()] = i
+
+    return vocab
+
+
+def extend_vocab(vocab, counts, min_count):
+    """ Append the keys with at least min_count occurrences to a vocab
+
+    Keys already in the vocab keep their ids, and new keys get the next ids
+    in the order of the counts.
+
+    Returns:
+        vocab: A new dict of key to id
+    """
+
+    keys = counts.index[counts.values >= min_count]
+    new_keys = keys[~keys.isin(list(vocab))]
+
+    vocab = dict(vocab)
+    for key in new_keys:
+        vocab[key] = len(vocab)
+
+    return vocab
+
+
+MANIFEST = 'manifest.json'
+
+
+def load_manifest(output):
+    """ Load the manifest of an incrementally built vocab folder
+
+    Returns:
+        manifest: dict with the min_count, the generation of the total
+            counts, the number of pairs written, and a record per triples
+            file processed so far. Empty for a new folder.
+    """
+
+    fp = Path(output).joinpath(MANIFEST)
+    if not fp.exists():
+        return {'min_count': None, 'generation': 0, 'num_pairs': 0, 'shards': {}}
+
+    with open(fp) as infile:
+        return json.load(infile)
+
+
+def save_manifest(output, manifest):
+    """ Atomically replace the manifest of a vocab folder """
+
+    fp = Path(output).joinpath(MANIFEST)
+    tmp_fp = fp.with_suffix('.tmp')
+    with open(tmp_fp, 'w') as outfile:
+        json.dump(manifest, outfile, indent=1)
+    os.replace(tmp_fp, fp)
+
+
+def update_vocab(
+    triples_files,
+    output,
+    pairs_file,
+    min_count=100,
+    num_processes=None,
+    log=None
+):
+    """ Update vocabs, counts and pairs with triples files not seen before
+
+    The work done is proportional to the new triples files: only they are
+    counted and have their pairs appended to the pairs file. Their counts are
+    merged into the totals of the previous update, which are kept as
+    output/wcounts-<generation>.df and ccounts-<generation>.df. Vocab ids are
+    stable, new words and contexts which reach min_count are appended to the
+    end of the vocabs.
+
+    Pairs already written are not revisited, so keys that only reach
+    min_count with the new files get pairs from the new files alone.
+
+    Everything is recorded in output/manifest.json, which is replaced last,
+    so an interrupted update is simply redone by running it again.
+
+    Args:
+        triples_files: Paths to all triples files, processed or not
+        output: Folder for the vocabs, counts and manifest
+        pairs_file: Path of the pairs file to append to
+        min_count: Required instances for a key to be in a vocab, which
+            must be the same for every update
+        num_processes: Pool size, defaults to the number of cores
+        log: Optional callable, given progress messages
+
+    Returns:
+        new_files: The triples files processed by this update
+    """
+
+    output = Path(output)
+    os.makedirs(output, exist_ok=True)
+
+    manifest = load_manifest(output)
+    if manifest['min_count'] not in (None, min_count):
+        raise ValueError(
+            "'{}' was built with min_count {}, not {}.".format(
+                output, manifest['min_count'], min_count))
+
+    new_files = []
+    for fp in triples_files:
+        shard = manifest['shards'].get(Path(fp).name)
+        if shard is None:
+            new_files.append(fp)
+        elif shard['size'] != os.path.getsize(fp):
+            raise ValueError(
+                "Triples file '{}' changed after it was processed, rebuild "
+                "the vocab from scratch.".format(fp))
+
+    if not new_files:
+        return []
+
+    # Count the new files on top of the previous totals
+    generation = manifest['generation']
+    if generation:
+        wpartials = [load_counts(output.joinpath(
+            'wcounts-{}.df'.format(generation)))]
+        cpartials = [load_counts(output.joinpath(
+            'ccounts-{}.df'.format(generation)))]
+    else:
+        wpartials, cpartials = [], []
+
+    with Pool(processes=num_processes or os.cpu_count()) as pool:
+        shard_counts = pool.imap(count_shard, [str(fp) for fp in new_files])
+
+        for shard_wcounts, shard_ccounts in shard_counts:
+            wpartials.append(shard_wcounts)
+            cpartials.append(shard_ccounts)
+
+    wcounts = sort_counts(merge_counts(wpartials))
+    ccounts = sort_counts(merge_counts(cpartials))
+
+    # Extend the vocabs, keeping the ids of existing entries
+    wvocab_fp = output.joinpath('wvocab.txt')
+    cvocab_fp = output.joinpath('cvocab.txt')
+    wvocab = load_vocab(wvocab_fp) if generation else {}
+    cvocab = load_vocab(cvocab_fp) if generation else {}
+
+    num_words, num_contexts = len(wvocab), len(cvocab)
+    wvocab = extend_vocab(wvocab, wcounts, min_count)
+    cvocab = extend_vocab(cvocab, ccounts, min_count)
+    save_vocab(wvocab_fp, wvocab)
+    save_vocab(cvocab_fp, cvocab)
+
+    # Append the pairs of the new files, past any left by an interrupted update
+    shards = dict(manifest['shards'])
+    with PairsWriter(pairs_file, append=True) as writer:
+        writer.truncate(manifest['num_pairs'])
+
+        shard_pairs = map_shard_pairs(new_files, wvocab, cvocab, num_processes)
+        for fp, pairs in zip(new_files, shard_pairs):
+            writer.write(pairs)
+            shards[Path(fp).name] = {
+                'size': os.path.getsize(fp),
+                'num_pairs': len(pairs)
+            }
+
+        num_pairs = writer.num_pairs
+
+    save_counts(output.joinpath('wcounts-{}.df'.format(generation + 1)), wcounts)
+    save_counts(output.joinpath('ccounts-{}.df'.format(generation + 1)), ccounts)
+
+    save_manifest(output, {
+        'min_count': min_count,
+        'generation': generation + 1,
+        'num_pairs': num_pairs,
+        'shards': shards
+    })
+
+    for prefix in ['wcounts', 'ccounts']:
+        old_fp = output.joinpath('{}-{}.df'.format(prefix, generation))
+        if old_fp.exists():
+            os.remove(old_fp)
+
+    if log is not None:
+        log("{} new shards  wvocab +{:,}  cvocab +{:,}  {:,} pairs".format(
+            len(new_files), len(wvocab) - num_words,
+            len(cvocab) - num_contexts, num_pairs))
+
+    return new_files
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Count word and context vocabularies over triples files.")
+    parser.add_argument('--triples', required=True,
+        help="folder of triples files")
+    parser.add_argument('--output', required=True,
+        help="folder for wvocab.txt, cvocab.txt and the full counts")
+    parser.add_argument('--min-count', type=int, default=100,
+        help="required instances for a word or context to be in a vocab")
+    parser.add_argument('--processes', type=int, default=None,
+        help="worker processes, defaults to the number of cores")
+    parser.add_argument('--merge-every', type=int, default=64,
+        help="partial shard counts to hold before merging them")
+    parser.add_argument('--pairs', default=None,
+        help="also build the word-context pairs into this pairs file")
+    parser.add_argument('--subsample', type=float, default=None,
+        help="subsampling threshold for the pairs, e.g. 1e-5")
+    parser.add_argument('--incremental', action='store_true',
+        help="only process triples files not already in the output manifest")
+    parser.add_argument('--approximate', action='store_true',
+        help="find frequent keys with Count-Min sketches, then recount them "
+            "exactly. Saved counts only cover the candidate keys")
+    parser.add_argument('--sketch-width', type=int, default=None,
+        help="counters per sketch row, sized from the number of triples by default")
+    parser.add_argument('--sketch-depth', type=int, default=4)
+    parser.add_argument('--sketch-error', type=float, default=0.5,
+        help="largest sketch overshoot the width is sized for, as a fraction "
+            "of --min-count")
+    args = parser.parse_args()
+
+    if args.incremental and args.approximate:
+        parser.error("--incremental keeps full counts, it cannot be --approximate")
+
+    triples_files = list_triples_files(args.triples)
+
+    if args.incremental:
+        if args.pairs is None or args.subsample is not None:
+            parser.error("--incremental requires --pairs, without --subsample")
+
+        os.makedirs(Path(args.pairs).parent, exist_ok=True)
+        update_vocab(
+            triples_files,
+            args.output,
+            args.pairs,
+            min_count=args.min_count,
+            num_processes=args.processes,
+            log=print
+        )
+        return
+    if args.approximate:
+        wcounts, ccounts = count_frequent(
+            triples_files,
+            args.min_count,
+            width=args.sketch_width,
+            depth=args.sketch_depth,
+            error=args.sketch_error,
+            num_processes=args.processes,
+            merge_every=args.merge_every,
+            log=print
+        )
+    else:
+        wcounts, ccounts = count_vocab(
+            triples_files,
+            num_processes=args.processes,
+            merge_every=args.merge_every,
+            log=print
+        )
+
+    wvocab = build_vocab(wcounts, args.min_count)
+    cvocab = build_vocab(ccounts, args.min_count)
+
+    output = Path(args.output)
+    os.makedirs(output, exist_ok=True)
+    save_vocab(output.joinpath('wvocab.txt'), wvocab)
+    save_vocab(output.joinpath('cvocab.txt'), cvocab)
+    save_counts(output.joinpath('wcounts.df'), wcounts)
+    save_counts(output.joinpath('ccounts.df'), ccounts)
+
+    print("wvocab {:,} / {:,}  cvocab {:,} / {:,}".format(
+        len(wvocab), len(wcounts), len(cvocab), len(ccounts)))
+
+    if args.pairs is not None:
+        os.makedirs(Path(args.pairs).parent, exist_ok=True)
+        num_pairs = build_pairs(
+            triples_files,
+            wvocab,
+            cvocab,
+            args.pairs,
+            num_processes=args.processes,
+            subsample=args.subsample,
+            wcounts=wcounts.values[:len(wvocab)],
+            ccounts=ccounts.values[:len(cvocab)],
+            log=print
+        )
+        print("{:,} pairs".format(num_pairs))
+
+
+if __name__ == '__main__':
+    main()
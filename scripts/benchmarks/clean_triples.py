@@ -0,0 +1,94 @@
+""" Benchmark cleaning interned triples against the row-wise DataFrame filters.
+
+Builds a shard of Zipfian lemma triples with a sprinkling of the strings the
+filters exist for (non-ASCII lemmas, whitespace, newlines and wiki markup),
+then cleans and normalizes it both ways and checks the results agree.
+
+Usage:
+
+    python scripts/benchmarks/clean_triples.py --num-triples 1000000
+"""
+from pathlib import Path
+import argparse
+import time
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.triples import clean_triples, intern_tuples
+
+
+NOISE = ['été', '東京', ' ', '\n', 'style=', 'los angeles', '']
+
+
+def clean_triples_df(df):
+    """ The filters and normalization of earlier versions of 1_triples """
+
+    df = df[df.apply(lambda col: col.str.encode('ascii', errors='ignore').str.decode('utf-8')).all(axis=1)]
+    df = df[df.apply(lambda col: ~col.str.isspace()).all(axis=1)]
+    df = df[df.apply(lambda col: ~col.str.contains('\n')).all(axis=1)]
+    df = df[df.apply(lambda col: ~col.str.contains('=')).all(axis=1)]
+
+    df['src'] = df['src'].str.replace(' ', '_')
+    df['dst'] = df['dst'].str.replace(' ', '_')
+
+    return df
+
+
+def synthetic_tuples(args, rng):
+    """ (src, path, dst) tuples as collected from a shard of docs """
+
+    terms = np.array(
+        ['lemma_{}'.format(i) for i in range(args.num_terms)] + NOISE, dtype=object)
+    edges = np.array(['edge_{}'.format(i) for i in range(args.num_edges)], dtype=object)
+
+    def sample_terms():
+        indices = (rng.zipf(1.2, args.num_triples) - 1) % args.num_terms
+        noisy = rng.random(args.num_triples) < args.noise
+        indices[noisy] = args.num_terms + rng.integers(0, len(NOISE), noisy.sum())
+        return terms[indices]
+
+    src = sample_terms()
+    path = edges[rng.integers(0, args.num_edges, args.num_triples)]
+    dst = sample_terms()
+
+    return list(zip(src, path, dst))
+
+
+def timed(f, *args):
+    start = time.perf_counter()
+    result = f(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--num-triples', type=int, default=1_000_000)
+    parser.add_argument('--num-terms', type=int, default=200_000)
+    parser.add_argument('--num-edges', type=int, default=40)
+    parser.add_argument('--noise', type=float, default=0.01,
+        help="fraction of terms drawn from the noisy strings")
+    args = parser.parse_args()
+
+    tuples = synthetic_tuples(args, np.random.default_rng(0))
+
+    df, df_time = timed(
+        lambda t: clean_triples_df(pd.DataFrame(t, columns=['src', 'path', 'dst'])),
+        tuples)
+    (strings, codes), interned_time = timed(
+        lambda t: clean_triples(*intern_tuples(t)), tuples)
+
+    assert np.array_equal(strings.values[codes], df.values)
+
+    print("{:,} triples, {:,} kept".format(len(tuples), len(codes)))
+    print("{:<12} {:>10}".format('method', 'seconds'))
+    print("{:<12} {:>10.3f}".format('dataframe', df_time))
+    print("{:<12} {:>10.3f}".format('interned', interned_time))
+    print("speedup {:.1f}x".format(df_time / interned_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+""" Benchmark the combined pathvecs_matchers component against the chained matchers.
+
+Uses the docs of a parsed DocBin if one is given, or else parses a set of
+example sentences with a spaCy model. Every doc is matched by the five
+chained matcher components and by the single combined component, and the
+docs/sec of each is reported, for all families and for just those triple
+extraction needs.
+
+Usage:
+
+    python scripts/benchmarks/combined_matchers.py --parse-file data/parses/X/000000.spacy
+"""
+from pathlib import Path
+import argparse
+import time
+import sys
+
+from spacy.tokens import Doc
+import spacy
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.matchers import COMBINED_PIPE, MATCHER_PIPES, load_matchers_nlp, match
+from pathvecs.parses import read_docs
+from pathvecs.pipeline.triples import TRIPLE_FAMILIES
+
+
+SENTENCES = [
+    "Alice, who is the queen of Antarctica, ate some of the cakes.",
+    "Bob was born on June 16, 2022 in a small town near the coast.",
+    "The big red dog that Bob adopted barked at the mail carrier.",
+    "In his December 2002 interview, Bob claimed that the company went to court.",
+    "Most of the students and teachers at the school walked to the museum of art.",
+]
+
+
+def load_docs(args):
+    """ Docs to match, and the vocab they were read or parsed with """
+
+    if args.parse_file:
+        vocab = spacy.blank('en').vocab
+        return list(read_docs(args.parse_file, vocab)), vocab
+
+    nlp = spacy.load(args.model, exclude=['ner'])
+    docs = list(nlp.pipe(SENTENCES * (args.num_docs // len(SENTENCES))))
+    return docs, nlp.vocab
+
+
+def docs_per_sec(nlp, docs, repeats):
+    """ Match fresh copies of the docs, keeping the fastest run """
+
+    doc_bytes = [doc.to_bytes() for doc in docs]
+
+    best = None
+    for _ in range(repeats):
+        copies = [Doc(nlp.vocab).from_bytes(b) for b in doc_bytes]
+
+        start = time.perf_counter()
+        for doc in copies:
+            match(doc, nlp)
+        seconds = time.perf_counter() - start
+
+        best = seconds if best is None else min(best, seconds)
+
+    return len(docs) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--parse-file', default=None)
+    parser.add_argument('--model', default='en_core_web_sm')
+    parser.add_argument('--num-docs', type=int, default=2000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    docs, vocab = load_docs(args)
+
+    # Every pipeline shares the docs' vocab
+    setups = [
+        ('chained, all', load_matchers_nlp(pipes=MATCHER_PIPES, vocab=vocab)),
+        ('combined, all', load_matchers_nlp(pipes=[COMBINED_PIPE], vocab=vocab)),
+        ('chained, triples', load_matchers_nlp(
+            pipes=['map_relative_pronouns', 'triple_matcher'], vocab=vocab)),
+        ('combined, triples', load_matchers_nlp(
+            pipes=[COMBINED_PIPE], families=TRIPLE_FAMILIES, vocab=vocab)),
+    ]
+
+    print("{:,} docs, {:,} tokens".format(len(docs), sum(len(doc) for doc in docs)))
+    print("{:<20} {:>10}".format('matchers', 'docs/s'))
+    for name, nlp in setups:
+        print("{:<20} {:>10,.0f}".format(name, docs_per_sec(nlp, docs, args.repeats)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+""" Benchmark compact triple arrays against lists of Token-holding Triples.
+
+Uses the docs of a parsed DocBin if one is given, or else parses a set of
+example sentences with a spaCy model. Every doc is matched by the triples
+families of the combined component with lists of Triples and with compact
+arrays, then its string triples are collected with matcher_triples. The
+docs/sec of each, and the memory still allocated for the matched docs'
+triples afterwards, are reported.
+
+Usage:
+
+    python scripts/benchmarks/compact_triples.py --parse-file data/parses/X/000000.spacy
+"""
+from pathlib import Path
+import tracemalloc
+import argparse
+import time
+import gc
+import sys
+
+from spacy.tokens import Doc
+import spacy
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.matchers import COMBINED_PIPE, load_matchers_nlp, match
+from pathvecs.parses import read_docs
+from pathvecs.pipeline.triples import TRIPLE_FAMILIES, matcher_triples
+
+
+SENTENCES = [
+    "Alice, who is the queen of Antarctica, ate some of the cakes.",
+    "Bob and Carol walked to the museum of art and the park by the river.",
+    "The company, which was founded in 1990, moved to a city in the north.",
+    "In his interview, Bob said that the band went on a tour of Europe.",
+    "Most of the students and teachers at the school were friends with Dan.",
+]
+
+
+def load_docs(args):
+    """ Docs to match, and the vocab they were read or parsed with """
+
+    if args.parse_file:
+        vocab = spacy.blank('en').vocab
+        return list(read_docs(args.parse_file, vocab)), vocab
+
+    nlp = spacy.load(args.model, exclude=['ner'])
+    docs = list(nlp.pipe(SENTENCES * (args.num_docs // len(SENTENCES))))
+    return docs, nlp.vocab
+
+
+def run(nlp, doc_bytes, repeats):
+    """ Match and collect triples from fresh copies of the docs
+
+    Returns:
+        docs_per_sec: Of the fastest run
+        retained_mb: Memory allocated by matching that the docs still hold
+    """
+
+    best = None
+    for _ in range(repeats):
+        copies = [Doc(nlp.vocab).from_bytes(b) for b in doc_bytes]
+
+        start = time.perf_counter()
+        for doc in copies:
+            matcher_triples(match(doc, nlp))
+        seconds = time.perf_counter() - start
+
+        best = seconds if best is None else min(best, seconds)
+
+    copies = [Doc(nlp.vocab).from_bytes(b) for b in doc_bytes]
+    gc.collect()
+    tracemalloc.start()
+    for doc in copies:
+        match(doc, nlp)
+    gc.collect()
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(doc_bytes) / best, retained / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--parse-file', default=None)
+    parser.add_argument('--model', default='en_core_web_sm')
+    parser.add_argument('--num-docs', type=int, default=2000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    docs, vocab = load_docs(args)
+    doc_bytes = [doc.to_bytes() for doc in docs]
+
+    print("{:<12} {:>10} {:>12}".format('triples', 'docs/sec', 'retained MB'))
+    for name, compact in [('list', False), ('compact', True)]:
+        nlp = load_matchers_nlp(
+            pipes=[COMBINED_PIPE], families=TRIPLE_FAMILIES, vocab=vocab, compact=compact)
+        rate, retained = run(nlp, doc_bytes, args.repeats)
+        print("{:<12} {:>10,.0f} {:>12.1f}".format(name, rate, retained))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+""" Measure DataLoader worker startup time and memory against worker count.
+
+For each worker count, a DataLoader over a WordContextDataset is started and
+the time to the first batch is recorded. After a number of shuffled batches
+the memory of each worker is read from /proc (linux only):
+
+    rss: resident set size, counts shared pages in every worker
+    pss: proportional set size, shared pages split between their users
+    uss: unique set size, pages private to the worker
+
+With --share-memory the dataset tensors are moved to shared memory up front,
+which should keep the per-worker uss flat as workers are added.
+
+Usage:
+
+    python scripts/benchmarks/dataloader_workers.py --share-memory
+    python scripts/benchmarks/dataloader_workers.py --start-method spawn
+"""
+from pathlib import Path
+import argparse
+import time
+import sys
+import os
+
+import torch
+from torch.utils.data import DataLoader
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.pytorch import WordContextDataset, collate_batch
+
+
+def read_memory(pid):
+    """ Get the rss, pss and uss of a process in MB """
+
+    fields = {}
+    with open('/proc/{}/smaps_rollup'.format(pid)) as infile:
+        for line in infile:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+
+    uss = fields['Private_Clean'] + fields['Private_Dirty']
+    return fields['Rss'], fields['Pss'], uss
+
+
+def measure(dataset, num_workers, args):
+    """ Get the startup time and per-worker memory for a worker count """
+
+    dataloader = DataLoader(
+        dataset,
+        batch_size=args.batch_size,
+        shuffle=True,
+        collate_fn=collate_batch,
+        num_workers=num_workers,
+        multiprocessing_context=args.start_method
+    )
+
+    start = time.perf_counter()
+    batches = iter(dataloader)
+    next(batches)
+    startup_s = time.perf_counter() - start
+
+    for _ in range(args.num_batches):
+        next(batches)
+
+    # pylint: disable=protected-access
+    memory = [read_memory(w.pid) for w in batches._workers]
+    del batches
+
+    return startup_s, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--num-pairs', type=int, default=50_000_000)
+    parser.add_argument('--cvocab-size', type=int, default=200_000)
+    parser.add_argument('--batch-size', type=int, default=2048)
+    parser.add_argument('--negative-samples', type=int, default=10)
+    parser.add_argument('--sampler', choices=['table', 'cdf'], default='table')
+    parser.add_argument('--num-batches', type=int, default=50)
+    parser.add_argument('--share-memory', action='store_true')
+    parser.add_argument(
+        '--start-method', choices=['fork', 'spawn', 'forkserver'],
+        default='fork')
+    parser.add_argument(
+        '--workers', type=int, nargs='+',
+        default=sorted({1, 2, 4, os.cpu_count()}))
+    args = parser.parse_args()
+
+    pairs = torch.randint(0, args.cvocab_size, (args.num_pairs, 2))
+    dataset = WordContextDataset(
+        pairs,
+        negative_samples=args.negative_samples,
+        sampler=args.sampler
+    )
+
+    if args.share_memory:
+        dataset.share_memory()
+
+    print("{} pairs, {} sampler, share_memory={}, start method {}".format(
+        args.num_pairs, args.sampler, args.share_memory, args.start_method))
+    print("main process rss {:.0f} MB".format(read_memory(os.getpid())[0]))
+    print("{:>8} {:>10} {:>14} {:>14} {:>14}".format(
+        'workers', 'startup s', 'rss MB/worker', 'pss MB/worker',
+        'uss MB/worker'))
+
+    for num_workers in args.workers:
+        startup_s, memory = measure(dataset, num_workers, args)
+        rss, pss, uss = [sum(m) / len(memory) for m in zip(*memory)]
+        print("{:>8} {:>10.2f} {:>14.0f} {:>14.0f} {:>14.0f}".format(
+            num_workers, startup_s, rss, pss, uss))
+
+
+if __name__ == '__main__':
+    main()
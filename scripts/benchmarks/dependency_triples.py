@@ -0,0 +1,95 @@
+""" Benchmark dependency triple extraction from Doc arrays against the Token loop.
+
+Uses the docs of a parsed DocBin if one is given, or else synthetic docs with
+random dependency trees, runs the relative pronoun and triple matchers over
+them, and then times extracting their 1-hop dependency triples both ways.
+
+Usage:
+
+    python scripts/benchmarks/dependency_triples.py --parse-file data/parses/X/0000.spacy
+"""
+from pathlib import Path
+import argparse
+import time
+import sys
+
+import numpy as np
+from spacy.tokens import Doc, DocBin
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.matchers import match
+from pathvecs.pipeline.triples import (
+    dependency_hash_triples,
+    dependency_triples,
+    intern_hash_triples,
+    load_triples_nlp
+)
+
+
+DEPS = ['nsubj', 'dobj', 'amod', 'compound', 'prep', 'pobj', 'det', 'punct', 'advmod', 'conj']
+
+
+def synthetic_docs(vocab, args, rng):
+    """ Docs of random words, each token headed by an earlier one """
+
+    words = ['Word{}'.format(i) for i in range(args.num_words)]
+    docs = []
+    for _ in range(args.num_docs):
+        heads = [0] + [int(rng.integers(0, i)) for i in range(1, args.doc_length)]
+        doc_words = [words[i] for i in rng.integers(0, args.num_words, args.doc_length)]
+        docs.append(Doc(
+            vocab,
+            words=doc_words,
+            lemmas=[word.lower() for word in doc_words],
+            heads=heads,
+            deps=['ROOT'] + [DEPS[i] for i in rng.integers(0, len(DEPS), args.doc_length - 1)]
+        ))
+
+    return docs
+
+
+def timed(f, docs):
+    start = time.perf_counter()
+    result = [f(doc) for doc in docs]
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--parse-file', default=None)
+    parser.add_argument('--num-docs', type=int, default=1000)
+    parser.add_argument('--doc-length', type=int, default=500)
+    parser.add_argument('--num-words', type=int, default=20_000)
+    args = parser.parse_args()
+
+    nlp = load_triples_nlp()
+
+    if args.parse_file:
+        docs = list(DocBin().from_disk(args.parse_file).get_docs(nlp.vocab))
+    else:
+        docs = synthetic_docs(nlp.vocab, args, np.random.default_rng(0))
+
+    docs = [match(doc, nlp) for doc in docs]
+    num_tokens = sum(len(doc) for doc in docs)
+
+    loop_triples, loop_time = timed(dependency_triples, docs)
+    hashes, array_time = timed(dependency_hash_triples, docs)
+
+    start = time.perf_counter()
+    strings, codes = intern_hash_triples(np.concatenate(hashes), nlp.vocab.strings)
+    array_time += time.perf_counter() - start
+
+    loop_triples = [triple for triples in loop_triples for triple in triples]
+    assert [tuple(triple) for triple in strings.values[codes].tolist()] == loop_triples
+
+    print("{:,} docs, {:,} tokens, {:,} triples".format(
+        len(docs), num_tokens, len(loop_triples)))
+    print("{:<8} {:>10} {:>14}".format('method', 'seconds', 'tokens/s'))
+    print("{:<8} {:>10.3f} {:>14,.0f}".format('loop', loop_time, num_tokens / loop_time))
+    print("{:<8} {:>10.3f} {:>14,.0f}".format('arrays', array_time, num_tokens / array_time))
+    print("speedup {:.1f}x".format(loop_time / array_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+""" Benchmark hogwild training throughput and quality against core count.
+
+Trains on synthetic pairs with planted clusters: every word belongs to a
+cluster, and mostly co-occurs with contexts of its own cluster. Quality is
+the neighbor precision, the fraction of each word's nearest neighbors that
+share its cluster, which should hold steady as processes are added while
+pairs/s scales up.
+
+Usage:
+
+    python scripts/benchmarks/hogwild_scaling.py --processes 1 2 4 8
+"""
+from pathlib import Path
+import argparse
+import sys
+import os
+
+import torch
+import torch.nn.functional as F
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.pytorch import SkipGramModel, train_hogwild
+
+
+def clustered_pairs(args, generator):
+    """ Pairs where words take contexts from their own cluster, plus noise """
+
+    words = torch.randint(0, args.num_clusters * args.cluster_size,
+        (args.num_pairs,), generator=generator)
+    clusters = words // args.cluster_size
+
+    contexts = clusters * args.cluster_contexts + torch.randint(
+        0, args.cluster_contexts, (args.num_pairs,), generator=generator)
+
+    noise = torch.rand(args.num_pairs, generator=generator) < args.noise
+    contexts[noise] = torch.randint(
+        0, args.num_clusters * args.cluster_contexts, (int(noise.sum()),),
+        generator=generator)
+
+    return torch.stack([words, contexts], dim=1)
+
+
+def neighbor_precision(model, cluster_size, k=5):
+    """ Fraction of the k nearest neighbors of each word in its cluster """
+
+    with torch.no_grad():
+        emb = F.normalize(model.w_embeddings.weight, dim=1)
+        sims = emb @ emb.T
+        sims.fill_diagonal_(-2)
+        neighbors = sims.topk(k, dim=1).indices
+
+    clusters = torch.arange(len(emb)) // cluster_size
+    same = clusters[neighbors] == clusters.unsqueeze(1)
+    return same.float().mean().item()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--processes', type=int, nargs='+',
+        default=sorted({1, 2, 4, os.cpu_count()}))
+    parser.add_argument('--num-pairs', type=int, default=5_000_000)
+    parser.add_argument('--num-clusters', type=int, default=100)
+    parser.add_argument('--cluster-size', type=int, default=50)
+    parser.add_argument('--cluster-contexts', type=int, default=100)
+    parser.add_argument('--noise', type=float, default=0.2)
+    parser.add_argument('--emb-dim', type=int, default=100)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--negative-samples', type=int, default=5)
+    args = parser.parse_args()
+
+    generator = torch.Generator().manual_seed(0)
+    pairs = clustered_pairs(args, generator)
+
+    num_words = args.num_clusters * args.cluster_size
+    num_contexts = args.num_clusters * args.cluster_contexts
+    wvocab = {str(i): i for i in range(num_words)}
+    cvocab = {str(i): i for i in range(num_contexts)}
+
+    print("{:>10} {:>14} {:>10} {:>12}".format(
+        'processes', 'pairs/s', 'speedup', 'precision@5'))
+
+    baseline = None
+    for num_processes in args.processes:
+        torch.manual_seed(0)
+        model = SkipGramModel(wvocab, cvocab, emb_dim=args.emb_dim)
+
+        pairs_per_sec = train_hogwild(
+            model,
+            pairs.clone(),
+            num_processes=num_processes,
+            batch_size=args.batch_size,
+            negative_samples=args.negative_samples,
+            log=lambda message: None
+        )
+        baseline = baseline or pairs_per_sec / num_processes
+
+        print("{:>10} {:>14,.0f} {:>9.2f}x {:>12.3f}".format(
+            num_processes,
+            pairs_per_sec,
+            pairs_per_sec / baseline,
+            neighbor_precision(model, args.cluster_size)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+""" Benchmark matcher component construction with and without the matcher cache.
+
+Each matcher component is constructed repeatedly on one Vocab, as the test
+suite and the pool workers do. A cold construction clears the cache first,
+so its patterns are compiled again as they were before the cache, and a warm
+one reuses the matchers compiled by the first. Both are timed with the
+patterns validated, and without.
+
+To compare test-suite wall time, run `python -m pytest -q pathvecs/tests`
+on this commit and on its parent.
+
+Usage:
+
+    python scripts/benchmarks/matcher_construction.py --repeats 20
+"""
+from pathlib import Path
+import argparse
+import time
+import sys
+
+from spacy.language import Language
+import spacy
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.matchers import (
+    ModifierSpanMatcher,
+    NominalSpanMatcher,
+    PathvecsMatchers,
+    QuantifiedObjectMatcher,
+    RelativePronounMatcher,
+    TripleMatcher
+)
+from pathvecs.matchers.registry import clear_matchers
+
+
+COMPONENTS = {
+    'map_quantifiers': QuantifiedObjectMatcher,
+    'map_relative_pronouns': RelativePronounMatcher,
+    'nominal_spans': NominalSpanMatcher,
+    'modifier_spans': ModifierSpanMatcher,
+    'triple_matcher': TripleMatcher,
+    'pathvecs_matchers': PathvecsMatchers,
+}
+
+
+def time_construction(component, nlp, repeats, validate, cold):
+    """ Mean seconds to construct a component """
+
+    component(nlp, validate=validate)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        if cold:
+            clear_matchers(nlp.vocab)
+        component(nlp, validate=validate)
+
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--lang', default='en')
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    nlp = Language(spacy.blank(args.lang).vocab)
+
+    print("{:<22} {:>12} {:>12} {:>12} {:>12}".format(
+        'component', 'cold ms', 'cold, no val', 'warm ms', 'speedup'))
+
+    for name, component in COMPONENTS.items():
+        cold = time_construction(component, nlp, args.repeats, True, cold=True)
+        unvalidated = time_construction(component, nlp, args.repeats, False, cold=True)
+        warm = time_construction(component, nlp, args.repeats, True, cold=False)
+
+        print("{:<22} {:>12.2f} {:>12.2f} {:>12.3f} {:>11.0f}x".format(
+            name, cold * 1e3, unvalidated * 1e3, warm * 1e3, cold / warm))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+""" Benchmark per-item against batched negative sampling.
+
+Compares drawing a batch through WordContextDataset.__getitem__ (one sampler
+iteration per pair) with WordContextDataset.__getitems__ (one (B x N) block
+per batch) on synthetic zipfian pairs data, and reports the build time and
+size of the selected negative sampler.
+
+Usage:
+
+    python scripts/benchmarks/negative_sampling.py --batch-size 2048
+    python scripts/benchmarks/negative_sampling.py --sampler cdf
+"""
+from pathlib import Path
+import argparse
+import time
+import sys
+
+import torch
+from torch.utils.data.dataloader import default_collate
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.pytorch import WordContextDataset
+
+
+def zipf_pairs(num_pairs, wvocab_size, cvocab_size, generator):
+    """ Synthetic word-context pairs with zipf-like frequencies """
+
+    wweights = 1.0 / torch.arange(1, wvocab_size + 1, dtype=torch.float64)
+    cweights = 1.0 / torch.arange(1, cvocab_size + 1, dtype=torch.float64)
+
+    words = torch.multinomial(wweights, num_pairs, True, generator=generator)
+    contexts = torch.multinomial(cweights, num_pairs, True, generator=generator)
+    return torch.stack([words, contexts], dim=1)
+
+
+def time_batches(get_batch, num_batches):
+    start = time.perf_counter()
+    for _ in range(num_batches):
+        get_batch()
+    return (time.perf_counter() - start) / num_batches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--num-pairs', type=int, default=1_000_000)
+    parser.add_argument('--wvocab-size', type=int, default=50_000)
+    parser.add_argument('--cvocab-size', type=int, default=200_000)
+    parser.add_argument('--batch-size', type=int, default=2048)
+    parser.add_argument('--negative-samples', type=int, default=10)
+    parser.add_argument('--sampler', choices=['table', 'cdf'], default='table')
+    parser.add_argument('--table-size', type=float, default=1e8)
+    parser.add_argument('--num-batches', type=int, default=20)
+    args = parser.parse_args()
+
+    generator = torch.Generator().manual_seed(0)
+    pairs = zipf_pairs(
+        args.num_pairs, args.wvocab_size, args.cvocab_size, generator)
+
+    start = time.perf_counter()
+    dataset = WordContextDataset(
+        pairs,
+        negative_samples=args.negative_samples,
+        sampler=args.sampler,
+        table_size=args.table_size
+    )
+    build_s = time.perf_counter() - start
+
+    sampler = dataset.negative_sampler
+    if args.sampler == 'table':
+        sampler_tensor = sampler.unigram_table
+    else:
+        sampler_tensor = sampler.cdf
+    sampler_mb = sampler_tensor.element_size() * sampler_tensor.numel() / 2**20
+
+    indices = torch.randperm(args.num_pairs, generator=generator)
+    batch_indices = indices[:args.batch_size].tolist()
+
+    def per_item():
+        items = [dataset[i] for i in batch_indices]
+        return default_collate(items)
+
+    def batched():
+        return dataset.__getitems__(batch_indices)
+
+    per_item_s = time_batches(per_item, args.num_batches)
+    batched_s = time_batches(batched, args.num_batches)
+
+    print("{} sampler: built in {:.3f} s, {:,.1f} MB".format(
+        args.sampler, build_s, sampler_mb))
+    print("batch size {:,}, {} negatives".format(
+        args.batch_size, args.negative_samples))
+    print("{:<10} {:>10.3f} ms/batch {:>14,.0f} pairs/s".format(
+        'per-item', per_item_s * 1e3, args.batch_size / per_item_s))
+    print("{:<10} {:>10.3f} ms/batch {:>14,.0f} pairs/s".format(
+        'batched', batched_s * 1e3, args.batch_size / batched_s))
+    print("speedup: {:.1f}x".format(per_item_s / batched_s))
+
+
+if __name__ == '__main__':
+    main()
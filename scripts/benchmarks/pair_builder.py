@@ -0,0 +1,106 @@
+""" Benchmark building word-context pairs from a triples shard.
+
+Compares the row by row loop from 2_vocabs, which concatenates context
+strings and looks them up in dicts, with PairBuilder's integer joins, on a
+synthetic shard with Zipfian terms. Reading the interned shard is timed as
+well, as the I/O floor that pair building should approach.
+
+Usage:
+
+    python scripts/benchmarks/pair_builder.py --num-triples 1000000
+"""
+from pathlib import Path
+import tempfile
+import argparse
+import time
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.triples import read_triples, write_triples
+from pathvecs.vocab import PairBuilder, count_triples, build_vocab
+
+
+def synthetic_triples(args, rng):
+    """ Triples with Zipfian src and dst terms over a fixed set of edges """
+
+    terms = np.array(['term{}'.format(i) for i in range(args.num_terms)])
+    edges = np.array(['edge{}'.format(i) for i in range(args.num_edges)])
+
+    return pd.DataFrame({
+        'src': terms[(rng.zipf(1.2, args.num_triples) - 1) % args.num_terms],
+        'path': edges[rng.integers(0, args.num_edges, args.num_triples)],
+        'dst': terms[(rng.zipf(1.2, args.num_triples) - 1) % args.num_terms],
+    })
+
+
+def loop_pairs(triples, wvocab, cvocab):
+
+    wc_pairs = np.zeros((2 * len(triples), 2), dtype=np.int32)
+    row = 0
+    for src, edge, dst in zip(triples['src'], triples['path'], triples['dst']):
+
+        src_context = dst + '/' + edge
+        if src in wvocab and src_context in cvocab:
+            wc_pairs[row] = [wvocab[src], cvocab[src_context]]
+            row += 1
+
+        dst_context = src + '/' + edge + '-1'
+        if dst in wvocab and dst_context in cvocab:
+            wc_pairs[row] = [wvocab[dst], cvocab[dst_context]]
+            row += 1
+
+    return wc_pairs[:row]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--num-triples', type=int, default=1_000_000)
+    parser.add_argument('--num-terms', type=int, default=200_000)
+    parser.add_argument('--num-edges', type=int, default=40)
+    parser.add_argument('--min-count', type=int, default=5)
+    args = parser.parse_args()
+
+    triples = synthetic_triples(args, np.random.default_rng(0))
+    wcounts, ccounts = count_triples(triples)
+    wvocab = build_vocab(wcounts.sort_values(ascending=False), args.min_count)
+    cvocab = build_vocab(ccounts.sort_values(ascending=False), args.min_count)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fp = Path(tmp_dir).joinpath('triples.npz')
+        write_triples(fp, triples)
+
+        start = time.perf_counter()
+        triples = read_triples(fp)
+        read_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    builder = PairBuilder(wvocab, cvocab)
+    setup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairs = builder.pairs(triples)
+    builder_time = time.perf_counter() - start
+
+    plain = triples.astype(str)
+    start = time.perf_counter()
+    expected = loop_pairs(plain, wvocab, cvocab)
+    loop_time = time.perf_counter() - start
+
+    assert np.array_equal(pairs, expected)
+
+    print("{:,} triples -> {:,} pairs, wvocab {:,}, cvocab {:,}".format(
+        len(triples), len(pairs), len(wvocab), len(cvocab)))
+    print("{:<28} {:>10}".format('stage', 'seconds'))
+    print("{:<28} {:>10.3f}".format('read triples shard', read_time))
+    print("{:<28} {:>10.3f}".format('PairBuilder setup (once)', setup_time))
+    print("{:<28} {:>10.3f}".format('PairBuilder.pairs', builder_time))
+    print("{:<28} {:>10.3f}".format('row by row loop', loop_time))
+    print("speedup {:.1f}x".format(loop_time / builder_time))
+
+
+if __name__ == '__main__':
+    main()
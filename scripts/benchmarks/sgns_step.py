@@ -0,0 +1,129 @@
+""" Benchmark training step latency and memory for each step implementation.
+
+Compares autograd with SparseAdam (the default trainer step), autograd with
+sparse SGD, and the fused hand computed SGD step, on random batches over
+embedding tables of realistic size. Memory is the total allocated by torch
+operators per step, taken from the profiler.
+
+Usage:
+
+    python scripts/benchmarks/sgns_step.py --batch-size 2048 --num-threads 4
+"""
+from pathlib import Path
+import argparse
+import time
+import sys
+
+import torch
+from torch.profiler import profile, ProfilerActivity
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.pytorch import SkipGramModel
+from pathvecs.pytorch.model import sgns_sgd_step
+
+
+def autograd_step(model, optimizer):
+
+    def step(w_pos, c_pos, c_neg):
+        optimizer.zero_grad()
+        pos_score, neg_score = model(w_pos, c_pos, c_neg)
+        loss = -1 * (pos_score + neg_score) / len(w_pos)
+        loss.backward()
+        optimizer.step()
+
+    return step
+
+
+def fused_step(model, lr):
+
+    def step(w_pos, c_pos, c_neg):
+        sgns_sgd_step(
+            model.w_embeddings.weight,
+            model.c_embeddings.weight,
+            w_pos, c_pos, c_neg,
+            lr
+        )
+
+    return step
+
+
+def allocated_per_step(step, batches):
+    """ Total bytes allocated by torch operators per step, in MB """
+
+    with profile(activities=[ProfilerActivity.CPU], profile_memory=True) as prof:
+        for batch in batches:
+            step(*batch)
+
+    allocated = sum(
+        e.self_cpu_memory_usage for e in prof.events()
+        if e.self_cpu_memory_usage > 0)
+    return allocated / len(batches) / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--wvocab-size', type=int, default=500_000)
+    parser.add_argument('--cvocab-size', type=int, default=1_000_000)
+    parser.add_argument('--emb-dim', type=int, default=128)
+    parser.add_argument('--batch-size', type=int, default=2048)
+    parser.add_argument('--negative-samples', type=int, default=10)
+    parser.add_argument('--num-steps', type=int, default=50)
+    parser.add_argument('--num-threads', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.num_threads is not None:
+        torch.set_num_threads(args.num_threads)
+
+    generator = torch.Generator().manual_seed(0)
+    batches = [
+        (
+            torch.randint(0, args.wvocab_size, (args.batch_size,), generator=generator),
+            torch.randint(0, args.cvocab_size, (args.batch_size,), generator=generator),
+            torch.randint(0, args.cvocab_size,
+                (args.batch_size, args.negative_samples), generator=generator)
+        )
+        for _ in range(args.num_steps)
+    ]
+
+    wvocab = {str(i): i for i in range(args.wvocab_size)}
+    cvocab = {str(i): i for i in range(args.cvocab_size)}
+
+    def new_model():
+        torch.manual_seed(0)
+        return SkipGramModel(wvocab, cvocab, emb_dim=args.emb_dim)
+
+    model = new_model()
+    steps = {
+        'autograd + SparseAdam': autograd_step(
+            model, torch.optim.SparseAdam(model.parameters(), lr=1e-2)),
+    }
+    model = new_model()
+    steps['autograd + SGD'] = autograd_step(
+        model, torch.optim.SGD(model.parameters(), lr=0.025))
+    model = new_model()
+    steps['fused SGD'] = fused_step(model, lr=0.025)
+
+    print("batch size {:,}, {} negatives, {} dims, {} threads".format(
+        args.batch_size, args.negative_samples, args.emb_dim,
+        torch.get_num_threads()))
+    print("{:<24} {:>12} {:>16}".format('step', 'ms/step', 'alloc MB/step'))
+
+    for name, step in steps.items():
+
+        # warm up, including any lazily created optimizer state
+        for batch in batches[:5]:
+            step(*batch)
+
+        start = time.perf_counter()
+        for batch in batches:
+            step(*batch)
+        latency = (time.perf_counter() - start) / len(batches)
+
+        allocated = allocated_per_step(step, batches[:10])
+        print("{:<24} {:>12.2f} {:>16.1f}".format(
+            name, latency * 1e3, allocated))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+""" Benchmark the streaming dataset against the map-style dataset.
+
+Writes synthetic zipfian pairs to sharded pairs files, then reports the
+samples/sec of drawing a full epoch of (w_pos, c_pos, c_neg) batches through
+a DataLoader, along with the peak rss of the process. Run once per mode so
+that peak memory is measured independently:
+
+    python scripts/benchmarks/streaming_dataset.py --mode map
+    python scripts/benchmarks/streaming_dataset.py --mode streaming
+"""
+from pathlib import Path
+import tempfile
+import argparse
+import resource
+import time
+import sys
+
+import torch
+from torch.utils.data import DataLoader
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.pairs import PairsWriter
+from pathvecs.pytorch import (
+    WordContextDataset,
+    StreamingWordContextDataset,
+    collate_batch
+)
+
+
+def write_shards(output_folder, args):
+    """ Write zipfian pairs to args.num_shards pairs files """
+
+    generator = torch.Generator().manual_seed(0)
+    weights = 1.0 / torch.arange(1, args.vocab_size + 1, dtype=torch.float64)
+
+    chunk_size = 2**20
+    shard_size = args.num_pairs // args.num_shards
+
+    pairs_files = []
+    for shard in range(args.num_shards):
+        fp = Path(output_folder).joinpath('pairs_{:04d}.bin'.format(shard))
+        with PairsWriter(fp) as writer:
+            for start in range(0, shard_size, chunk_size):
+                size = min(chunk_size, shard_size - start)
+                pairs = torch.multinomial(
+                    weights, 2 * size, True, generator=generator)
+                writer.write(pairs.view(size, 2).numpy())
+        pairs_files.append(fp)
+
+    return pairs_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--mode', choices=['map', 'streaming'], required=True)
+    parser.add_argument('--num-pairs', type=int, default=20_000_000)
+    parser.add_argument('--num-shards', type=int, default=8)
+    parser.add_argument('--vocab-size', type=int, default=200_000)
+    parser.add_argument('--batch-size', type=int, default=2048)
+    parser.add_argument('--negative-samples', type=int, default=10)
+    parser.add_argument('--num-workers', type=int, default=2)
+    parser.add_argument('--buffer-size', type=int, default=2**22)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as output_folder:
+        pairs_files = write_shards(output_folder, args)
+
+        start = time.perf_counter()
+
+        if args.mode == 'map':
+
+            # As in the training notebook, load and pre-shuffle in memory
+            pairs = torch.cat([
+                WordContextDataset(fp, sampler='cdf').pairs_data
+                for fp in pairs_files
+            ])
+            pairs = pairs[torch.randperm(len(pairs))]
+
+            dataset = WordContextDataset(
+                pairs,
+                negative_samples=args.negative_samples,
+                sampler='cdf'
+            ).share_memory()
+            dataloader = DataLoader(
+                dataset,
+                batch_size=args.batch_size,
+                collate_fn=collate_batch,
+                num_workers=args.num_workers
+            )
+
+        else:
+            dataset = StreamingWordContextDataset(
+                pairs_files,
+                batch_size=args.batch_size,
+                negative_samples=args.negative_samples,
+                buffer_size=args.buffer_size
+            )
+            dataloader = DataLoader(
+                dataset,
+                batch_size=None,
+                num_workers=args.num_workers
+            )
+
+        setup_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        num_samples = 0
+        for w_pos, _c_pos, _c_neg in dataloader:
+            num_samples += len(w_pos)
+        epoch_s = time.perf_counter() - start
+
+    # ru_maxrss is in kB on linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print("{} dataset, {:,} pairs, {} workers".format(
+        args.mode, num_samples, args.num_workers))
+    print("setup {:.2f} s, epoch {:.2f} s, {:,.0f} samples/s".format(
+        setup_s, epoch_s, num_samples / epoch_s))
+    print("peak rss (main process) {:,.0f} MB".format(peak_mb))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+""" Benchmark frequent-word subsampling: pairs removed and epoch speedup.
+
+Subsamples a pairs file, or synthetic pairs with Zipfian word and context
+frequencies, at each threshold and trains one epoch over the kept pairs with
+the fused SGD step. Reports the fraction of pairs kept and the epoch time
+relative to training on all of the pairs.
+
+Usage:
+
+    python scripts/benchmarks/subsampling.py --thresholds 1e-3 1e-4 1e-5
+    python scripts/benchmarks/subsampling.py --pairs data/pairs/wikipedia_20220101/pairs.bin
+"""
+from pathlib import Path
+import argparse
+import time
+import sys
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.pairs import open_pairs, subsample_pairs
+from pathvecs.pytorch import WordContextDataset, SkipGramModel, collate_batch
+from pathvecs.pytorch.train import Trainer
+
+
+def zipf_pairs(args, rng):
+    """ Pairs whose word and context ids follow Zipf's law """
+
+    words = rng.zipf(args.zipf_a, args.num_pairs) - 1
+    contexts = rng.zipf(args.zipf_a, args.num_pairs) - 1
+    pairs = np.stack([
+        words % args.wvocab_size,
+        contexts % args.cvocab_size
+    ], axis=1)
+
+    return pairs.astype(np.int32)
+
+
+def epoch_time(pairs, wvocab_size, cvocab_size, args):
+    """ Seconds to train one epoch over the pairs with the fused step """
+
+    torch.manual_seed(0)
+    wvocab = {str(i): i for i in range(wvocab_size)}
+    cvocab = {str(i): i for i in range(cvocab_size)}
+    model = SkipGramModel(wvocab, cvocab, emb_dim=args.emb_dim)
+
+    dataset = WordContextDataset(
+        torch.from_numpy(pairs),
+        negative_samples=args.negative_samples,
+        sampler='cdf'
+    )
+    dataloader = DataLoader(
+        dataset,
+        batch_size=args.batch_size,
+        shuffle=True,
+        collate_fn=collate_batch
+    )
+
+    trainer = Trainer(model, lr=0.025, step='fused', log_every=None)
+
+    start = time.perf_counter()
+    trainer.train(dataloader, num_epochs=1)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--pairs', default=None,
+        help="pairs file to subsample, defaults to synthetic pairs")
+    parser.add_argument('--thresholds', type=float, nargs='+',
+        default=[1e-3, 1e-4, 1e-5])
+    parser.add_argument('--num-pairs', type=int, default=5_000_000)
+    parser.add_argument('--wvocab-size', type=int, default=100_000)
+    parser.add_argument('--cvocab-size', type=int, default=200_000)
+    parser.add_argument('--zipf-a', type=float, default=1.1)
+    parser.add_argument('--emb-dim', type=int, default=128)
+    parser.add_argument('--batch-size', type=int, default=2048)
+    parser.add_argument('--negative-samples', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.pairs is not None:
+        pairs = np.array(open_pairs(args.pairs))
+    else:
+        pairs = zipf_pairs(args, np.random.default_rng(0))
+
+    wcounts = np.bincount(pairs[:, 0])
+    ccounts = np.bincount(pairs[:, 1])
+
+    baseline = epoch_time(pairs, len(wcounts), len(ccounts), args)
+
+    print("{:,} pairs, {:.1f}s per epoch without subsampling".format(
+        len(pairs), baseline))
+    print("{:>10} {:>14} {:>8} {:>10} {:>10} {:>9}".format(
+        'threshold', 'pairs kept', 'kept', 'filter s', 'epoch s', 'speedup'))
+
+    for threshold in args.thresholds:
+
+        start = time.perf_counter()
+        kept = subsample_pairs(pairs, wcounts, ccounts, threshold, seed=0)
+        filter_time = time.perf_counter() - start
+
+        seconds = epoch_time(kept, len(wcounts), len(ccounts), args)
+        print("{:>10g} {:>14,} {:>8.1%} {:>10.2f} {:>10.1f} {:>8.2f}x".format(
+            threshold, len(kept), len(kept) / len(pairs), filter_time,
+            seconds, baseline / seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+""" Benchmark the triple_resolver component against per-triple extension lookups.
+
+Builds synthetic docs with matched triples, relative pronoun antecedents and
+quantified objects set on them, then resolves their triples with the
+TripleResolver's precomputed index maps, and with the token extensions
+looked up for both ends of every triple, as the 1_triples notebook did.
+
+Usage:
+
+    python scripts/benchmarks/triple_resolver.py --num-docs 2000
+"""
+from pathlib import Path
+import argparse
+import time
+import sys
+
+import numpy as np
+from spacy.tokens import Doc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.matchers import load_matchers_nlp
+from pathvecs.matchers.triples.patterns import Triple
+
+
+def synthetic_docs(nlp, args, rng):
+    """ Docs of random words with random triples, antecedents and quantifieds """
+
+    docs = []
+    for _ in range(args.num_docs):
+        doc = Doc(nlp.vocab, words=['word{}'.format(i) for i in range(args.doc_length)])
+
+        pronouns = rng.choice(args.doc_length, args.num_pronouns, replace=False)
+        for i in pronouns:
+            doc[int(i)]._.antecedent = doc[int(rng.integers(0, args.doc_length))]
+
+        quantifiers = rng.choice(args.doc_length, args.num_quantifiers, replace=False)
+        for i in quantifiers:
+            doc[int(i)]._.quantifieds = [
+                doc[int(j)] for j in rng.integers(0, args.doc_length, 2)]
+
+        ends = rng.integers(0, args.doc_length, (args.num_triples, 2))
+        doc._.triples = [Triple(doc[int(src)], 'edge', doc[int(dst)]) for src, dst in ends]
+        docs.append(doc)
+
+    return docs
+
+
+def resolve_by_lookup(doc):
+    """ Resolve triples looking up the extensions of every triple's tokens """
+
+    resolved = []
+    seen = set()
+
+    for triple in doc._.triples:
+
+        src = triple.src
+        if src._.antecedent is not None:
+            src = src._.antecedent
+
+        dst = triple.dst
+        if dst._.antecedent is not None:
+            dst = dst._.antecedent
+
+        for src_object in src._.quantifieds or [src]:
+            for dst_object in dst._.quantifieds or [dst]:
+
+                key = (src_object.i, triple.edge, dst_object.i)
+                if src_object == dst_object or key in seen:
+                    continue
+
+                seen.add(key)
+                resolved.append(Triple(src_object, triple.edge, dst_object))
+
+    return resolved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--num-docs', type=int, default=2000)
+    parser.add_argument('--doc-length', type=int, default=500)
+    parser.add_argument('--num-triples', type=int, default=100)
+    parser.add_argument('--num-pronouns', type=int, default=10)
+    parser.add_argument('--num-quantifiers', type=int, default=5)
+    args = parser.parse_args()
+
+    nlp = load_matchers_nlp(pipes=[
+        'map_quantifiers', 'map_relative_pronouns', 'triple_matcher', 'triple_resolver'])
+    resolver = nlp.get_pipe('triple_resolver')
+    docs = synthetic_docs(nlp, args, np.random.default_rng(0))
+
+    # Resolved first, as looking up unset list extensions stores their defaults
+    start = time.perf_counter()
+    for doc in docs:
+        resolver(doc)
+    resolver_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    looked_up = [resolve_by_lookup(doc) for doc in docs]
+    lookup_time = time.perf_counter() - start
+
+    for doc, triples in zip(docs, looked_up):
+        assert [(t.src.i, t.dst.i) for t in doc._.resolved_triples] == [
+            (t.src.i, t.dst.i) for t in triples]
+
+    print("{:,} docs, {:,} triples".format(len(docs), len(docs) * args.num_triples))
+    print("{:<10} {:>10} {:>10}".format('method', 'seconds', 'docs/s'))
+    print("{:<10} {:>10.3f} {:>10,.0f}".format('lookups', lookup_time, len(docs) / lookup_time))
+    print("{:<10} {:>10.3f} {:>10,.0f}".format('index maps', resolver_time, len(docs) / resolver_time))
+
+
+if __name__ == '__main__':
+    main()
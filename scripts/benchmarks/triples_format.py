@@ -0,0 +1,77 @@
+""" Benchmark interned triples files against parquet files of lemma strings.
+
+Writes the same synthetic shard in both formats and reports the size on
+disk, the time to load it, and the time to count its words and contexts
+once loaded.
+
+Usage:
+
+    python scripts/benchmarks/triples_format.py --num-triples 1000000
+"""
+from pathlib import Path
+import tempfile
+import argparse
+import time
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.triples import read_triples, write_triples
+from pathvecs.vocab import count_triples
+
+
+def synthetic_triples(args, rng):
+    """ Triples with Zipfian src and dst lemmas over a fixed set of edges """
+
+    terms = np.array(['lemma_{}'.format(i) for i in range(args.num_terms)])
+    edges = np.array(['edge_{}'.format(i) for i in range(args.num_edges)])
+
+    return pd.DataFrame({
+        'src': terms[(rng.zipf(1.2, args.num_triples) - 1) % args.num_terms],
+        'path': edges[rng.integers(0, args.num_edges, args.num_triples)],
+        'dst': terms[(rng.zipf(1.2, args.num_triples) - 1) % args.num_terms],
+    }).astype(object)
+
+
+def timed(f, *args):
+    start = time.perf_counter()
+    result = f(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--num-triples', type=int, default=1_000_000)
+    parser.add_argument('--num-terms', type=int, default=200_000)
+    parser.add_argument('--num-edges', type=int, default=40)
+    args = parser.parse_args()
+
+    triples = synthetic_triples(args, np.random.default_rng(0))
+
+    print("{:,} triples".format(len(triples)))
+    print("{:<10} {:>10} {:>10} {:>10}".format('format', 'MB', 'load s', 'count s'))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        fp = Path(tmp_dir).joinpath('triples.df')
+        triples.to_parquet(fp, engine='fastparquet')
+        loaded, load_time = timed(
+            lambda fp: pd.read_parquet(fp, engine='fastparquet'), fp)
+        _, count_time = timed(count_triples, loaded)
+        print("{:<10} {:>10.1f} {:>10.3f} {:>10.3f}".format(
+            'parquet', os.path.getsize(fp) / 2**20, load_time, count_time))
+
+        fp = Path(tmp_dir).joinpath('triples.npz')
+        write_triples(fp, triples)
+        loaded, load_time = timed(read_triples, fp)
+        _, count_time = timed(count_triples, loaded)
+        print("{:<10} {:>10.1f} {:>10.3f} {:>10.3f}".format(
+            'interned', os.path.getsize(fp) / 2**20, load_time, count_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+""" Benchmark exact against sketch based approximate vocab counting.
+
+Writes synthetic triples shards with a long tail of rare terms, then counts
+them with count_vocab and with count_frequent. Reports the time taken, the
+peak memory allocated in the main process (where partial counts are merged),
+and the number of keys held at the end.
+
+Sketches sized from the total (the default) hold the same load per counter
+at any total, so the share of rare keys that become candidates measured
+here carries over to larger corpora. The sketch memory and, at most, the
+candidates are also projected to --realistic-total triples, assuming the
+distinct rare keys grow no faster than the total.
+
+Usage:
+
+    python scripts/benchmarks/vocab_counting.py --num-shards 64 --processes 4
+"""
+from pathlib import Path
+import tempfile
+import tracemalloc
+import argparse
+import time
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pathvecs.sketch import sketch_width
+from pathvecs.triples import write_triples
+from pathvecs.vocab import count_vocab, count_frequent
+
+
+def write_shards(folder, args):
+    """ Write shards of triples with Zipfian terms, most of them rare """
+
+    rng = np.random.default_rng(0)
+    edges = np.array(['edge{}'.format(i) for i in range(args.num_edges)])
+
+    triples_files = []
+    for i in range(args.num_shards):
+        src = rng.zipf(1.3, args.shard_size) % args.num_terms
+        dst = rng.zipf(1.3, args.shard_size) % args.num_terms
+        triples = pd.DataFrame({
+            'src': pd.Index(src).map('term{}'.format),
+            'path': edges[rng.integers(0, args.num_edges, args.shard_size)],
+            'dst': pd.Index(dst).map('term{}'.format),
+        })
+
+        fp = Path(folder).joinpath('{:04d}.npz'.format(i))
+        write_triples(fp, triples)
+        triples_files.append(fp)
+
+    return triples_files
+
+
+def measure(count, *args, **kwargs):
+    """ Time a counting function and trace its peak allocations, in MB """
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    wcounts, ccounts = count(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return wcounts, ccounts, seconds, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--num-shards', type=int, default=64)
+    parser.add_argument('--shard-size', type=int, default=200_000)
+    parser.add_argument('--num-terms', type=int, default=5_000_000)
+    parser.add_argument('--num-edges', type=int, default=40)
+    parser.add_argument('--min-count', type=int, default=100)
+    parser.add_argument('--sketch-width', type=int, default=None,
+        help="counters per sketch row, sized from the total by default")
+    parser.add_argument('--sketch-depth', type=int, default=4)
+    parser.add_argument('--sketch-error', type=float, default=0.5)
+    parser.add_argument('--realistic-total', type=float, default=1e9,
+        help="number of triples to project the sketch and candidates to")
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        triples_files = write_shards(tmp_dir, args)
+
+        wcounts, ccounts, exact_time, exact_peak = measure(
+            count_vocab, triples_files, num_processes=args.processes)
+
+        approx_wcounts, approx_ccounts, approx_time, approx_peak = measure(
+            count_frequent,
+            triples_files,
+            args.min_count,
+            width=args.sketch_width,
+            depth=args.sketch_depth,
+            error=args.sketch_error,
+            num_processes=args.processes
+        )
+
+    # The frequent keys and their counts should be the same either way
+    for counts, approx_counts in [(wcounts, approx_wcounts), (ccounts, approx_ccounts)]:
+        frequent = counts[counts >= args.min_count]
+        assert approx_counts[approx_counts >= args.min_count].sort_index().equals(
+            frequent.sort_index())
+
+    print("{:,} triples in {} shards, min count {}".format(
+        args.num_shards * args.shard_size, args.num_shards, args.min_count))
+    print("{:<12} {:>10} {:>14} {:>14} {:>14}".format(
+        'mode', 'seconds', 'peak MB', 'words held', 'contexts held'))
+    print("{:<12} {:>10.1f} {:>14.1f} {:>14,} {:>14,}".format(
+        'exact', exact_time, exact_peak, len(wcounts), len(ccounts)))
+    print("{:<12} {:>10.1f} {:>14.1f} {:>14,} {:>14,}".format(
+        'approximate', approx_time, approx_peak,
+        len(approx_wcounts), len(approx_ccounts)))
+    print("memory saved {:.1%}, time {:+.1%}".format(
+        1 - approx_peak / exact_peak, approx_time / exact_time - 1))
+
+    num_triples = args.num_shards * args.shard_size
+    scale = args.realistic_total / num_triples
+    realistic_width = sketch_width(2 * args.realistic_total, args.min_count, args.sketch_error)
+
+    print("\nat {:,.0f} triples, sketch width {:,}, {:,.0f} MB each".format(
+        args.realistic_total, realistic_width, 8 * args.sketch_depth * realistic_width / 2**20))
+    print("{:<12} {:>14} {:>14} {:>14} {:>14}".format(
+        'keys', 'frequent', 'candidates', 'rare rate', 'projected'))
+
+    for name, counts, approx_counts in [
+            ('words', wcounts, approx_wcounts), ('contexts', ccounts, approx_ccounts)]:
+        num_frequent = int((counts >= args.min_count).sum())
+        num_rare = len(counts) - num_frequent
+        rare_rate = (len(approx_counts) - num_frequent) / max(num_rare, 1)
+
+        # Frequent keys scale with the total at most, and so do rare ones
+        projected = scale * (num_frequent + rare_rate * num_rare)
+        print("{:<12} {:>14,} {:>14,} {:>14.2%} {:>14,.0f}".format(
+            name, num_frequent, len(approx_counts), rare_rate, projected))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+""" Benchmark triples worker startup with a trained pipeline against a blank one.
+
+Each way of building a worker's Language is timed in a fresh interpreter,
+which also reports its peak resident memory, so the numbers are those a new
+pool worker would see.
+
+Usage:
+
+    python scripts/benchmarks/worker_startup.py --model en_core_web_lg
+"""
+from pathlib import Path
+import subprocess
+import argparse
+import json
+import sys
+
+
+ROOT = str(Path(__file__).resolve().parents[2])
+
+SETUP = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import pathvecs.matchers
+{load}
+print(json.dumps({{
+    'seconds': time.perf_counter() - start,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}}))
+"""
+
+LOADERS = {
+    'trained': """
+import spacy
+nlp = spacy.load({model!r})
+nlp.add_pipe('map_relative_pronouns')
+nlp.add_pipe('triple_matcher')
+""",
+    'blank': """
+from pathvecs.matchers import load_matchers_nlp
+nlp = load_matchers_nlp(pipes=['map_relative_pronouns', 'triple_matcher'])
+""",
+    'blank, all matchers': """
+from pathvecs.matchers import load_matchers_nlp
+nlp = load_matchers_nlp()
+""",
+}
+
+
+def measure(load, repeats):
+    """ Run a loader in fresh interpreters, keeping the fastest run """
+
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, '-c', SETUP.format(root=ROOT, load=load)],
+            check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(output.strip().split('\n')[-1]))
+
+    return min(runs, key=lambda run: run['seconds'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--model', default='en_core_web_lg')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    print("{:<22} {:>10} {:>10}".format('worker nlp', 'seconds', 'RSS MB'))
+    for name, load in LOADERS.items():
+        run = measure(load.format(model=args.model), args.repeats)
+        print("{:<22} {:>10.2f} {:>10.0f}".format(name, run['seconds'], run['rss_mb']))
+
+
+if __name__ == '__main__':
+    main()